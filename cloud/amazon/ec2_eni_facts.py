@@ -27,6 +27,12 @@ options:
       - A dict of filters to apply. Each dict item consists of a filter key and a filter value. See U(http://docs.aws.amazon.com/AWSEC2/latest/APIReference/API_DescribeNetworkInterfaces.html) for possible filters.
     required: false
     default: null
+  max_results:
+    description:
+      - Maximum number of interfaces to return.
+    required: false
+    default: null
+    version_added: "2.2"
 
 extends_documentation_fragment:
     - aws
@@ -88,14 +94,20 @@ def get_eni_info(interface):
 def list_eni(connection, module):
 
     filters = module.params.get("filters")
+    max_results = module.params.get("max_results")
     interface_dict_array = []
 
+    # The EC2 API version spoken by boto does not paginate
+    # DescribeNetworkInterfaces, so the filters are applied server side and
+    # the interfaces come back in a single response.
     try:
         all_eni = connection.get_all_network_interfaces(filters=filters)
     except BotoServerError as e:
         module.fail_json(msg=e.message)
 
     for interface in all_eni:
+        if max_results and len(interface_dict_array) >= max_results:
+            break
         interface_dict_array.append(get_eni_info(interface))
 
     module.exit_json(interfaces=interface_dict_array)
@@ -105,7 +117,8 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            filters = dict(default=None, type='dict')
+            filters = dict(default=None, type='dict'),
+            max_results = dict(default=None, type='int')
         )
     )
 
@@ -26,6 +26,34 @@ options:
       - A dict of filters to apply. Each dict item consists of a filter key and a filter value. See U(http://docs.aws.amazon.com/AWSEC2/latest/APIReference/API_DescribeInstances.html) for possible filters.
     required: false
     default: null
+  max_results:
+    description:
+      - Maximum number of instances to return. Instances are fetched and converted one page at a time; by default all pages are returned.
+      - With C(regions) the limit applies to each region.
+    required: false
+    default: null
+    version_added: "2.2"
+  regions:
+    description:
+      - List of regions to query concurrently instead of the single I(region), or C(all) for every EC2 region
+        available to the account, as listed by DescribeRegions in I(region).
+        The instances of all regions are merged; each carries its C(region).
+    required: false
+    default: null
+    version_added: "2.2"
+  fields:
+    description:
+      - List of instance attributes to return, for example C(state), C(tags) and C(private_ip_address).
+        C(id) and C(region) are always returned. By default all attributes are returned.
+    required: false
+    default: null
+    version_added: "2.2"
+  max_workers:
+    description:
+      - Number of regions queried at the same time when C(regions) is given.
+    required: false
+    default: 8
+    version_added: "2.2"
 author:
     - "Michael Schuett (@michaeljs1990)"
 extends_documentation_fragment:
@@ -56,8 +84,18 @@ EXAMPLES = '''
       vpc-id: vpc-123456
       instance-type: t2.small
 
+# Gather the state and tags of running instances in every region
+- ec2_remote_facts:
+    regions: all
+    fields: [ state, tags, private_ip_address ]
+    filters:
+      instance-state-name: running
+
 '''
 
+import Queue
+import threading
+
 try:
     import boto.ec2
     from boto.exception import BotoServerError
@@ -65,82 +103,169 @@ try:
 except ImportError:
     HAS_BOTO = False
 
-def get_instance_info(instance):
+# DescribeInstances accepts between 5 and 1000 results per page
+INSTANCE_PAGE_SIZE = 1000
 
-    # Get groups
+def get_groups(instance):
     groups = []
     for group in instance.groups:
         groups.append({ 'id': group.id, 'name': group.name }.copy())
+    return groups
 
-    # Get interfaces
+def get_interfaces(instance):
     interfaces = []
     for interface in instance.interfaces:
         interfaces.append({ 'id': interface.id, 'mac_address': interface.mac_address }.copy())
+    return interfaces
 
+def get_source_dest_check(instance):
     # If an instance is terminated, sourceDestCheck is no longer returned
     try:
-        source_dest_check = instance.sourceDestCheck
+        return instance.sourceDestCheck
     except AttributeError:
-        source_dest_check = None
-
-    instance_info = { 'id': instance.id,
-                    'kernel': instance.kernel,
-                    'instance_profile': instance.instance_profile,
-                    'root_device_type': instance.root_device_type,
-                    'private_dns_name': instance.private_dns_name,
-                    'public_dns_name': instance.public_dns_name,
-                    'ebs_optimized': instance.ebs_optimized,
-                    'client_token': instance.client_token,
-                    'virtualization_type': instance.virtualization_type,
-                    'architecture': instance.architecture,
-                    'ramdisk': instance.ramdisk,
-                    'tags': instance.tags,
-                    'key_name': instance.key_name,
-                    'source_destination_check': source_dest_check,
-                    'image_id': instance.image_id,
-                    'groups': groups,
-                    'interfaces': interfaces,
-                    'spot_instance_request_id': instance.spot_instance_request_id,
-                    'requester_id': instance.requester_id,
-                    'monitoring_state': instance.monitoring_state,
-                    'placement': {
+        return None
+
+# instance_info key -> function reading it from a boto instance
+INSTANCE_FIELDS = {
+    'id': lambda instance: instance.id,
+    'kernel': lambda instance: instance.kernel,
+    'instance_profile': lambda instance: instance.instance_profile,
+    'root_device_type': lambda instance: instance.root_device_type,
+    'private_dns_name': lambda instance: instance.private_dns_name,
+    'public_dns_name': lambda instance: instance.public_dns_name,
+    'ebs_optimized': lambda instance: instance.ebs_optimized,
+    'client_token': lambda instance: instance.client_token,
+    'virtualization_type': lambda instance: instance.virtualization_type,
+    'architecture': lambda instance: instance.architecture,
+    'ramdisk': lambda instance: instance.ramdisk,
+    'tags': lambda instance: instance.tags,
+    'key_name': lambda instance: instance.key_name,
+    'source_destination_check': get_source_dest_check,
+    'image_id': lambda instance: instance.image_id,
+    'groups': get_groups,
+    'interfaces': get_interfaces,
+    'spot_instance_request_id': lambda instance: instance.spot_instance_request_id,
+    'requester_id': lambda instance: instance.requester_id,
+    'monitoring_state': lambda instance: instance.monitoring_state,
+    'placement': lambda instance: {
                                   'tenancy': instance._placement.tenancy,
                                   'zone': instance._placement.zone
                                  },
-                    'ami_launch_index': instance.ami_launch_index,
-                    'launch_time': instance.launch_time,
-                    'hypervisor': instance.hypervisor,
-                    'region': instance.region.name,
-                    'persistent': instance.persistent,
-                    'private_ip_address': instance.private_ip_address,
-                    'state': instance._state.name,
-                    'vpc_id': instance.vpc_id,
-                  }
+    'ami_launch_index': lambda instance: instance.ami_launch_index,
+    'launch_time': lambda instance: instance.launch_time,
+    'hypervisor': lambda instance: instance.hypervisor,
+    'region': lambda instance: instance.region.name,
+    'persistent': lambda instance: instance.persistent,
+    'private_ip_address': lambda instance: instance.private_ip_address,
+    'state': lambda instance: instance._state.name,
+    'vpc_id': lambda instance: instance.vpc_id,
+}
+
+def get_instance_info(instance, fields=None):
+
+    # Only the requested fields are read; id and region are always included
+    # so that results from several regions can be told apart
+    if fields:
+        fields = set(fields) | set(['id', 'region'])
+    else:
+        fields = INSTANCE_FIELDS.keys()
+
+    instance_info = {}
+    for field in fields:
+        instance_info[field] = INSTANCE_FIELDS[field](instance)
 
     return instance_info
 
 
+def paginated_instances(connection, filters, max_results=None):
+    next_token = None
+    count = 0
+    while True:
+        page_size = INSTANCE_PAGE_SIZE
+        if max_results:
+            page_size = max(5, min(INSTANCE_PAGE_SIZE, max_results - count))
+        reservations = connection.get_all_reservations(filters=filters, max_results=page_size,
+                                                       next_token=next_token)
+        for reservation in reservations:
+            for instance in reservation.instances:
+                if max_results and count >= max_results:
+                    return
+                count += 1
+                yield instance
+        next_token = reservations.next_token
+        if not next_token or (max_results and count >= max_results):
+            return
+
+
 def list_ec2_instances(connection, module):
 
     filters = module.params.get("filters")
+    max_results = module.params.get("max_results")
+    fields = module.params.get("fields")
     instance_dict_array = []
 
     try:
-        all_instances = connection.get_only_instances(filters=filters)
+        for instance in paginated_instances(connection, filters, max_results):
+            instance_dict_array.append(get_instance_info(instance, fields))
     except BotoServerError as e:
         module.fail_json(msg=e.message)
 
-    for instance in all_instances:
-        instance_dict_array.append(get_instance_info(instance))
-
     module.exit_json(instances=instance_dict_array)
 
 
+def list_ec2_instances_in_regions(module, regions, aws_connect_params):
+
+    filters = module.params.get("filters")
+    max_results = module.params.get("max_results")
+    fields = module.params.get("fields")
+    results = {}
+    queue = Queue.Queue()
+    for region in regions:
+        queue.put(region)
+
+    # each worker connects to its regions itself; failures are collected
+    # and reported once all regions are done
+    def worker():
+        while True:
+            try:
+                region = queue.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                connection = connect_to_aws(boto.ec2, region, **aws_connect_params)
+                results[region] = ([get_instance_info(instance, fields)
+                                    for instance in paginated_instances(connection, filters, max_results)], None)
+            except Exception as e:
+                results[region] = ([], getattr(e, 'message', None) or str(e))
+
+    threads = [threading.Thread(target=worker)
+               for i in range(max(1, min(module.params.get("max_workers"), len(regions))))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    errors = dict((region, error) for region, (instances, error) in results.items() if error)
+    if errors:
+        module.fail_json(msg="Failed to gather facts in %d regions" % len(errors), region_errors=errors)
+
+    instance_dict_array = []
+    for region in regions:
+        instance_dict_array.extend(results[region][0])
+
+    module.exit_json(instances=instance_dict_array, regions=regions)
+
+
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            filters = dict(default=None, type='dict')
+            filters = dict(default=None, type='dict'),
+            max_results = dict(default=None, type='int'),
+            regions = dict(default=None, type='list'),
+            fields = dict(default=None, type='list'),
+            max_workers = dict(default=8, type='int')
         )
     )
 
@@ -149,8 +274,16 @@ def main():
     if not HAS_BOTO:
         module.fail_json(msg='boto required for this module')
 
+    unknown_fields = set(module.params.get('fields') or []) - set(INSTANCE_FIELDS)
+    if unknown_fields:
+        module.fail_json(msg="Unknown fields: %s" % ', '.join(sorted(unknown_fields)))
+
     region, ec2_url, aws_connect_params = get_aws_connection_info(module)
 
+    regions = module.params.get('regions')
+    if regions and regions != ['all']:
+        list_ec2_instances_in_regions(module, regions, aws_connect_params)
+
     if region:
         try:
             connection = connect_to_aws(boto.ec2, region, **aws_connect_params)
@@ -159,6 +292,15 @@ def main():
     else:
         module.fail_json(msg="region must be specified")
 
+    if regions:
+        # DescribeRegions only returns the regions enabled for the account,
+        # unlike boto's static endpoint list which includes other partitions
+        try:
+            regions = [r.name for r in connection.get_all_regions()]
+        except BotoServerError as e:
+            module.fail_json(msg=e.message)
+        list_ec2_instances_in_regions(module, regions, aws_connect_params)
+
     list_ec2_instances(connection, module)
 
 # import module snippets
@@ -47,6 +47,13 @@ options:
       names and values are case sensitive.
     required: false
     default: {}
+  max_results:
+    description:
+      - Maximum number of snapshots to return. Snapshots are fetched and converted one page at a time; by default \
+      all pages are returned.
+    required: false
+    default: null
+    version_added: "2.2"
 notes:
   - By default, the module will return all snapshots, including public ones. To limit results to snapshots owned by \
   the account use the filter 'owner-id'.
@@ -163,6 +170,9 @@ try:
 except ImportError:
     HAS_BOTO3 = False
 
+# DescribeSnapshots accepts between 5 and 1000 results per page
+SNAPSHOT_PAGE_SIZE = 1000
+
 
 def list_ec2_snapshots(connection, module):
 
@@ -170,22 +180,32 @@ def list_ec2_snapshots(connection, module):
     owner_ids = module.params.get("owner_ids")
     restorable_by_user_ids = module.params.get("restorable_by_user_ids")
     filters = ansible_dict_to_boto3_filter_list(module.params.get("filters"))
+    max_results = module.params.get("max_results")
+
+    # MaxResults cannot be combined with SnapshotIds
+    pagination_config = {}
+    if not snapshot_ids:
+        pagination_config['PageSize'] = SNAPSHOT_PAGE_SIZE
+        if max_results:
+            pagination_config['PageSize'] = max(5, min(SNAPSHOT_PAGE_SIZE, max_results))
+    if max_results:
+        pagination_config['MaxItems'] = max_results
 
+    snaked_snapshots = []
     try:
-        snapshots = connection.describe_snapshots(SnapshotIds=snapshot_ids, OwnerIds=owner_ids, RestorableByUserIds=restorable_by_user_ids, Filters=filters)
+        paginator = connection.get_paginator('describe_snapshots')
+        for page in paginator.paginate(SnapshotIds=snapshot_ids, OwnerIds=owner_ids, RestorableByUserIds=restorable_by_user_ids,
+                                       Filters=filters, PaginationConfig=pagination_config):
+            # Turn each page of the boto3 result in to ansible_friendly_snaked_names
+            # and ansible friendly tag dictionaries before fetching the next one
+            for snapshot in page['Snapshots']:
+                snaked_snapshot = camel_dict_to_snake_dict(snapshot)
+                if 'tags' in snaked_snapshot:
+                    snaked_snapshot['tags'] = boto3_tag_list_to_ansible_dict(snaked_snapshot['tags'])
+                snaked_snapshots.append(snaked_snapshot)
     except ClientError, e:
         module.fail_json(msg=e.message)
 
-    # Turn the boto3 result in to ansible_friendly_snaked_names
-    snaked_snapshots = []
-    for snapshot in snapshots['Snapshots']:
-        snaked_snapshots.append(camel_dict_to_snake_dict(snapshot))
-
-    # Turn the boto3 result in to ansible friendly tag dictionary
-    for snapshot in snaked_snapshots:
-        if 'tags' in snapshot:
-            snapshot['tags'] = boto3_tag_list_to_ansible_dict(snapshot['tags'])
-
     module.exit_json(snapshots=snaked_snapshots)
 
 
@@ -197,7 +217,8 @@ def main():
             snapshot_ids=dict(default=[], type='list'),
             owner_ids=dict(default=[], type='list'),
             restorable_by_user_ids=dict(default=[], type='list'),
-            filters=dict(default={}, type='dict')
+            filters=dict(default={}, type='dict'),
+            max_results=dict(default=None, type='int')
         )
     )
 
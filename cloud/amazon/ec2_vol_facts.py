@@ -27,6 +27,12 @@ options:
       - A dict of filters to apply. Each dict item consists of a filter key and a filter value. See U(http://docs.aws.amazon.com/AWSEC2/latest/APIReference/API_DescribeVolumes.html) for possible filters.
     required: false
     default: null
+  max_results:
+    description:
+      - Maximum number of volumes to return. Volumes are fetched and converted one page at a time; by default all pages are returned.
+    required: false
+    default: null
+    version_added: "2.2"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -61,11 +67,15 @@ RETURN = '''# '''
 
 try:
     import boto.ec2
+    from boto.ec2.volume import Volume
     from boto.exception import BotoServerError
     HAS_BOTO = True
 except ImportError:
     HAS_BOTO = False
 
+# DescribeVolumes accepts between 5 and 500 results per page
+VOLUME_PAGE_SIZE = 500
+
 def get_volume_info(volume):
 
     attachment = volume.attach_data
@@ -91,19 +101,41 @@ def get_volume_info(volume):
     
     return volume_info
 
+def paginated_volumes(connection, filters, max_results=None):
+    # get_all_volumes() does not expose NextToken, so page through
+    # DescribeVolumes directly
+    params = {}
+    if filters:
+        connection.build_filter_params(params, filters)
+    count = 0
+    while True:
+        page_size = VOLUME_PAGE_SIZE
+        if max_results:
+            page_size = max(5, min(VOLUME_PAGE_SIZE, max_results - count))
+        params['MaxResults'] = page_size
+        volumes = connection.get_list('DescribeVolumes', params, [('item', Volume)], verb='POST')
+        for volume in volumes:
+            if max_results and count >= max_results:
+                return
+            count += 1
+            yield volume
+        if not volumes.next_token or (max_results and count >= max_results):
+            return
+        params['NextToken'] = volumes.next_token
+
+
 def list_ec2_volumes(connection, module):
 
     filters = module.params.get("filters")
+    max_results = module.params.get("max_results")
     volume_dict_array = []
 
     try:
-        all_volumes = connection.get_all_volumes(filters=filters)
+        for volume in paginated_volumes(connection, filters, max_results):
+            volume_dict_array.append(get_volume_info(volume))
     except BotoServerError as e:
         module.fail_json(msg=e.message)
 
-    for volume in all_volumes:
-        volume_dict_array.append(get_volume_info(volume))
-
     module.exit_json(volumes=volume_dict_array)
 
 
@@ -111,7 +143,8 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            filters = dict(default=None, type='dict')
+            filters = dict(default=None, type='dict'),
+            max_results = dict(default=None, type='int')
         )
     )
 
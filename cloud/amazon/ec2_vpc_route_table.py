@@ -62,6 +62,12 @@ options:
     description:
       - "VPC ID of the VPC in which to create the route table."
     required: true
+  max_workers:
+    description:
+      - "Number of route creations, replacements and deletions sent to AWS concurrently. Throttled requests are retried with exponential backoff."
+    required: false
+    default: 4
+    version_added: "2.2"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -106,6 +112,10 @@ EXAMPLES = '''
 
 import sys  # noqa
 import re
+import random
+import threading
+import time
+import Queue
 
 try:
     import boto.ec2
@@ -136,6 +146,9 @@ class AnsibleSubnetSearchException(AnsibleRouteTableException):
 CIDR_RE = re.compile('^(\d{1,3}\.){3}\d{1,3}\/\d{1,2}$')
 SUBNET_RE = re.compile('^subnet-[A-z0-9]+$')
 ROUTE_TABLE_RE = re.compile('^rtb-[A-z0-9]+$')
+THROTTLING_ERRORS = ('RequestLimitExceeded', 'Throttling')
+ROUTE_RETRIES = 6
+ROUTE_RETRY_DELAY = 0.5
 
 
 def find_subnets(vpc_conn, vpc_id, identified_subnets):
@@ -300,16 +313,88 @@ def index_of_matching_route(route_spec, routes_to_match):
             return i
 
 
+def index_routes_by_destination(routes):
+    routes_by_dest = {}
+    for route in routes:
+        routes_by_dest.setdefault(route.destination_cidr_block, []).append(route)
+    return routes_by_dest
+
+
+def call_with_backoff(func, *args, **kwargs):
+    for attempt in range(ROUTE_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except EC2ResponseError as e:
+            if e.error_code not in THROTTLING_ERRORS or attempt == ROUTE_RETRIES - 1:
+                raise
+            time.sleep(ROUTE_RETRY_DELAY * 2 ** attempt * (1 + random.random()))
+
+
+def apply_route_changes(vpc_conn, route_table_id, changes, check_mode,
+                        connect=None, max_workers=1):
+    """
+    Apply (action, destination_cidr_block, route_spec) changes on up to
+    max_workers threads, each with its own connection from connect, and
+    return the outcome of every change in order.
+    """
+    outcomes = [None] * len(changes)
+    queue = Queue.Queue()
+    for item in enumerate(changes):
+        queue.put(item)
+
+    def worker(conn):
+        while True:
+            try:
+                index, (action, dest, route_spec) = queue.get_nowait()
+            except Queue.Empty:
+                return
+            outcome = {'action': action, 'destination_cidr_block': dest, 'status': 'ok'}
+            try:
+                if action == 'create':
+                    call_with_backoff(conn.create_route, route_table_id,
+                                      dry_run=check_mode, **route_spec)
+                elif action == 'replace':
+                    call_with_backoff(conn.replace_route, route_table_id,
+                                      dry_run=check_mode, **route_spec)
+                else:
+                    call_with_backoff(conn.delete_route, route_table_id, dest,
+                                      dry_run=check_mode)
+            except EC2ResponseError as e:
+                if e.error_code != 'DryRunOperation':
+                    outcome.update(status='failed', error=e.message or e.error_code)
+            except Exception as e:
+                outcome.update(status='failed', error=str(e))
+            outcomes[index] = outcome
+
+    if connect is None or max_workers <= 1 or len(changes) <= 1:
+        worker(vpc_conn)
+        return outcomes
+
+    threads = [threading.Thread(target=worker, args=(connect(),))
+               for i in range(min(max_workers, len(changes)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
 def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
-                  check_mode):
-    routes_to_match = list(route_table.routes)
+                  check_mode, connect=None, max_workers=1):
+    # Routes are indexed by destination, so each spec only has to be
+    # compared with the (usually single) route for the same destination.
+    routes_by_dest = index_routes_by_destination(route_table.routes)
     route_specs_to_create = []
     for route_spec in route_specs:
-        i = index_of_matching_route(route_spec, routes_to_match)
+        candidates = routes_by_dest.get(route_spec.get('destination_cidr_block'), [])
+        i = index_of_matching_route(route_spec, candidates)
         if i is None:
             route_specs_to_create.append(route_spec)
         else:
-            del routes_to_match[i]
+            del candidates[i]
+    routes_to_match = [route for route in route_table.routes
+                       if route in routes_by_dest.get(route.destination_cidr_block, [])]
 
     # NOTE: As of boto==2.38.0, the origin of a route is not available
     # (for example, whether it came from a gateway with route propagation
@@ -321,27 +406,26 @@ def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
                         if r.gateway_id != 'local'
                         and r.gateway_id not in propagating_vgw_ids]
 
+    # A route whose target changes is replaced in place instead of being
+    # created while the old route for the destination still exists.
+    dests_to_delete = set(r.destination_cidr_block for r in routes_to_delete)
+    dests_to_create = set(spec.get('destination_cidr_block') for spec in route_specs_to_create)
+    changes = []
+    for route_spec in route_specs_to_create:
+        dest = route_spec.get('destination_cidr_block')
+        action = 'replace' if dest in dests_to_delete else 'create'
+        changes.append((action, dest, route_spec))
+    for route in routes_to_delete:
+        if route.destination_cidr_block not in dests_to_create:
+            changes.append(('delete', route.destination_cidr_block, None))
+
     changed = routes_to_delete or route_specs_to_create
+    outcomes = []
     if changed:
-        for route_spec in route_specs_to_create:
-            try:
-                vpc_conn.create_route(route_table.id,
-                                      dry_run=check_mode,
-                                      **route_spec)
-            except EC2ResponseError as e:
-                if e.error_code == 'DryRunOperation':
-                    pass
-
-        for route in routes_to_delete:
-            try:
-                vpc_conn.delete_route(route_table.id,
-                                      route.destination_cidr_block,
-                                      dry_run=check_mode)
-            except EC2ResponseError as e:
-                if e.error_code == 'DryRunOperation':
-                    pass
+        outcomes = apply_route_changes(vpc_conn, route_table.id, changes,
+                                       check_mode, connect, max_workers)
 
-    return {'changed': bool(changed)}
+    return {'changed': bool(changed), 'route_changes': outcomes}
 
 
 def ensure_subnet_association(vpc_conn, vpc_id, route_table_id, subnet_id,
@@ -474,7 +558,7 @@ def create_route_spec(connection, routes, vpc_id):
 
     return routes
 
-def ensure_route_table_present(connection, module):
+def ensure_route_table_present(connection, module, connect=None):
 
     lookup = module.params.get('lookup')
     propagating_vgw_ids = module.params.get('propagating_vgw_ids')
@@ -489,6 +573,7 @@ def ensure_route_table_present(connection, module):
 
     changed = False
     tags_valid = False
+    route_changes = []
 
     if lookup == 'tag':
         if tags is not None:
@@ -519,10 +604,16 @@ def ensure_route_table_present(connection, module):
 
     if routes is not None:
         try:
-            result = ensure_routes(connection, route_table, routes, propagating_vgw_ids, module.check_mode)
+            result = ensure_routes(connection, route_table, routes, propagating_vgw_ids, module.check_mode,
+                                   connect, module.params.get('max_workers'))
             changed = changed or result['changed']
+            route_changes = result['route_changes']
         except EC2ResponseError as e:
             module.fail_json(msg=e.message)
+        failed = [c for c in route_changes if c['status'] == 'failed']
+        if failed:
+            module.fail_json(msg="Failed to change {0} of {1} routes".format(len(failed), len(route_changes)),
+                             route_changes=route_changes)
 
     if propagating_vgw_ids is not None:
         result = ensure_propagation(connection, route_table,
@@ -554,7 +645,8 @@ def ensure_route_table_present(connection, module):
                 .format(route_table, e)
             )
 
-    module.exit_json(changed=changed, route_table=get_route_table_info(route_table))
+    module.exit_json(changed=changed, route_table=get_route_table_info(route_table),
+                     route_changes=route_changes)
 
 
 def main():
@@ -568,7 +660,8 @@ def main():
             state = dict(default='present', choices=['present', 'absent']),
             subnets = dict(default=None, required=False, type='list'),
             tags = dict(default=None, required=False, type='dict', aliases=['resource_tags']),
-            vpc_id = dict(default=None, required=True)
+            vpc_id = dict(default=None, required=True),
+            max_workers = dict(default=4, required=False, type='int')
         )
     )
 
@@ -584,6 +677,8 @@ def main():
             connection = connect_to_aws(boto.vpc, region, **aws_connect_params)
         except (boto.exception.NoAuthHandlerFound, AnsibleAWSError), e:
             module.fail_json(msg=str(e))
+        # boto connections are not thread safe, each route worker gets its own
+        connect = lambda: connect_to_aws(boto.vpc, region, **aws_connect_params)
     else:
         module.fail_json(msg="region must be specified")
 
@@ -596,7 +691,7 @@ def main():
 
     try:
         if state == 'present':
-            result = ensure_route_table_present(connection, module)
+            result = ensure_route_table_present(connection, module, connect)
         elif state == 'absent':
             result = ensure_route_table_absent(connection, module)
     except AnsibleRouteTableException as e:
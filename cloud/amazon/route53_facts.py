@@ -47,6 +47,8 @@ options:
   max_items:
     description:
       - Maximum number of items to return for various get/list requests
+      - With C(query=record_sets) all pages of record sets are fetched until
+        C(max_items) record sets have been returned, or all of them if not set.
     required: false
   next_marker:
     description:
@@ -172,6 +174,9 @@ try:
 except ImportError:
     HAS_BOTO3 = False
 
+# ListResourceRecordSets returns at most 300 record sets per request
+RECORD_SETS_PAGE_SIZE = 300
+
 
 def get_hosted_zone(client, module):
     params = dict()
@@ -316,8 +321,9 @@ def record_sets_details(client, module):
     else:
         module.fail_json(msg="Hosted Zone Id is required")
 
+    max_items = None
     if module.params.get('max_items'):
-        params['MaxItems'] = module.params.get('max_items')
+        max_items = int(module.params.get('max_items'))
 
     if module.params.get('start_record_name'):
         params['StartRecordName'] = module.params.get('start_record_name')
@@ -327,7 +333,27 @@ def record_sets_details(client, module):
     elif module.params.get('type'):
         params['StartRecordType'] = module.params.get('type')
 
-    results = client.list_resource_record_sets(**params)
+    # follow NextRecordName until all record sets (or max_items) have been
+    # returned; the last page's IsTruncated and Next* keys are kept so that
+    # a truncated result can be continued with start_record_name
+    record_sets = []
+    while True:
+        if max_items:
+            params['MaxItems'] = str(min(RECORD_SETS_PAGE_SIZE, max_items - len(record_sets)))
+        else:
+            params['MaxItems'] = str(RECORD_SETS_PAGE_SIZE)
+        results = client.list_resource_record_sets(**params)
+        record_sets.extend(results['ResourceRecordSets'])
+        if not results['IsTruncated'] or (max_items and len(record_sets) >= max_items):
+            break
+        params['StartRecordName'] = results['NextRecordName']
+        params['StartRecordType'] = results['NextRecordType']
+        if 'NextRecordIdentifier' in results:
+            params['StartRecordIdentifier'] = results['NextRecordIdentifier']
+        else:
+            params.pop('StartRecordIdentifier', None)
+
+    results['ResourceRecordSets'] = record_sets
     return results
 
 
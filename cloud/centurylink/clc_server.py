@@ -224,6 +224,12 @@ options:
     default: True
     required: False
     choices: [True, False]
+  max_workers:
+    description:
+      - The number of servers to attach public IPs and alert policies to concurrently.
+    default: 1
+    required: False
+    version_added: "2.2"
 requirements:
     - python = 2.7
     - requests >= 2.5.0
@@ -461,6 +467,9 @@ servers:
 
 __version__ = '${version}'
 
+import Queue
+import sys
+import threading
 from time import sleep
 from distutils.version import LooseVersion
 
@@ -645,7 +654,8 @@ class ClcServer:
                              'windows2012R2Standard_64Bit',
                              'ubuntu14_64Bit'
                          ]),
-            wait=dict(type='bool', default=True))
+            wait=dict(type='bool', default=True),
+            max_workers=dict(type='int', default=1))
 
         mutually_exclusive = [
             ['exact_count', 'count'],
@@ -1108,9 +1118,24 @@ class ClcServer:
         """
         wait = module.params.get('wait')
         if wait:
-            # Requests.WaitUntilComplete() returns the count of failed requests
-            failed_requests_count = sum(
-                [request.WaitUntilComplete() for request in request_list])
+            # Poll the individual requests of all Requests objects in one
+            # loop instead of waiting on each Requests object in turn
+            pending = []
+            for request_group in request_list:
+                pending.extend(request_group.requests)
+
+            failed_requests_count = 0
+            while pending:
+                still_pending = []
+                for request in pending:
+                    status = request.Status()
+                    if status in ('failed', 'unknown'):
+                        failed_requests_count += 1
+                    elif status != 'succeeded':
+                        still_pending.append(request)
+                pending = still_pending
+                if pending:
+                    sleep(2)
 
             if failed_requests_count > 0:
                 module.fail_json(
@@ -1154,18 +1179,22 @@ class ClcServer:
 
         ports_lst = []
         request_list = []
-        server = None
 
         for port in public_ip_ports:
             ports_lst.append(
                 {'protocol': public_ip_protocol, 'port': port})
-        try:
-            if not module.check_mode:
-                for server in servers:
-                    request = server.PublicIPs().Add(ports_lst)
+        if not module.check_mode:
+            results = ClcServer._run_concurrently(
+                module,
+                lambda server: server.PublicIPs().Add(ports_lst),
+                servers)
+            for server, request, exc_info in results:
+                if exc_info is None:
                     request_list.append(request)
-        except APIFailedResponse:
-            failed_servers.append(server)
+                elif isinstance(exc_info[1], APIFailedResponse):
+                    failed_servers.append(server)
+                else:
+                    raise exc_info[0], exc_info[1], exc_info[2]
         ClcServer._wait_for_requests(module, request_list)
         return failed_servers
 
@@ -1184,17 +1213,59 @@ class ClcServer:
         alias = p.get('alias')
 
         if alert_policy_id and not module.check_mode:
-            for server in servers:
-                try:
-                    ClcServer._add_alert_policy_to_server(
-                        clc=clc,
-                        alias=alias,
-                        server_id=server.id,
-                        alert_policy_id=alert_policy_id)
-                except CLCException:
+            results = ClcServer._run_concurrently(
+                module,
+                lambda server: ClcServer._add_alert_policy_to_server(
+                    clc=clc,
+                    alias=alias,
+                    server_id=server.id,
+                    alert_policy_id=alert_policy_id),
+                servers)
+            for server, result, exc_info in results:
+                if exc_info is None:
+                    continue
+                elif isinstance(exc_info[1], CLCException):
                     failed_servers.append(server)
+                else:
+                    raise exc_info[0], exc_info[1], exc_info[2]
         return failed_servers
 
+    @staticmethod
+    def _run_concurrently(module, func, servers):
+        """
+        Call a function for each server on a bounded pool of worker threads
+        :param module: the AnsibleModule object
+        :param func: the function to call with each server
+        :param servers: list of clc-sdk.Server instances
+        :return: a list of (server, result, exc_info) tuples in server order,
+                 exc_info being None or the sys.exc_info() of the failed call
+        """
+        max_workers = module.params.get('max_workers')
+        results = [None] * len(servers)
+        queue = Queue.Queue()
+        for item in enumerate(servers):
+            queue.put(item)
+
+        def worker():
+            while True:
+                try:
+                    index, server = queue.get_nowait()
+                except Queue.Empty:
+                    return
+                try:
+                    results[index] = (server, func(server), None)
+                except Exception:
+                    results[index] = (server, None, sys.exc_info())
+
+        threads = [threading.Thread(target=worker)
+                   for i in range(max(1, min(max_workers, len(servers))))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
     @staticmethod
     def _add_alert_policy_to_server(
             clc, alias, server_id, alert_policy_id):
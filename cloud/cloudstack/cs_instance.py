@@ -209,6 +209,35 @@ options:
       - Poll async jobs until job has finished.
     required: false
     default: true
+  api_cache_dir:
+    description:
+      - Directory used to cache zone, domain, account, project and offering lookups between tasks.
+      - Entries are keyed by API endpoint and credentials and expire after C(api_cache_ttl) seconds.
+      - Lookups are only cached for the duration of the task if not set.
+    required: false
+    default: null
+    version_added: "2.2"
+  api_cache_ttl:
+    description:
+      - Number of seconds cached lookups in C(api_cache_dir) remain valid.
+    required: false
+    default: 600
+    version_added: "2.2"
+  instances:
+    description:
+      - List of instance specs to manage in one task. Each spec is a dict of options of this module, at least C(name) or C(display_name); options not set in a spec are taken from the task, including C(zone), C(project), C(domain) and C(account).
+      - All deploy and destroy jobs are submitted first, then polled together until they finish or C(poll_timeout) is reached.
+      - Only C(state) C(present), C(deployed), C(absent), C(destroyed) and C(expunged) are supported. Existing instances are not updated and C(tags) are not applied.
+      - Results per instance are returned in C(instances).
+    required: false
+    default: null
+    version_added: "2.2"
+  poll_timeout:
+    description:
+      - Seconds to wait for all jobs submitted for C(instances) to finish.
+    required: false
+    default: 600
+    version_added: "2.2"
 extends_documentation_fragment: cloudstack
 '''
 
@@ -273,6 +302,16 @@ EXAMPLES = '''
 
 # Remove an instance
 - local_action: cs_instance name=web-vm-1 state=absent
+
+# Deploy several instances in one task
+- local_action:
+    module: cs_instance
+    template: Linux Debian 7 64-bit
+    service_offering: Tiny
+    instances:
+      - { name: web-vm-1 }
+      - { name: web-vm-2 }
+      - { name: web-vm-3, service_offering: Small }
 '''
 
 RETURN = '''
@@ -392,9 +431,28 @@ instance_name:
   returned: success
   type: string
   sample: i-44-3992-VM
+instances:
+  description: Results per instance spec if C(instances) is used, with keys C(name), C(id), C(state), C(changed) and, on failure, C(msg).
+  returned: success
+  type: list
+  sample: '[ { "name": "web-vm-1", "id": "04589590-ac63-4ffc-93f5-b698b8ac38b6", "state": "Running", "changed": true } ]'
 '''
 
 import base64
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+try:
+    import json
+except ImportError:
+    try:
+        import simplejson as json
+    except ImportError:
+        # Let snippet from module_utils/basic.py return a proper error in this case
+        pass
 
 try:
     from cs import CloudStack, CloudStackException, read_config
@@ -405,11 +463,102 @@ except ImportError:
 # import cloudstack common
 from ansible.module_utils.cloudstack import *
 
+# Number of items requested per page from list APIs.
+CS_PAGE_SIZE = 500
+
+UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
+
+
+class CloudStackApiCache(object):
+    """Caching proxy around a CloudStack API client.
+
+    Results of read-only metadata list calls are kept in memory for the
+    run and, if a cache directory is given, in files shared between runs
+    keyed by API endpoint, credentials hash, call and arguments. Every
+    other call is passed through to the wrapped client.
+
+    Empty results are never cached, so objects created by other tasks
+    (e.g. cs_account or cs_project) are found as soon as they exist.
+    """
+
+    CACHED_CALLS = (
+        'listZones',
+        'listDomains',
+        'listAccounts',
+        'listProjects',
+        'listServiceOfferings',
+        'listDiskOfferings',
+        'listNetworkOfferings',
+        'listOsTypes',
+    )
+
+    def __init__(self, cs, cache_dir=None, cache_ttl=600):
+        self.cs = cs
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.results = {}
+        credentials = '%s|%s|%s' % (cs.endpoint, cs.key, cs.secret)
+        self.prefix = hashlib.sha1(credentials).hexdigest()
+
+    def __getattr__(self, name):
+        api_call = getattr(self.cs, name)
+        if name not in self.CACHED_CALLS:
+            return api_call
+
+        def cached_call(**args):
+            key = hashlib.sha1('%s|%s|%s' % (self.prefix, name, json.dumps(args, sort_keys=True))).hexdigest()
+            if key in self.results:
+                return self.results[key]
+            res = self._load(key)
+            if res is None:
+                res = api_call(**args)
+                if 'errortext' in res or self._is_empty(res):
+                    return res
+                self._store(key, res)
+            self.results[key] = res
+            return res
+        return cached_call
+
+    def _is_empty(self, res):
+        return not [v for v in res.values() if isinstance(v, list) and v]
+
+    def _load(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            f = open(os.path.join(self.cache_dir, key + '.json'))
+            try:
+                entry = json.load(f)
+            finally:
+                f.close()
+        except (IOError, ValueError):
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.cache_ttl:
+            return None
+        return entry.get('result')
+
+    def _store(self, key, res):
+        if not self.cache_dir:
+            return
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir, 0700)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        f = os.fdopen(fd, 'w')
+        try:
+            json.dump({'timestamp': time.time(), 'result': res}, f)
+        finally:
+            f.close()
+        os.rename(tmp_path, os.path.join(self.cache_dir, key + '.json'))
+
 
 class AnsibleCloudStackInstance(AnsibleCloudStack):
 
     def __init__(self, module):
         super(AnsibleCloudStackInstance, self).__init__(module)
+        api_cache_dir = module.params.get('api_cache_dir')
+        if api_cache_dir:
+            api_cache_dir = os.path.expanduser(api_cache_dir)
+        self.cs = CloudStackApiCache(self.cs, api_cache_dir, module.params.get('api_cache_ttl'))
         self.returns = {
             'group':                'group',
             'hypervisor':           'hypervisor',
@@ -425,19 +574,81 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
         self.instance = None
         self.template = None
         self.iso = None
+        self.indexes = {}
+
+
+    def _list_paged(self, api_call, result_key, **args):
+        args['pagesize'] = CS_PAGE_SIZE
+        page = 1
+        while True:
+            args['page'] = page
+            res = api_call(**args)
+            if not res:
+                return
+            if 'errortext' in res:
+                self.module.fail_json(msg="Failed: '%s'" % res['errortext'])
+            items = res.get(result_key, [])
+            for item in items:
+                yield item
+            if len(items) < CS_PAGE_SIZE or page * CS_PAGE_SIZE >= res.get('count', 0):
+                return
+            page += 1
+
+
+    def _index(self, kind, items, keys, ignore_case=False):
+        index = self.indexes.setdefault(kind, {})
+        for item in items:
+            for key in keys:
+                value = item.get(key)
+                if value:
+                    if ignore_case:
+                        value = value.lower()
+                    index.setdefault(value, item)
+        return index
+
+
+    def _lookup(self, kind, identifier, api_call, result_key, keys, args, ignore_case=False, full_scan=False):
+        """Find a resource by any of its keys, fetching as little as possible.
+
+        Resources are queried by id or keyword first; a full paged listing
+        is only done if full_scan is set and the narrowed queries did not
+        match. Everything fetched is indexed for the rest of the run.
+        """
+        kind = (kind,) + tuple(sorted(args.items()))
+        key = identifier
+        if ignore_case:
+            key = key.lower()
+        index = self.indexes.setdefault(kind, {})
+        if key in index:
+            return index[key]
+
+        queries = []
+        if UUID_RE.match(identifier):
+            queries.append({'id': identifier})
+        queries.append({'keyword': identifier})
+        if full_scan:
+            queries.append({})
+
+        for query in queries:
+            query_args = dict(args)
+            query_args.update(query)
+            index = self._index(kind, self._list_paged(api_call, result_key, **query_args), keys, ignore_case)
+            if key in index:
+                return index[key]
+        return None
 
 
     def get_service_offering_id(self):
         service_offering = self.module.params.get('service_offering')
 
-        service_offerings = self.cs.listServiceOfferings()
-        if service_offerings:
-            if not service_offering:
-                return service_offerings['serviceoffering'][0]['id']
-
-            for s in service_offerings['serviceoffering']:
-                if service_offering in [ s['name'], s['id'] ]:
-                    return s['id']
+        if not service_offering:
+            for s in self._list_paged(self.cs.listServiceOfferings, 'serviceoffering'):
+                return s['id']
+        else:
+            s = self._lookup('serviceoffering', service_offering, self.cs.listServiceOfferings, 'serviceoffering',
+                             ['name', 'id'], {})
+            if s:
+                return s['id']
         self.module.fail_json(msg="Service offering '%s' not found" % service_offering)
 
 
@@ -460,24 +671,22 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
                 return self._get_by_key(key, self.template)
 
             args['templatefilter'] = self.module.params.get('template_filter')
-            templates = self.cs.listTemplates(**args)
-            if templates:
-                for t in templates['template']:
-                    if template in [ t['displaytext'], t['name'], t['id'] ]:
-                        self.template = t
-                        return self._get_by_key(key, self.template)
+            t = self._lookup('template', template, self.cs.listTemplates, 'template',
+                             ['displaytext', 'name', 'id'], args, full_scan=True)
+            if t:
+                self.template = t
+                return self._get_by_key(key, self.template)
             self.module.fail_json(msg="Template '%s' not found" % template)
 
         elif iso:
             if self.iso:
                 return self._get_by_key(key, self.iso)
             args['isofilter'] = self.module.params.get('template_filter')
-            isos = self.cs.listIsos(**args)
-            if isos:
-                for i in isos['iso']:
-                    if iso in [ i['displaytext'], i['name'], i['id'] ]:
-                        self.iso = i
-                        return self._get_by_key(key, self.iso)
+            i = self._lookup('iso', iso, self.cs.listIsos, 'iso',
+                             ['displaytext', 'name', 'id'], args, full_scan=True)
+            if i:
+                self.iso = i
+                return self._get_by_key(key, self.iso)
             self.module.fail_json(msg="ISO '%s' not found" % iso)
 
 
@@ -487,11 +696,10 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
         if not disk_offering:
             return None
 
-        disk_offerings = self.cs.listDiskOfferings()
-        if disk_offerings:
-            for d in disk_offerings['diskoffering']:
-                if disk_offering in [ d['displaytext'], d['name'], d['id'] ]:
-                    return d['id']
+        d = self._lookup('diskoffering', disk_offering, self.cs.listDiskOfferings, 'diskoffering',
+                         ['displaytext', 'name', 'id'], {})
+        if d:
+            return d['id']
         self.module.fail_json(msg="Disk offering '%s' not found" % disk_offering)
 
 
@@ -505,12 +713,9 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
             args['domainid']    = self.get_domain(key='id')
             args['projectid']   = self.get_project(key='id')
             # Do not pass zoneid, as the instance name must be unique across zones.
-            instances = self.cs.listVirtualMachines(**args)
-            if instances:
-                for v in instances['virtualmachine']:
-                    if instance_name.lower() in [ v['name'].lower(), v['displayname'].lower(), v['id'] ]:
-                        self.instance = v
-                        break
+            # The keyword filter matches both name and display name.
+            self.instance = self._lookup('virtualmachine', instance_name, self.cs.listVirtualMachines, 'virtualmachine',
+                                         ['name', 'displayname', 'id'], args, ignore_case=True)
         return self.instance
 
 
@@ -564,18 +769,21 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
         args['projectid']   = self.get_project(key='id')
         args['zoneid']      = self.get_zone(key='id')
 
-        networks = self.cs.listNetworks(**args)
+        kind = ('network',) + tuple(sorted(args.items()))
+        if kind not in self.indexes:
+            self._index(kind, self._list_paged(self.cs.listNetworks, 'network', **args),
+                        ['displaytext', 'name', 'id'])
+        networks = self.indexes[kind]
         if not networks:
             self.module.fail_json(msg="No networks available")
 
         network_ids = []
         network_displaytexts = []
         for network_name in network_names:
-            for n in networks['network']:
-                if network_name in [ n['displaytext'], n['name'], n['id'] ]:
-                    network_ids.append(n['id'])
-                    network_displaytexts.append(n['name'])
-                    break
+            n = networks.get(network_name)
+            if n:
+                network_ids.append(n['id'])
+                network_displaytexts.append(n['name'])
 
         if len(network_ids) != len(network_names):
             self.module.fail_json(msg="Could not find all networks, networks list found: %s" % network_displaytexts)
@@ -889,6 +1097,131 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
         return instance
 
 
+    def submit_instance_job(self, state):
+        instance = self.get_instance()
+        if state in ['present', 'deployed']:
+            if instance:
+                return instance, None
+            # deploy_instance does not poll, poll_async is disabled for batches
+            return None, self.deploy_instance()
+
+        if not instance:
+            return None, None
+
+        args = {}
+        args['id'] = instance['id']
+        instance_state = instance['state'].lower()
+        if state in ['absent', 'destroyed']:
+            if instance_state in ['expunging', 'destroying', 'destroyed']:
+                return instance, None
+        elif state in ['expunged']:
+            if instance_state in ['expunging']:
+                return instance, None
+            args['expunge'] = True
+
+        self.result['changed'] = True
+        res = None
+        if not self.module.check_mode:
+            res = self.cs.destroyVirtualMachine(**args)
+            if 'errortext' in res:
+                self.module.fail_json(msg="Failed: '%s'" % res['errortext'])
+        return instance, res
+
+
+    def poll_jobs(self, jobs, timeout):
+        """Poll all outstanding async jobs in turn until done or timeout.
+
+        jobs maps a job id to the result dict it updates.
+        """
+        deadline = time.time() + timeout
+        pending = dict(jobs)
+        while pending:
+            for jobid, result in pending.items():
+                res = self.cs.queryAsyncJobResult(jobid=jobid)
+                if res['jobstatus'] == 0 or 'jobresult' not in res:
+                    continue
+                del pending[jobid]
+                if 'errortext' in res['jobresult']:
+                    result['failed'] = True
+                    result['msg'] = res['jobresult']['errortext']
+                elif 'virtualmachine' in res['jobresult']:
+                    result['id'] = res['jobresult']['virtualmachine']['id']
+                    result['state'] = res['jobresult']['virtualmachine']['state']
+                else:
+                    result['state'] = 'Expunged'
+            if pending:
+                if time.time() >= deadline:
+                    break
+                time.sleep(2)
+
+        for jobid, result in pending.items():
+            result['failed'] = True
+            result['msg'] = "Timeout waiting for job %s" % jobid
+
+
+    def reset_lookups(self):
+        """Forget the objects resolved for the previous instance spec.
+
+        AnsibleCloudStack caches the zone, project, domain and account it
+        looked up, so they are cleared along with our own lookups to let
+        each spec use its own.
+        """
+        self.instance = None
+        self.template = None
+        self.iso = None
+        self.zone = None
+        self.project = None
+        self.domain = None
+        self.account = None
+        self.hypervisor = None
+
+
+    def batch_instances(self):
+        specs = self.module.params.get('instances')
+        task_params = dict(self.module.params)
+        task_params['poll_async'] = False
+        task_params['instances'] = None
+
+        results = []
+        jobs = {}
+        for spec in specs:
+            unknown = [k for k in spec if k not in task_params]
+            if unknown:
+                self.module.fail_json(msg="Unsupported instance options: %s" % ', '.join(unknown))
+            params = dict(task_params)
+            params.update(spec)
+            if not params.get('name') and not params.get('display_name'):
+                self.module.fail_json(msg="One of name or display_name is required for each instance")
+            state = params.get('state')
+            if state not in ['present', 'deployed', 'absent', 'destroyed', 'expunged']:
+                self.module.fail_json(msg="State '%s' is not supported for instances" % state)
+
+            self.module.params = params
+            self.reset_lookups()
+            changed = self.result['changed']
+            self.result['changed'] = False
+
+            instance, job = self.submit_instance_job(state)
+            result = {}
+            result['name'] = self.get_or_fallback('name', 'display_name')
+            result['changed'] = self.result['changed']
+            if instance:
+                result['id'] = instance['id']
+                result['state'] = instance['state']
+            if job and 'id' in job:
+                result['id'] = job['id']
+            if job and 'jobid' in job:
+                jobs[job['jobid']] = result
+            results.append(result)
+            self.result['changed'] = changed or result['changed']
+
+        self.module.params = task_params
+        self.reset_lookups()
+        self.poll_jobs(jobs, self.module.params.get('poll_timeout'))
+        self.result['instances'] = results
+        return results
+
+
     def get_result(self, instance):
         super(AnsibleCloudStackInstance, self).get_result(instance)
         if instance:
@@ -943,6 +1276,10 @@ def main():
         force = dict(type='bool', default=False),
         tags = dict(type='list', aliases=[ 'tag' ], default=None),
         poll_async = dict(type='bool', default=True),
+        api_cache_dir = dict(default=None),
+        api_cache_ttl = dict(type='int', default=600),
+        instances = dict(type='list', default=None),
+        poll_timeout = dict(type='int', default=600),
     ))
 
     required_together = cs_required_together()
@@ -954,7 +1291,7 @@ def main():
         argument_spec=argument_spec,
         required_together=required_together,
         required_one_of = (
-            ['display_name', 'name'],
+            ['display_name', 'name', 'instances'],
         ),
         mutually_exclusive = (
             ['template', 'iso'],
@@ -970,6 +1307,13 @@ def main():
 
         state = module.params.get('state')
 
+        if module.params.get('instances'):
+            instances = acs_instance.batch_instances()
+            result = acs_instance.result
+            if [i for i in instances if i.get('failed')]:
+                module.fail_json(msg="Failed to manage all instances", **result)
+            module.exit_json(**result)
+
         if state in ['absent', 'destroyed']:
             instance = acs_instance.absent_instance()
 
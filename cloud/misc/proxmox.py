@@ -137,7 +137,7 @@ options:
     type: string
   timeout:
     description:
-      - timeout for operations
+      - timeout in seconds for operations
     default: 30
     required: false
     type: integer
@@ -188,6 +188,7 @@ EXAMPLES = '''
 '''
 
 import os
+import random
 import time
 
 try:
@@ -198,6 +199,10 @@ except ImportError:
 
 VZ_TYPE=None
 
+# Delay before the first task status re-check and the cap of its backoff
+TASK_POLL_DELAY = 0.5
+TASK_POLL_MAX_DELAY = 5
+
 def get_instance(proxmox, vmid):
   return [ vm for vm in proxmox.cluster.resources.get(type='vm') if vm['vmid'] == int(vmid) ]
 
@@ -207,6 +212,31 @@ def content_check(proxmox, node, ostemplate, storage):
 def node_check(proxmox, node):
   return [ True for nd in proxmox.nodes.get() if nd['node'] == node ]
 
+def wait_for_task(module, proxmox, taskid, timeout, action):
+  """Wait for a Proxmox task to finish.
+
+  The status is fetched once per round on the node encoded in the UPID.
+  Rounds back off exponentially with jitter, up to TASK_POLL_MAX_DELAY
+  seconds apart, until the task stopped or timeout seconds passed.
+  """
+  proxmox_node = proxmox.nodes(taskid.split(':')[1])
+  deadline = time.time() + timeout
+  delay = TASK_POLL_DELAY
+  while True:
+    task_status = proxmox_node.tasks(taskid).status.get()
+    if task_status['status'] == 'stopped':
+      if task_status['exitstatus'] != 'OK':
+        module.fail_json(msg='Task failed while %s: %s. Last line in task: %s'
+                         % (action, task_status['exitstatus'], proxmox_node.tasks(taskid).log.get()[:1]))
+      return True
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+      module.fail_json(msg='Reached timeout while waiting for %s. Last line in task before timeout: %s'
+                       % (action, proxmox_node.tasks(taskid).log.get()[:1]))
+    time.sleep(min(remaining, delay * random.uniform(0.5, 1.5)))
+    delay = min(delay * 2, TASK_POLL_MAX_DELAY)
+
 def create_instance(module, proxmox, vmid, node, disk, storage, cpus, memory, swap, timeout, **kwargs):
   proxmox_node = proxmox.nodes(node)
   kwargs = dict((k,v) for k, v in kwargs.iteritems() if v is not None)
@@ -221,62 +251,22 @@ def create_instance(module, proxmox, vmid, node, disk, storage, cpus, memory, sw
       kwargs['disk']=disk
   taskid = getattr(proxmox_node, VZ_TYPE).create(vmid=vmid, storage=storage, memory=memory, swap=swap, **kwargs)
 
-  while timeout:
-    if ( proxmox_node.tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox_node.tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for creating VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
+  return wait_for_task(module, proxmox, taskid, timeout, 'creating VM')
 
 def start_instance(module, proxmox, vm, vmid, timeout):
   taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.start.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for starting VM. Last line in task before timeout: %s'
-                       % proxmox.nodes(vm[0]['node']).tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
+  return wait_for_task(module, proxmox, taskid, timeout, 'starting VM')
 
 def stop_instance(module, proxmox, vm, vmid, timeout, force):
   if force:
     taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.shutdown.post(forceStop=1)
   else:
     taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.shutdown.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for stopping VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
+  return wait_for_task(module, proxmox, taskid, timeout, 'stopping VM')
 
 def umount_instance(module, proxmox, vm, vmid, timeout):
   taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.umount.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for unmounting VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
+  return wait_for_task(module, proxmox, taskid, timeout, 'unmounting VM')
 
 def main():
   module = AnsibleModule(
@@ -430,16 +420,8 @@ def main():
         module.exit_json(changed=False, msg="VM %s is mounted. Stop it with force option before deletion." % vmid)
 
       taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE).delete(vmid)
-      while timeout:
-        if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-            and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-          module.exit_json(changed=True, msg="VM %s removed" % vmid)
-        timeout = timeout - 1
-        if timeout == 0:
-          module.fail_json(msg='Reached timeout while waiting for removing VM. Last line in task before timeout: %s'
-                           % proxmox_node.tasks(taskid).log.get()[:1])
-
-        time.sleep(1)
+      if wait_for_task(module, proxmox, taskid, timeout, 'removing VM'):
+        module.exit_json(changed=True, msg="VM %s removed" % vmid)
     except Exception, e:
       module.fail_json(msg="deletion of VM %s failed with exception: %s" % ( vmid, e ))
 
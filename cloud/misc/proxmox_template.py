@@ -111,6 +111,7 @@ EXAMPLES = '''
 '''
 
 import os
+import random
 import time
 
 try:
@@ -119,23 +120,42 @@ try:
 except ImportError:
   HAS_PROXMOXER = False
 
+# Delay before the first task status re-check and the cap of its backoff
+TASK_POLL_DELAY = 0.5
+TASK_POLL_MAX_DELAY = 5
+
 def get_template(proxmox, node, storage, content_type, template):
   return [ True for tmpl in proxmox.nodes(node).storage(storage).content.get()
           if tmpl['volid'] == '%s:%s/%s' % (storage, content_type, template) ]
 
-def upload_template(module, proxmox, api_host, node, storage, content_type, realpath, timeout):
-  taskid = proxmox.nodes(node).storage(storage).upload.post(content=content_type, filename=open(realpath))
-  while timeout:
-    task_status = proxmox.nodes(api_host.split('.')[0]).tasks(taskid).status.get()
-    if task_status['status'] == 'stopped' and task_status['exitstatus'] == 'OK':
+def wait_for_task(module, proxmox, taskid, timeout, action):
+  """Wait for a Proxmox task to finish.
+
+  The status is fetched once per round on the node encoded in the UPID.
+  Rounds back off exponentially with jitter, up to TASK_POLL_MAX_DELAY
+  seconds apart, until the task stopped or timeout seconds passed.
+  """
+  proxmox_node = proxmox.nodes(taskid.split(':')[1])
+  deadline = time.time() + timeout
+  delay = TASK_POLL_DELAY
+  while True:
+    task_status = proxmox_node.tasks(taskid).status.get()
+    if task_status['status'] == 'stopped':
+      if task_status['exitstatus'] != 'OK':
+        module.fail_json(msg='Task failed while %s: %s. Last line in task: %s'
+                         % (action, task_status['exitstatus'], proxmox_node.tasks(taskid).log.get()[:1]))
       return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for uploading template. Last line in task before timeout: %s'
-                       % proxmox.node(node).tasks(taskid).log.get()[:1])
 
-    time.sleep(1)
-  return False
+    remaining = deadline - time.time()
+    if remaining <= 0:
+      module.fail_json(msg='Reached timeout while waiting for %s. Last line in task before timeout: %s'
+                       % (action, proxmox_node.tasks(taskid).log.get()[:1]))
+    time.sleep(min(remaining, delay * random.uniform(0.5, 1.5)))
+    delay = min(delay * 2, TASK_POLL_MAX_DELAY)
+
+def upload_template(module, proxmox, api_host, node, storage, content_type, realpath, timeout):
+  taskid = proxmox.nodes(node).storage(storage).upload.post(content=content_type, filename=open(realpath))
+  return wait_for_task(module, proxmox, taskid, timeout, 'uploading template')
 
 def delete_template(module, proxmox, node, storage, content_type, template, timeout):
   volid = '%s:%s/%s' % (storage, content_type, template)
@@ -106,6 +106,12 @@ options:
     description:
       - how long before wait gives up, in seconds
     default: 600
+  concurrency:
+    description:
+      - maximum number of creation requests outstanding at once when creating multiple machines, 0 for no limit. All requests are tracked together against one C(wait_timeout).
+    required: false
+    default: 0
+    version_added: "2.2"
   remove_boot_volume:
     description:
       - remove the bootVolume of the virtual machine you're destroying.
@@ -197,83 +203,101 @@ uuid_match = re.compile(
     '[\w]{8}-[\w]{4}-[\w]{4}-[\w]{4}-[\w]{12}', re.I)
 
 
-def _wait_for_completion(profitbricks, promise, wait_timeout, msg):
-    if not promise: return
-    wait_timeout = time.time() + wait_timeout
-    while wait_timeout > time.time():
-        time.sleep(5)
-        operation_result = profitbricks.get_request(
-            request_id=promise['requestId'],
-            status=True)
-
-        if operation_result['metadata']['status'] == "DONE":
-            return
-        elif operation_result['metadata']['status'] == "FAILED":
-            raise Exception(
-                'Request failed to complete ' + msg + ' "' + str(
-                    promise['requestId']) + '" to complete.')
-
-    raise Exception(
-        'Timed out waiting for async operation ' + msg + ' "' + str(
-            promise['requestId']
-            ) + '" to complete.')
-
-def _create_machine(module, profitbricks, datacenter, name):
-    image = module.params.get('image')
-    cores = module.params.get('cores')
-    ram = module.params.get('ram')
-    volume_size = module.params.get('volume_size')
-    bus = module.params.get('bus')
-    lan = module.params.get('lan')
-    assign_public_ip = module.params.get('assign_public_ip')
-    subscription_user = module.params.get('subscription_user')
-    subscription_password = module.params.get('subscription_password')
-    location = module.params.get('location')
-    image = module.params.get('image')
-    assign_public_ip = module.boolean(module.params.get('assign_public_ip'))
-    wait = module.params.get('wait')
-    wait_timeout = module.params.get('wait_timeout')
+class RequestTracker(object):
+    """Tracks outstanding ProfitBricks requests and waits on them together.
 
-    try:
-        # Generate name, but grab first 10 chars so we don't
-        # screw up the uuid match routine.
-        v = Volume(
-            name=str(uuid.uuid4()).replace('-','')[:10],
-            size=volume_size,
-            image=image,
-            bus=bus)
-
-        volume_response = profitbricks.create_volume(
-            datacenter_id=datacenter, volume=v)
-
-        # We're forced to wait on the volume creation since
-        # server create relies upon this existing.
+    At most concurrency requests are kept outstanding (0 means no limit);
+    submitting another one first waits for earlier ones to complete. All
+    waits share a single deadline, wait_timeout seconds after creation.
+    """
 
-        _wait_for_completion(profitbricks, volume_response,
-                             wait_timeout, "create_volume")
-    except Exception as e:
-        module.fail_json(msg="failed to create the new volume: %s" % str(e))
+    def __init__(self, profitbricks, wait_timeout, concurrency=0):
+        self.profitbricks = profitbricks
+        self.deadline = time.time() + wait_timeout
+        self.concurrency = concurrency
+        self.pending = {}
+
+    def submit(self, msg, func, *args, **kwargs):
+        if self.concurrency:
+            self.wait(self.concurrency - 1)
+        promise = func(*args, **kwargs)
+        self.track(promise, msg)
+        return promise
+
+    def track(self, promise, msg):
+        # DELETE requests answered with 202 return a bare True, not a request
+        if not isinstance(promise, dict) or 'requestId' not in promise: return
+        self.pending[promise['requestId']] = msg
+
+    def wait(self, limit=0):
+        while len(self.pending) > limit:
+            if self.deadline <= time.time():
+                request_id, msg = self.pending.items()[0]
+                raise Exception(
+                    'Timed out waiting for async operation ' + msg + ' "' + str(
+                        request_id) + '" to complete.')
+            time.sleep(5)
+            for request_id, msg in self.pending.items():
+                operation_result = self.profitbricks.get_request(
+                    request_id=request_id,
+                    status=True)
+
+                if operation_result['metadata']['status'] == "DONE":
+                    del self.pending[request_id]
+                elif operation_result['metadata']['status'] == "FAILED":
+                    raise Exception(
+                        'Request failed to complete ' + msg + ' "' + str(
+                            request_id) + '" to complete.')
+
+def _get_lan(module, profitbricks, tracker, datacenter):
+    lan = module.params.get('lan')
+    assign_public_ip = module.boolean(module.params.get('assign_public_ip'))
 
     if assign_public_ip:
         public_found = False
 
         lans = profitbricks.list_lans(datacenter)
-        for lan in lans['items']:
-            if lan['properties']['public']:
+        for l in lans['items']:
+            if l['properties']['public']:
                 public_found = True
-                lan = lan['id']
+                lan = l['id']
 
         if not public_found:
             i = LAN(
                 name='public',
                 public=True)
 
-            lan_response = profitbricks.create_lan(datacenter, i)
+            lan_response = tracker.submit("_create_machine",
+                                          profitbricks.create_lan, datacenter, i)
 
             lan = lan_response['id']
 
-            _wait_for_completion(profitbricks, lan_response,
-                                 wait_timeout, "_create_machine")
+            tracker.wait()
+
+    return lan
+
+def _create_machine_volume(module, profitbricks, tracker, datacenter):
+    image = module.params.get('image')
+    volume_size = module.params.get('volume_size')
+    bus = module.params.get('bus')
+
+    try:
+        # Generate name, but grab first 10 chars so we don't
+        # screw up the uuid match routine.
+        v = Volume(
+            name=str(uuid.uuid4()).replace('-','')[:10],
+            size=volume_size,
+            image=image,
+            bus=bus)
+
+        return tracker.submit("create_volume", profitbricks.create_volume,
+                              datacenter_id=datacenter, volume=v)
+    except Exception as e:
+        module.fail_json(msg="failed to create the new volume: %s" % str(e))
+
+def _create_machine(module, profitbricks, tracker, datacenter, name, lan, volume_response):
+    cores = module.params.get('cores')
+    ram = module.params.get('ram')
 
     try:
         n = NIC(
@@ -290,15 +314,8 @@ def _create_machine(module, profitbricks, datacenter, name):
             boot_volume_id=volume_response['id']
             )
 
-        server_response = profitbricks.create_server(
-            datacenter_id=datacenter, server=s)
-
-        if wait:
-            _wait_for_completion(profitbricks, server_response,
-                                 wait_timeout, "create_virtual_machine")
-
-
-        return (server_response)
+        return tracker.submit("create_virtual_machine", profitbricks.create_server,
+                              datacenter_id=datacenter, server=s)
     except Exception as e:
         module.fail_json(msg="failed to create the new server: %s" % str(e))
 
@@ -357,8 +374,9 @@ def _create_datacenter(module, profitbricks):
     try:
         datacenter_response = profitbricks.create_datacenter(datacenter=i)
 
-        _wait_for_completion(profitbricks, datacenter_response,
-                             wait_timeout, "_create_datacenter")
+        tracker = RequestTracker(profitbricks, wait_timeout)
+        tracker.track(datacenter_response, "_create_datacenter")
+        tracker.wait()
 
         return datacenter_response
     except Exception as e:
@@ -379,7 +397,9 @@ def create_virtual_machine(module, profitbricks):
     auto_increment = module.params.get('auto_increment')
     count = module.params.get('count')
     lan = module.params.get('lan')
+    wait = module.params.get('wait')
     wait_timeout = module.params.get('wait_timeout')
+    concurrency = module.params.get('concurrency')
     failed = True
     datacenter_found = False
 
@@ -400,9 +420,6 @@ def create_virtual_machine(module, profitbricks):
         datacenter_response = _create_datacenter(module, profitbricks)
         datacenter = datacenter_response['id']
 
-        _wait_for_completion(profitbricks, datacenter_response,
-                             wait_timeout, "create_virtual_machine")
-
     if auto_increment:
         numbers = set()
         count_offset = 1
@@ -424,8 +441,37 @@ def create_virtual_machine(module, profitbricks):
     else:
         names = [name] * count
 
-    for name in  names: 
-        create_response = _create_machine(module, profitbricks, str(datacenter), name)
+    datacenter = str(datacenter)
+    tracker = RequestTracker(profitbricks, wait_timeout, concurrency)
+
+    try:
+        machine_lan = _get_lan(module, profitbricks, tracker, datacenter)
+    except Exception as e:
+        module.fail_json(msg="failed to create the public LAN: %s" % str(e))
+
+    # Submit all volumes first. We're forced to wait on the volume
+    # creation since server create relies upon this existing.
+    volume_responses = []
+    for name in names:
+        volume_responses.append(
+            _create_machine_volume(module, profitbricks, tracker, datacenter))
+    try:
+        tracker.wait()
+    except Exception as e:
+        module.fail_json(msg="failed to create the new volume: %s" % str(e))
+
+    create_responses = []
+    for name, volume_response in zip(names, volume_responses):
+        create_responses.append(
+            _create_machine(module, profitbricks, tracker, datacenter, name,
+                            machine_lan, volume_response))
+    if wait:
+        try:
+            tracker.wait()
+        except Exception as e:
+            module.fail_json(msg="failed to create the new server: %s" % str(e))
+
+    for create_response in create_responses:
         nics = profitbricks.list_nics(datacenter,create_response['id'])
         for n in nics['items']:
             if lan == n['properties']['lan']:
@@ -573,6 +619,7 @@ def main():
             assign_public_ip=dict(type='bool', default=False),
             wait=dict(type='bool', default=True),
             wait_timeout=dict(type='int', default=600),
+            concurrency=dict(type='int', default=0),
             remove_boot_volume=dict(type='bool', default=True),
             state=dict(default='present'),
         )
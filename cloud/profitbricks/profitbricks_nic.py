@@ -103,7 +103,8 @@ uuid_match = re.compile(
 
 
 def _wait_for_completion(profitbricks, promise, wait_timeout, msg):
-    if not promise: return
+    # DELETE requests answered with 202 return a bare True, not a request
+    if not isinstance(promise, dict) or 'requestId' not in promise: return
     wait_timeout = time.time() + wait_timeout
     while wait_timeout > time.time():
         time.sleep(5)
@@ -88,6 +88,12 @@ options:
     description:
       - how long before wait gives up, in seconds
     default: 600
+  concurrency:
+    description:
+      - maximum number of creation requests outstanding at once when creating multiple volumes, 0 for no limit. All requests are tracked together against one C(wait_timeout).
+    required: false
+    default: 0
+    version_added: "2.2"
   state:
     description:
       - create or terminate datacenters
@@ -138,35 +144,58 @@ uuid_match = re.compile(
     '[\w]{8}-[\w]{4}-[\w]{4}-[\w]{4}-[\w]{12}', re.I)
 
 
-def _wait_for_completion(profitbricks, promise, wait_timeout, msg):
-    if not promise: return
-    wait_timeout = time.time() + wait_timeout
-    while wait_timeout > time.time():
-        time.sleep(5)
-        operation_result = profitbricks.get_request(
-            request_id=promise['requestId'],
-            status=True)
-
-        if operation_result['metadata']['status'] == "DONE":
-            return
-        elif operation_result['metadata']['status'] == "FAILED":
-            raise Exception(
-                'Request failed to complete ' + msg + ' "' + str(
-                    promise['requestId']) + '" to complete.')
-
-    raise Exception(
-        'Timed out waiting for async operation ' + msg + ' "' + str(
-            promise['requestId']
-            ) + '" to complete.')
-
-def _create_volume(module, profitbricks, datacenter, name):
+class RequestTracker(object):
+    """Tracks outstanding ProfitBricks requests and waits on them together.
+
+    At most concurrency requests are kept outstanding (0 means no limit);
+    submitting another one first waits for earlier ones to complete. All
+    waits share a single deadline, wait_timeout seconds after creation.
+    """
+
+    def __init__(self, profitbricks, wait_timeout, concurrency=0):
+        self.profitbricks = profitbricks
+        self.deadline = time.time() + wait_timeout
+        self.concurrency = concurrency
+        self.pending = {}
+
+    def submit(self, msg, func, *args, **kwargs):
+        if self.concurrency:
+            self.wait(self.concurrency - 1)
+        promise = func(*args, **kwargs)
+        self.track(promise, msg)
+        return promise
+
+    def track(self, promise, msg):
+        # DELETE requests answered with 202 return a bare True, not a request
+        if not isinstance(promise, dict) or 'requestId' not in promise: return
+        self.pending[promise['requestId']] = msg
+
+    def wait(self, limit=0):
+        while len(self.pending) > limit:
+            if self.deadline <= time.time():
+                request_id, msg = self.pending.items()[0]
+                raise Exception(
+                    'Timed out waiting for async operation ' + msg + ' "' + str(
+                        request_id) + '" to complete.')
+            time.sleep(5)
+            for request_id, msg in self.pending.items():
+                operation_result = self.profitbricks.get_request(
+                    request_id=request_id,
+                    status=True)
+
+                if operation_result['metadata']['status'] == "DONE":
+                    del self.pending[request_id]
+                elif operation_result['metadata']['status'] == "FAILED":
+                    raise Exception(
+                        'Request failed to complete ' + msg + ' "' + str(
+                            request_id) + '" to complete.')
+
+def _create_volume(module, profitbricks, tracker, datacenter, name):
     size = module.params.get('size')
     bus = module.params.get('bus')
     image = module.params.get('image')
     disk_type = module.params.get('disk_type')
     licence_type = module.params.get('licence_type')
-    wait_timeout = module.params.get('wait_timeout')
-    wait = module.params.get('wait')
 
     try:
         v = Volume(
@@ -178,11 +207,8 @@ def _create_volume(module, profitbricks, datacenter, name):
             licence_type=licence_type
             )
 
-        volume_response = profitbricks.create_volume(datacenter, v)
-
-        if wait:
-            _wait_for_completion(profitbricks, volume_response,
-                                 wait_timeout, "_create_volume")
+        volume_response = tracker.submit("_create_volume",
+                                         profitbricks.create_volume, datacenter, v)
 
     except Exception as e:
         module.fail_json(msg="failed to create the volume: %s" % str(e))
@@ -211,6 +237,9 @@ def create_volume(module, profitbricks):
     name = module.params.get('name')
     auto_increment = module.params.get('auto_increment')
     count = module.params.get('count')
+    wait = module.params.get('wait')
+    wait_timeout = module.params.get('wait_timeout')
+    concurrency = module.params.get('concurrency')
 
     datacenter_found = False
     failed = True
@@ -250,11 +279,18 @@ def create_volume(module, profitbricks):
     else:
         names = [name] * count
 
-    for name in  names: 
-        create_response = _create_volume(module, profitbricks, str(datacenter), name)
+    tracker = RequestTracker(profitbricks, wait_timeout, concurrency)
+    for name in names:
+        create_response = _create_volume(module, profitbricks, tracker, str(datacenter), name)
         volumes.append(create_response)
         failed = False
 
+    if wait:
+        try:
+            tracker.wait()
+        except Exception as e:
+            module.fail_json(msg="failed to create the volume: %s" % str(e))
+
     results = {
         'failed': failed,
         'volumes': volumes,
@@ -325,6 +361,7 @@ def main():
             subscription_password=dict(),
             wait=dict(type='bool', default=True),
             wait_timeout=dict(type='int', default=600),
+            concurrency=dict(type='int', default=0),
             state=dict(default='present'),
         )
     )
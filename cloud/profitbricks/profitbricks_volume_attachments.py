@@ -101,7 +101,8 @@ uuid_match = re.compile(
 
 
 def _wait_for_completion(profitbricks, promise, wait_timeout, msg):
-    if not promise: return
+    # DELETE requests answered with 202 return a bare True, not a request
+    if not isinstance(promise, dict) or 'requestId' not in promise: return
     wait_timeout = time.time() + wait_timeout
     while wait_timeout > time.time():
         time.sleep(5)
@@ -136,6 +137,8 @@ def attach_volume(module, profitbricks):
     datacenter = module.params.get('datacenter')
     server = module.params.get('server')
     volume = module.params.get('volume')
+    wait = module.params.get('wait')
+    wait_timeout = module.params.get('wait_timeout')
 
     # Locate UUID for Datacenter
     if not (uuid_match.match(datacenter)):
@@ -162,7 +165,13 @@ def attach_volume(module, profitbricks):
                 volume = v['id']
                 break
 
-    return profitbricks.attach_volume(datacenter, server, volume)
+    attach_response = profitbricks.attach_volume(datacenter, server, volume)
+
+    if wait:
+        _wait_for_completion(profitbricks, attach_response,
+                             wait_timeout, "attach_volume")
+
+    return attach_response
 
 def detach_volume(module, profitbricks):
     """
@@ -179,6 +188,8 @@ def detach_volume(module, profitbricks):
     datacenter = module.params.get('datacenter')
     server = module.params.get('server')
     volume = module.params.get('volume')
+    wait = module.params.get('wait')
+    wait_timeout = module.params.get('wait_timeout')
 
     # Locate UUID for Datacenter
     if not (uuid_match.match(datacenter)):
@@ -205,7 +216,13 @@ def detach_volume(module, profitbricks):
                 volume = v['id']
                 break
 
-    return profitbricks.detach_volume(datacenter, server, volume)
+    detach_response = profitbricks.detach_volume(datacenter, server, volume)
+
+    if wait:
+        _wait_for_completion(profitbricks, detach_response,
+                             wait_timeout, "detach_volume")
+
+    return detach_response
 
 def main():
     module = AnsibleModule(
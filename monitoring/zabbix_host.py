@@ -63,7 +63,8 @@ options:
         description:
             - Name of the host in Zabbix.
             - host_name is the unique identifier used and cannot be updated using this module.
-        required: true
+            - Required unless C(hosts) is given.
+        required: false
     host_groups:
         description:
             - List of host groups the host is part of.
@@ -117,6 +118,18 @@ options:
         default: "yes"
         choices: [ "yes", "no" ]
         version_added: "2.0"
+    hosts:
+        description:
+            - List of hosts to create, update or delete in one run (see example below).
+            - Each entry takes C(host_name) and optionally C(host_groups), C(link_templates), C(status),
+              C(state), C(inventory_mode), C(interfaces) and C(proxy), which default to the module's options.
+            - Groups, templates and proxies of all entries are looked up once, all hosts are compared
+              against a single host.get, and changes are applied with batched host.create,
+              host.massupdate and host.delete calls.
+            - Mutually exclusive with C(host_name).
+        required: false
+        default: None
+        version_added: "2.2"
 '''
 
 EXAMPLES = '''
@@ -150,11 +163,34 @@ EXAMPLES = '''
         dns: ""
         port: 12345
     proxy: a.zabbix.proxy
+
+- name: Register many hosts at once
+  local_action:
+    module: zabbix_host
+    server_url: http://monitor.example.com
+    login_user: username
+    login_password: password
+    host_groups:
+      - Example group1
+    link_templates:
+      - Example template1
+    hosts:
+      - host_name: web01
+        interfaces:
+          - {type: 1, main: 1, useip: 1, ip: 10.0.0.11, dns: "", port: 10050}
+      - host_name: web02
+        interfaces:
+          - {type: 1, main: 1, useip: 1, ip: 10.0.0.12, dns: "", port: 10050}
+      - host_name: web03
+        state: absent
 '''
 
 import logging
 import copy
 
+INVENTORY_MODES = {'automatic': 1, 'manual': 0, 'disabled': -1}
+HOST_SPEC_KEYS = ['host_groups', 'link_templates', 'status', 'state', 'inventory_mode', 'interfaces', 'proxy']
+
 try:
     from zabbix_api import ZabbixAPI, ZabbixAPISubClass
 
@@ -410,13 +446,151 @@ class Host(object):
         except Exception, e:
             self._module.fail_json(msg="Failed to set inventory_mode to host: %s" % e)
 
+    # look up many objects by name with one call, failing on any missing name
+    def get_ids_by_names(self, api, names, name_field, id_field, kind):
+        if not names:
+            return {}
+        object_list = api.get({'output': [id_field, name_field], 'filter': {name_field: list(names)}})
+        ids = dict((obj[name_field], obj[id_field]) for obj in object_list)
+        missing = [name for name in names if name not in ids]
+        if missing:
+            self._module.fail_json(msg="%s not found: %s" % (kind, ', '.join(sorted(missing))))
+        return ids
+
+    # get many hosts with their groups, templates and interfaces with one call
+    def get_hosts_by_host_names(self, host_names):
+        host_list = self._zapi.host.get({'output': 'extend', 'filter': {'host': list(host_names)},
+                                         'selectGroups': ['groupid', 'name'],
+                                         'selectParentTemplates': ['templateid'],
+                                         'selectInterfaces': 'extend'})
+        return dict((host['host'], host) for host in host_list)
+
+    # build the hostinterface calls that make a host's interfaces match, like update_host
+    def diff_interfaces(self, host_id, interfaces, exist_interface_list):
+        to_update = []
+        to_create = []
+        remaining = list(exist_interface_list)
+        for interface in interfaces:
+            interface_str = dict(interface)
+            for exist_interface in remaining:
+                if interface['type'] == int(exist_interface['type']):
+                    interface_str['interfaceid'] = exist_interface['interfaceid']
+                    to_update.append(interface_str)
+                    remaining.remove(exist_interface)
+                    break
+            else:
+                interface_str['hostid'] = host_id
+                to_create.append(interface_str)
+        return to_update, to_create, [interface['interfaceid'] for interface in remaining]
+
+    # create, update and delete all hosts of the 'hosts' list in batches
+    def apply_hosts(self, host_specs, force):
+        names = lambda key: set(name for spec in host_specs for name in (spec[key] or []))
+        group_ids = self.get_ids_by_names(self._zapi.hostgroup, names('host_groups'), 'name', 'groupid', 'Hostgroup')
+        template_ids = self.get_ids_by_names(self._zapi.template, names('link_templates'), 'host', 'templateid', 'Template')
+        proxies = set(spec['proxy'] for spec in host_specs if spec['proxy'])
+        proxy_ids = self.get_ids_by_names(self._zapi.proxy, proxies, 'host', 'proxyid', 'Proxy')
+        exist_hosts = self.get_hosts_by_host_names([spec['host_name'] for spec in host_specs])
+
+        to_create = []
+        to_delete = []
+        mass_updates = {}
+        interface_updates, interface_creates, interface_deletes = [], [], []
+        results = []
+
+        for spec in host_specs:
+            host_name = spec['host_name']
+            exist_host = exist_hosts.get(host_name)
+            status = 1 if spec['status'] == "disabled" else 0
+            interfaces = spec['interfaces']
+            spec_template_ids = [template_ids[name] for name in (spec['link_templates'] or [])]
+            proxy_id = proxy_ids[spec['proxy']] if spec['proxy'] else '0'
+            result = dict(host_name=host_name, changed=False)
+            results.append(result)
+
+            if spec['state'] == "absent":
+                if exist_host:
+                    to_delete.append(exist_host['hostid'])
+                    result.update(changed=True, action="deleted")
+                continue
+
+            if not spec['host_groups']:
+                self._module.fail_json(msg="Specify at least one group for host '%s'." % host_name)
+            groups = [{'groupid': group_ids[name]} for name in spec['host_groups']]
+
+            if not exist_host:
+                if not interfaces:
+                    self._module.fail_json(msg="Specify at least one interface for creating host '%s'." % host_name)
+                parameters = {'host': host_name, 'interfaces': interfaces, 'groups': groups, 'status': status,
+                              'proxy_hostid': proxy_id,
+                              'templates': [{'templateid': template_id} for template_id in spec_template_ids]}
+                if spec['inventory_mode']:
+                    parameters['inventory_mode'] = INVENTORY_MODES[spec['inventory_mode']]
+                to_create.append(parameters)
+                result.update(changed=True, action="created")
+                continue
+
+            exist_template_ids = set(template['templateid'] for template in exist_host['parentTemplates'])
+            exist_interfaces = exist_host['interfaces']
+            if (set(spec['host_groups']) == set(group['name'] for group in exist_host['groups'])
+                    and int(status) == int(exist_host['status'])
+                    and (not interfaces or not self.check_interface_properties(exist_interfaces, interfaces))
+                    and set(spec_template_ids) == exist_template_ids
+                    and str(exist_host['proxy_hostid']) == str(proxy_id)):
+                continue
+            if not force:
+                self._module.fail_json(changed=False, result="Host %s present, Can't update configuration without force" % host_name)
+
+            # hosts that need the same values are changed by one host.massupdate
+            templates_clear = sorted(exist_template_ids.difference(spec_template_ids))
+            update_key = (tuple(sorted(group['groupid'] for group in groups)), status, proxy_id,
+                          tuple(sorted(set(spec_template_ids))), tuple(templates_clear), spec['inventory_mode'])
+            mass_updates.setdefault(update_key, []).append(exist_host['hostid'])
+            if interfaces:
+                updates, creates, deletes = self.diff_interfaces(exist_host['hostid'], interfaces, exist_interfaces)
+                interface_updates.extend(updates)
+                interface_creates.extend(creates)
+                interface_deletes.extend(deletes)
+            result.update(changed=True, action="updated")
+
+        changed = bool(to_create or to_delete or mass_updates)
+        if self._module.check_mode or not changed:
+            return changed, results
+
+        try:
+            if to_delete:
+                self._zapi.host.delete(to_delete)
+            if to_create:
+                self._zapi.host.create(to_create)
+            for update_key, host_ids in sorted(mass_updates.items()):
+                group_id_list, status, proxy_id, update_template_ids, templates_clear, inventory_mode = update_key
+                parameters = {'hosts': [{'hostid': host_id} for host_id in host_ids],
+                              'groups': [{'groupid': group_id} for group_id in group_id_list],
+                              'status': status, 'proxy_hostid': proxy_id,
+                              'templates': [{'templateid': template_id} for template_id in update_template_ids]}
+                if templates_clear:
+                    parameters['templates_clear'] = [{'templateid': template_id} for template_id in templates_clear]
+                if inventory_mode:
+                    parameters['inventory_mode'] = INVENTORY_MODES[inventory_mode]
+                self._zapi.host.massupdate(parameters)
+            if interface_updates:
+                self._zapi.hostinterface.update(interface_updates)
+            if interface_creates:
+                self._zapi.hostinterface.create(interface_creates)
+            if interface_deletes:
+                self._zapi.hostinterface.delete(interface_deletes)
+        except Exception, e:
+            self._module.fail_json(msg="Failed to apply hosts: %s" % e)
+
+        return changed, results
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             server_url=dict(type='str', required=True, aliases=['url']),
             login_user=dict(rtype='str', equired=True),
             login_password=dict(type='str', required=True, no_log=True),
-            host_name=dict(type='str', required=True),
+            host_name=dict(type='str', required=False),
             http_login_user=dict(type='str', required=False, default=None),
             http_login_password=dict(type='str', required=False, default=None, no_log=True),
             host_groups=dict(type='list', required=False),
@@ -427,8 +601,11 @@ def main():
             timeout=dict(type='int', default=10),
             interfaces=dict(type='list', required=False),
             force=dict(type='bool', default=True),
-            proxy=dict(type='str', required=False)
+            proxy=dict(type='str', required=False),
+            hosts=dict(type='list', required=False)
         ),
+        required_one_of=[['host_name', 'hosts']],
+        mutually_exclusive=[['host_name', 'hosts']],
         supports_check_mode=True
     )
 
@@ -464,6 +641,21 @@ def main():
 
     host = Host(module, zbx)
 
+    if module.params['hosts'] is not None:
+        host_specs = []
+        for entry in module.params['hosts']:
+            if not isinstance(entry, dict) or not entry.get('host_name'):
+                module.fail_json(msg="Each entry in hosts must be a dict with a host_name: %s" % entry)
+            spec = dict((key, entry.get(key, module.params[key])) for key in HOST_SPEC_KEYS)
+            spec['host_name'] = entry['host_name']
+            if spec['status'] not in ('enabled', 'disabled') or spec['state'] not in ('present', 'absent'):
+                module.fail_json(msg="Invalid status or state for host %s" % spec['host_name'])
+            if spec['inventory_mode'] and spec['inventory_mode'] not in INVENTORY_MODES:
+                module.fail_json(msg="Invalid inventory_mode for host %s" % spec['host_name'])
+            host_specs.append(spec)
+        changed, results = host.apply_hosts(host_specs, force)
+        module.exit_json(changed=changed, hosts=results)
+
     template_ids = []
     if link_templates:
         template_ids = host.get_template_ids(link_templates)
@@ -163,6 +163,7 @@ class Screen(object):
     def __init__(self, module, zbx):
         self._module = module
         self._zapi = zbx
+        self._graphs = {}
 
     # get group id by group name
     def get_host_group_id(self, group_name):
@@ -233,7 +234,7 @@ class Screen(object):
         graph_id_lists = []
         vsize = 1
         for host in hosts:
-            graph_id_list = self.get_graphs_by_host_id(graph_name_list, host)
+            graph_id_list = self.get_graphs_by_host_id(graph_name_list, host, hosts)
             size = len(graph_id_list)
             if size > 0:
                 graph_id_lists.extend(graph_id_list)
@@ -241,19 +242,37 @@ class Screen(object):
                     vsize = size
         return graph_id_lists, vsize
 
-    #  getGraphs
-    def get_graphs_by_host_id(self, graph_name_list, host_id):
-        graph_ids = []
-        for graph_name in graph_name_list:
-            graphs_list = self._zapi.graph.get({'output': 'extend', 'search': {'name': graph_name}, 'hostids': host_id})
-            graph_id_list = []
-            if len(graphs_list) > 0:
+    # get the graphs of all hosts with one graph.get, cached for the run
+    def get_graphs_by_host_ids(self, graph_name_list, host_ids):
+        cache_key = (tuple(host_ids), tuple(graph_name_list))
+        if cache_key not in self._graphs:
+            graphs_by_host = dict((host_id, []) for host_id in host_ids)
+            if graph_name_list:
+                graphs_list = self._zapi.graph.get({'output': ['graphid', 'name'], 'selectHosts': ['hostid'],
+                                                    'search': {'name': list(graph_name_list)}, 'searchByAny': True,
+                                                    'hostids': list(host_ids), 'sortfield': 'graphid'})
                 for graph in graphs_list:
-                    graph_id = graph['graphid']
-                    graph_id_list.append(graph_id)
-            if len(graph_id_list) > 0:
-                graph_ids.extend(graph_id_list)
-        return graph_ids
+                    for host in graph.get('hosts', []):
+                        if host['hostid'] in graphs_by_host:
+                            graphs_by_host[host['hostid']].append(graph)
+
+            # keep the order of one search per graph name, like graph.get's
+            # case-insensitive substring search
+            graph_ids = {}
+            for host_id, graphs in graphs_by_host.items():
+                graph_ids[host_id] = []
+                for graph_name in graph_name_list:
+                    for graph in graphs:
+                        if graph_name.lower() in graph['name'].lower():
+                            graph_ids[host_id].append(graph['graphid'])
+            self._graphs[cache_key] = graph_ids
+        return self._graphs[cache_key]
+
+    #  getGraphs
+    def get_graphs_by_host_id(self, graph_name_list, host_id, host_ids=None):
+        if host_ids is None:
+            host_ids = [host_id]
+        return self.get_graphs_by_host_ids(graph_name_list, host_ids).get(host_id, [])
 
     # get screen items
     def get_screen_items(self, screen_id):
@@ -299,27 +318,32 @@ class Screen(object):
         if height is None or height < 0:
             height = 100
 
-        try:
-            # when there're only one host, only one row is not good.
-            if len(hosts) == 1:
-                graph_id_list = self.get_graphs_by_host_id(graph_name_list, hosts[0])
-                for i, graph_id in enumerate(graph_id_list):
+        screen_items = []
+        # when there're only one host, only one row is not good.
+        if len(hosts) == 1:
+            graph_id_list = self.get_graphs_by_host_id(graph_name_list, hosts[0], hosts)
+            for i, graph_id in enumerate(graph_id_list):
+                if graph_id is not None:
+                    screen_items.append({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
+                                         'width': width, 'height': height,
+                                         'x': i % h_size, 'y': i / h_size, 'colspan': 1, 'rowspan': 1,
+                                         'elements': 0, 'valign': 0, 'halign': 0,
+                                         'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+        else:
+            for i, host in enumerate(hosts):
+                graph_id_list = self.get_graphs_by_host_id(graph_name_list, host, hosts)
+                for j, graph_id in enumerate(graph_id_list):
                     if graph_id is not None:
-                        self._zapi.screenitem.create({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
-                                                      'width': width, 'height': height,
-                                                      'x': i % h_size, 'y': i / h_size, 'colspan': 1, 'rowspan': 1,
-                                                      'elements': 0, 'valign': 0, 'halign': 0,
-                                                      'style': 0, 'dynamic': 0, 'sort_triggers': 0})
-            else:
-                for i, host in enumerate(hosts):
-                    graph_id_list = self.get_graphs_by_host_id(graph_name_list, host)
-                    for j, graph_id in enumerate(graph_id_list):
-                        if graph_id is not None:
-                            self._zapi.screenitem.create({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
-                                                          'width': width, 'height': height,
-                                                          'x': i, 'y': j, 'colspan': 1, 'rowspan': 1,
-                                                          'elements': 0, 'valign': 0, 'halign': 0,
-                                                          'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+                        screen_items.append({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
+                                             'width': width, 'height': height,
+                                             'x': i, 'y': j, 'colspan': 1, 'rowspan': 1,
+                                             'elements': 0, 'valign': 0, 'halign': 0,
+                                             'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+
+        if not screen_items:
+            return
+        try:
+            self._zapi.screenitem.create(screen_items)
         except Already_Exists:
             pass
 
@@ -26,6 +26,9 @@ except ImportError:
     except ImportError:
         # Let snippet from module_utils/basic.py return a proper error in this case
         pass
+import Queue
+import sys
+import threading
 import urllib
 
 DOCUMENTATION = '''
@@ -111,6 +114,29 @@ options:
       - The name of the Zone to work with (e.g. "example.com"). The Zone must already exist.
     required: true
     aliases: ["domain"]
+  records:
+    description:
+      - List of records to reconcile against the zone in one run. Each entry is a dict taking the
+        C(record), C(type), C(value), C(ttl), C(priority), C(port), C(proto), C(service), C(weight),
+        C(solo) and C(state) options, which default to the module's options.
+      - The zone's records are downloaded once and indexed, then only records that differ are
+        created, updated or deleted.
+    required: false
+    default: null
+    version_added: "2.2"
+  purge:
+    description:
+      - When C(records) is given, delete all records of the zone whose type is one of the types
+        of the C(state=present) entries in C(records) but which are not in C(records).
+    required: false
+    default: false
+    version_added: "2.2"
+  max_workers:
+    description:
+      - Number of result pages fetched concurrently once the number of pages is known.
+    required: false
+    default: 4
+    version_added: "2.2"
 '''
 
 EXAMPLES = '''
@@ -174,9 +200,30 @@ EXAMPLES = '''
     weight: 20
     type: SRV
     value: fooserver.my.com
+
+# make sure exactly these A records exist in my.com
+- cloudflare_dns:
+    zone: my.com
+    purge: true
+    records:
+      - { record: www, type: A, value: 10.0.0.1 }
+      - { record: www, type: A, value: 10.0.0.2 }
+      - { record: api, type: A, value: 10.0.0.3, ttl: 300 }
+    account_email: test@example.com
+    account_api_token: dummyapitoken
 '''
 
 RETURN = '''
+result:
+    description: the records of the zone after reconciliation, when C(records) is given
+    returned: success, if records is given
+    type: dictionary
+    contains:
+        records:
+            description: list of the zone's records, each with the keys described for C(record)
+            returned: success, if records is given
+            type: list
+            sample: [{ name: "www.sample.com", type: "A", content: "10.0.0.1", ttl: 1 }]
 record:
     description: dictionary containing the record data
     returned: success, except on record deletion
@@ -289,26 +336,45 @@ class CloudflareAPI(object):
         self.value             = module.params['value']
         self.weight            = module.params['weight']
         self.zone              = module.params['zone']
+        self.max_workers       = module.params['max_workers']
+        self.zone_ids          = {}
+        self.zone_records      = {}
 
-        if self.record == '@':
-            self.record = self.zone
+        self.normalize_params(self.__dict__)
 
-        if (self.type in ['CNAME','NS','MX','SRV']) and (self.value is not None):
-            self.value = self.value.rstrip('.')
+    def normalize_params(self,params):
+        if params['record'] == '@':
+            params['record'] = params['zone']
 
-        if (self.type == 'SRV'):
-            if (self.proto is not None) and (not self.proto.startswith('_')):
-                self.proto = '_' + self.proto
-            if (self.service is not None) and (not self.service.startswith('_')):
-                self.service = '_' + self.service
+        if (params['type'] in ['CNAME','NS','MX','SRV']) and (params['value'] is not None):
+            params['value'] = params['value'].rstrip('.')
 
-        if not self.record.endswith(self.zone):
-            self.record = self.record + '.' + self.zone
+        if (params['type'] == 'SRV'):
+            if (params['proto'] is not None) and (not params['proto'].startswith('_')):
+                params['proto'] = '_' + params['proto']
+            if (params['service'] is not None) and (not params['service'].startswith('_')):
+                params['service'] = '_' + params['service']
 
-    def _cf_simple_api_call(self,api_call,method='GET',payload=None):
+        if not params['record'].endswith(params['zone']):
+            params['record'] = params['record'] + '.' + params['zone']
+        return params
+
+    def _cf_request(self,api_call,method='GET',data=None):
         headers = { 'X-Auth-Email': self.account_email,
                     'X-Auth-Key': self.account_api_token,
                     'Content-Type': 'application/json' }
+        resp, info = fetch_url(self.module,
+                               self.cf_api_endpoint + api_call,
+                               headers=headers,
+                               data=data,
+                               method=method,
+                               timeout=self.timeout)
+        content = None
+        if resp is not None:
+            content = resp.read()
+        return content, info
+
+    def _cf_simple_api_call(self,api_call,method='GET',payload=None):
         data = None
         if payload:
             try:
@@ -316,13 +382,10 @@ class CloudflareAPI(object):
             except Exception, e:
                 self.module.fail_json(msg="Failed to encode payload as JSON: {0}".format(e))
 
-        resp, info = fetch_url(self.module,
-                               self.cf_api_endpoint + api_call,
-                               headers=headers,
-                               data=data,
-                               method=method,
-                               timeout=self.timeout)
+        content, info = self._cf_request(api_call,method,data)
+        return self._cf_parse_response(api_call,method,content,info)
 
+    def _cf_parse_response(self,api_call,method,content,info):
         if info['status'] not in [200,304,400,401,403,429,405,415]:
             self.module.fail_json(msg="Failed API call {0}; got unexpected HTTP code {1}".format(api_call,info['status']))
 
@@ -347,13 +410,13 @@ class CloudflareAPI(object):
             error_msg = "API bad request; Status: {0}; Method: {1}: Call: {2}".format(info['status'],method,api_call)
 
         result = None
-        try:
-            content = resp.read()
-            result = json.loads(content)
-        except AttributeError:
+        if content is None:
             error_msg += "; The API response was empty"
-        except json.JSONDecodeError:
-            error_msg += "; Failed to parse API response: {0}".format(content)
+        else:
+            try:
+                result = json.loads(content)
+            except ValueError:
+                error_msg += "; Failed to parse API response: {0}".format(content)
 
         # received an error status but no data with details on what failed
         if  (info['status'] not in [200,304]) and (result is None):
@@ -378,26 +441,65 @@ class CloudflareAPI(object):
         if 'result_info' in result:
             pagination = result['result_info']
             if pagination['total_pages'] > 1:
-                next_page = int(pagination['page']) + 1
-                parameters = ['page={0}'.format(next_page)]
                 # strip "page" parameter from call parameters (if there are any)
+                parameters = []
                 if '?' in api_call:
                     raw_api_call,query = api_call.split('?',1)
-                    parameters += [param for param in query.split('&') if not param.startswith('page')]
+                    parameters += [param for param in query.split('&') if not param.startswith('page=')]
                 else:
                     raw_api_call = api_call
-                while next_page <= pagination['total_pages']:
-                    raw_api_call += '?' + '&'.join(parameters)
-                    result, status = self._cf_simple_api_call(raw_api_call,method,payload)
+                page_calls = []
+                for page in range(int(pagination['page']) + 1, pagination['total_pages'] + 1):
+                    page_calls.append(raw_api_call + '?' + '&'.join(['page={0}'.format(page)] + parameters))
+                for page_call, (content, info) in zip(page_calls, self._cf_requests(page_calls,method)):
+                    result, status = self._cf_parse_response(page_call,method,content,info)
                     data += result['result']
-                    next_page += 1
 
         return data, status
 
+    def _cf_requests(self,api_calls,method='GET'):
+        # fetch the calls on up to max_workers threads; responses are only
+        # checked afterwards so that failures are reported from this thread
+        responses = [None] * len(api_calls)
+        exits = []
+        queue = Queue.Queue()
+        for item in enumerate(api_calls):
+            queue.put(item)
+
+        def worker():
+            while not exits:
+                try:
+                    index, api_call = queue.get_nowait()
+                except Queue.Empty:
+                    return
+                try:
+                    responses[index] = self._cf_request(api_call,method)
+                except SystemExit:
+                    # fail_json already reported the error, exit from the
+                    # calling thread once all workers are done
+                    exits.append(sys.exc_info())
+                except Exception, e:
+                    responses[index] = (None, {'status': -1, 'msg': str(e)})
+
+        threads = [threading.Thread(target=worker)
+                   for i in range(max(1, min(self.max_workers, len(api_calls))))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if exits:
+            exc_type, exc_value, exc_tb = exits[0]
+            raise exc_type, exc_value, exc_tb
+        return responses
+
     def _get_zone_id(self,zone=None):
         if not zone:
             zone = self.zone
 
+        if zone in self.zone_ids:
+            return self.zone_ids[zone]
+
         zones = self.get_zones(zone)
         if len(zones) > 1:
             self.module.fail_json(msg="More than one zone matches {0}".format(zone))
@@ -405,6 +507,7 @@ class CloudflareAPI(object):
         if len(zones) < 1:
             self.module.fail_json(msg="No zone found with name {0}".format(zone))
 
+        self.zone_ids[zone] = zones[0]['id']
         return zones[0]['id']
 
     def get_zones(self,name=None):
@@ -429,6 +532,9 @@ class CloudflareAPI(object):
             value = self.value
 
         zone_id = self._get_zone_id()
+        if zone_id in self.zone_records:
+            return self._find_indexed_records(zone_id,type,record,value)
+
         api_call = '/zones/{0}/dns_records'.format(zone_id)
         query = {}
         if type:
@@ -443,6 +549,42 @@ class CloudflareAPI(object):
         records,status = self._cf_api_call(api_call)
         return records
 
+    def index_dns_records(self,zone_name=None):
+        # download all records of the zone once; get_dns_records then looks
+        # records up in the index and changes made by this module keep it
+        # up to date
+        zone_id = self._get_zone_id(zone_name)
+        records,status = self._cf_api_call('/zones/{0}/dns_records?per_page=100'.format(zone_id))
+        self.zone_records[zone_id] = {}
+        for rr in records:
+            self._index_record(zone_id,rr)
+        return zone_id
+
+    def _index_record(self,zone_id,rr):
+        if zone_id in self.zone_records:
+            key = (rr['type'],rr['name'].lower())
+            self.zone_records[zone_id].setdefault(key,[]).append(rr)
+
+    def _unindex_record(self,zone_id,record_id):
+        if zone_id in self.zone_records:
+            for records in self.zone_records[zone_id].values():
+                records[:] = [rr for rr in records if rr['id'] != record_id]
+
+    def _find_indexed_records(self,zone_id,type=None,record=None,value=None):
+        index = self.zone_records[zone_id]
+        if type and record:
+            candidates = index.get((type,record.lower()),[])
+        else:
+            candidates = [rr for records in index.values() for rr in records
+                          if (not type or rr['type'] == type) and (not record or rr['name'].lower() == record.lower())]
+        if value:
+            candidates = [rr for rr in candidates if rr['content'] == value]
+        return list(candidates)
+
+    def get_indexed_records(self,zone_name=None):
+        zone_id = self._get_zone_id(zone_name)
+        return [rr for records in self.zone_records.get(zone_id,{}).values() for rr in records]
+
     def delete_dns_records(self,**kwargs):
         params = {}
         for param in ['port','proto','service','solo','type','record','value','weight','zone']:
@@ -470,10 +612,12 @@ class CloudflareAPI(object):
                     self.changed = True
                     if not self.module.check_mode:
                         result, info = self._cf_api_call('/zones/{0}/dns_records/{1}'.format(rr['zone_id'],rr['id']),'DELETE')
+                    self._unindex_record(rr['zone_id'],rr['id'])
             else:
                 self.changed = True
                 if not self.module.check_mode:
                     result, info = self._cf_api_call('/zones/{0}/dns_records/{1}'.format(rr['zone_id'],rr['id']),'DELETE')
+                self._unindex_record(rr['zone_id'],rr['id'])
         return self.changed
 
     def ensure_dns_record(self,**kwargs):
@@ -554,20 +698,78 @@ class CloudflareAPI(object):
             if ('data' in new_record) and ('data' in cur_record):
                 if (cur_record['data'] > new_record['data']) - (cur_record['data'] < new_record['data']):
                     do_update = True
-            if (type == 'CNAME') and (cur_record['content'] != new_record['content']):
+            if (params['type'] == 'CNAME') and (cur_record['content'] != new_record['content']):
                 do_update = True
             if do_update:
+                # keep the record id so a purge does not delete the record
+                result = dict(new_record)
+                result['id'] = cur_record['id']
                 if not self.module.check_mode:
                     result, info = self._cf_api_call('/zones/{0}/dns_records/{1}'.format(zone_id,records[0]['id']),'PUT',new_record)
+                    self._unindex_record(zone_id,cur_record['id'])
+                    self._index_record(zone_id,result)
                 self.changed = True
                 return result,self.changed
             else:
                 return records,self.changed
+        result = new_record
         if not self.module.check_mode:
             result, info = self._cf_api_call('/zones/{0}/dns_records'.format(zone_id),'POST',new_record)
+            self._index_record(zone_id,result)
         self.changed = True
         return result,self.changed
 
+    def reconcile_dns_records(self,records,purge=False):
+        # apply every entry of records against the indexed zone; with purge
+        # all other records of the types of present entries are deleted
+        zone_id = self.index_dns_records()
+        keep = set()
+        types = set()
+        for entry in records:
+            if not isinstance(entry,dict):
+                self.module.fail_json(msg="Each entry in records must be a dict, got: {0}".format(entry))
+            params = {}
+            for param in ['port','priority','proto','service','ttl','type','record','value','weight','zone','solo','state']:
+                if param == 'solo':
+                    params[param] = entry.get(param,self.is_solo)
+                else:
+                    params[param] = entry.get(param,getattr(self,param))
+            if 'name' in entry:
+                params['record'] = entry['name']
+            if 'content' in entry:
+                params['value'] = entry['content']
+            if params['value'] is not None:
+                params['value'] = str(params['value'])
+            self.normalize_params(params)
+            if params['type'] is None:
+                self.module.fail_json(msg="You must provide a type for each entry in records")
+
+            if params['state'] == 'absent':
+                self.delete_dns_records(**dict(params,solo=False))
+                continue
+            types.add(params['type'])
+            if params['solo']:
+                self.delete_dns_records(**params)
+            result,changed = self.ensure_dns_record(**params)
+            if not isinstance(result,list):
+                result = [result]
+            for rr in result:
+                if 'id' in rr:
+                    keep.add(rr['id'])
+
+        if purge:
+            delete_calls = []
+            for rr in self.get_indexed_records():
+                if rr['type'] in types and rr['id'] not in keep:
+                    self.changed = True
+                    delete_calls.append('/zones/{0}/dns_records/{1}'.format(zone_id,rr['id']))
+                    self._unindex_record(zone_id,rr['id'])
+            if delete_calls and not self.module.check_mode:
+                for api_call, (content, info) in zip(delete_calls, self._cf_requests(delete_calls,'DELETE')):
+                    self._cf_parse_response(api_call,'DELETE',content,info)
+
+        return self.get_indexed_records(),self.changed
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
@@ -586,10 +788,13 @@ def main():
             value             = dict(required=False, default=None, aliases=['content'], type='str'),
             weight            = dict(required=False, default=1, type='int'),
             zone              = dict(required=True, default=None, aliases=['domain'], type='str'),
+            records           = dict(required=False, default=None, type='list'),
+            purge             = dict(required=False, default=False, type='bool'),
+            max_workers       = dict(required=False, default=4, type='int'),
         ),
         supports_check_mode = True,
         required_if = ([
-                ('state','present',['record','type']),
+                ('state','present',['record']),
                 ('type','MX',['priority','value']),
                 ('type','SRV',['port','priority','proto','service','value','weight']),
                 ('type','A',['value']),
@@ -612,6 +817,13 @@ def main():
     if cf_api.is_solo and cf_api.state == 'absent':
         module.fail_json(msg="solo=true can only be used with state=present")
 
+    if module.params['records'] is not None:
+        records,changed = cf_api.reconcile_dns_records(module.params['records'],module.params['purge'])
+        module.exit_json(changed=changed,result={'records': records})
+
+    if cf_api.state == 'present' and not cf_api.type:
+        module.fail_json(msg="state is present but the following are missing: type")
+
     # perform add, delete or update (only the TTL can be updated) of one or
     # more records
     if cf_api.state == 'present':
@@ -42,7 +42,7 @@ options:
     
   record_name:
     description:
-      - Record name to get/create/delete/update. If record_name is not specified; all records for the domain will be returned in "result" regardless of the state argument.
+      - Record name to get/create/delete/update. If record_name is not specified; all records for the domain will be returned in "result" regardless of the state argument (unless C(records) is given).
     required: false
     default: null
     
@@ -82,6 +82,32 @@ options:
     choices: ['yes', 'no']
     version_added: 1.5.1
 
+  records:
+    description:
+      - List of records to manage in one run, each a dict with C(name), C(type), C(value) and optionally
+        C(ttl) (defaults to I(record_ttl)) and C(state) (defaults to I(state)).
+      - The zone is downloaded once and all creates, updates and deletes are sent in one bulk call each.
+      - Mutually exclusive with I(record_name).
+    required: false
+    default: null
+    version_added: "2.2"
+
+  cache_dir:
+    description:
+      - Directory to keep a snapshot of the domain list and zone records in, so that runs within
+        I(cache_ttl) seconds of each other do not download the zone again. The snapshot of a zone
+        is dropped whenever this module changes it. Disabled when not set.
+    required: false
+    default: null
+    version_added: "2.2"
+
+  cache_ttl:
+    description:
+      - Number of seconds a snapshot in I(cache_dir) is used for.
+    required: false
+    default: 300
+    version_added: "2.2"
+
 notes:
   - The DNS Made Easy service requires that machines interacting with the API have the proper time and timezone set. Be sure you are within a few seconds of actual time by using NTP. 
   - This module returns record(s) in the "result" element when 'state' is set to 'present'. This value can be be registered and used in your playbooks.
@@ -107,12 +133,28 @@ EXAMPLES = '''
   
 # delete a record / ensure it is absent
 - dnsmadeeasy: account_key=key account_secret=secret domain=my.com state=absent record_name="test"
+
+# manage many records of a zone in one run, reusing the zone snapshot for 5 minutes
+- dnsmadeeasy:
+    account_key: key
+    account_secret: secret
+    domain: my.com
+    state: present
+    cache_dir: /tmp/dnsmadeeasy
+    records:
+      - { name: web01, type: A, value: 10.0.0.11 }
+      - { name: web02, type: A, value: 10.0.0.12 }
+      - { name: "", type: MX, value: "10 mail.my.com." }
+      - { name: old, type: A, value: 10.0.0.99, state: absent }
 '''
 
 # ============================================
 # DNSMadeEasy module specific support methods.
 #
 
+import os
+import tempfile
+import time
 import urllib
 
 IMPORT_ERROR = None
@@ -124,9 +166,12 @@ try:
 except ImportError, e:
     IMPORT_ERROR = str(e)
 
+RECORD_TYPES = ['A', 'AAAA', 'CNAME', 'HTTPRED', 'MX', 'NS', 'PTR', 'SRV', 'TXT']
+
+
 class DME2:
 
-    def __init__(self, apikey, secret, domain, module):
+    def __init__(self, apikey, secret, domain, module, cache_dir=None, cache_ttl=300):
         self.module = module
 
         self.api = apikey
@@ -137,6 +182,9 @@ class DME2:
         self.record_map = None      # ["record_name"] => ID
         self.records = None         # ["record_ID"] => <record>
         self.all_records = None
+        self.record_index = None    # [(name, type)] and [(name, type, value)] => [<record>, ...]
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
 
         # Lookup the domain ID if passed as a domain name vs. ID
         if not self.domain.isdigit():
@@ -186,7 +234,54 @@ class DME2:
         return self.getDomain(self.domain_map.get(domain_name, 0))
 
     def getDomains(self):
-        return self.query('dns/managed', 'GET')['data']
+        return self._cached('domains', lambda: self.query('dns/managed', 'GET')['data'])
+
+    def _cachePath(self, name):
+        key = hashlib.sha1('%s|%s' % (self.api, name)).hexdigest()
+        return os.path.join(os.path.expanduser(self.cache_dir), key + '.json')
+
+    # Return the snapshot stored under name if it is younger than cache_ttl,
+    # otherwise call fetch and store its result.
+    def _cached(self, name, fetch):
+        if not self.cache_dir:
+            return fetch()
+
+        path = self._cachePath(name)
+        try:
+            if time.time() - os.path.getmtime(path) < self.cache_ttl:
+                f = open(path)
+                try:
+                    return json.load(f)
+                finally:
+                    f.close()
+        except (IOError, OSError, ValueError):
+            pass
+
+        data = fetch()
+        try:
+            cache_dir = os.path.dirname(path)
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir, 0700)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+            f = os.fdopen(fd, 'w')
+            try:
+                json.dump(data, f)
+            finally:
+                f.close()
+            os.rename(tmp_path, path)
+        except (IOError, OSError):
+            pass
+        return data
+
+    # Drop the zone snapshot and the in-process index after a change
+    def invalidateRecords(self):
+        self.all_records = None
+        self.record_index = None
+        if self.cache_dir:
+            try:
+                os.unlink(self._cachePath('records/' + str(self.domain)))
+            except OSError:
+                pass
 
     def getRecord(self, record_id):
         if not self.record_map:
@@ -201,30 +296,40 @@ class DME2:
     # there can be several records with different types for a single name.
     def getMatchingRecord(self, record_name, record_type, record_value):
         # Get all the records if not already cached
-        if not self.all_records:
-            self.all_records = self.getRecords()
+        if self.record_index is None:
+            self._indexRecords()
 
         if record_type in ["A", "AAAA", "CNAME", "HTTPRED", "PTR"]:
-            for result in self.all_records:
-                if result['name'] == record_name and result['type'] == record_type:
-                    return result
-            return False
+            matches = self.record_index.get((record_name, record_type))
         elif record_type in ["MX", "NS", "TXT", "SRV"]:
-            for result in self.all_records:
-                if record_type == "MX":
-                    value = record_value.split(" ")[1]
-                elif record_type == "SRV":
-                    value = record_value.split(" ")[3]
-                else:
-                    value = record_value
-                if result['name'] == record_name and result['type'] == record_type and result['value'] == value:
-                    return result
-            return False
+            if record_type == "MX":
+                value = record_value.split(" ")[1]
+            elif record_type == "SRV":
+                value = record_value.split(" ")[3]
+            else:
+                value = record_value
+            matches = self.record_index.get((record_name, record_type, value))
         else:
             raise Exception('record_type not yet supported')
 
+        if matches:
+            return matches[0]
+        return False
+
+    # Index all records by (name, type) and (name, type, value), keeping
+    # the order they were returned in.
+    def _indexRecords(self):
+        if not self.all_records:
+            self.all_records = self.getRecords()
+
+        self.record_index = {}
+        for result in self.all_records:
+            self.record_index.setdefault((result['name'], result['type']), []).append(result)
+            self.record_index.setdefault((result['name'], result['type'], result['value']), []).append(result)
+
     def getRecords(self):
-        return self.query(self.record_url, 'GET')['data']
+        return self._cached('records/' + str(self.domain),
+                            lambda: self.query(self.record_url, 'GET')['data'])
 
     def _instMap(self, type):
         #@TODO cache this call so it's executed only once per ansible execution
@@ -256,6 +361,97 @@ class DME2:
         #@TODO remove record from the cache when impleneted
         return self.query(self.record_url + '/' + str(record_id), 'DELETE')
 
+    def createRecords(self, records):
+        result = self.query(self.record_url + '/createMulti', 'POST', self.prepareRecord(records))
+        self.invalidateRecords()
+        return result
+
+    def updateRecords(self, records):
+        result = self.query(self.record_url + '/updateMulti', 'PUT', self.prepareRecord(records))
+        self.invalidateRecords()
+        return result
+
+    def deleteRecords(self, record_ids):
+        ids = urllib.urlencode([('ids', record_id) for record_id in record_ids])
+        result = self.query(self.record_url + '?' + ids, 'DELETE')
+        self.invalidateRecords()
+        return result
+
+
+def build_record(record_name, record_type, record_value, record_ttl):
+    new_record = {'name': record_name}
+    for key, value in (('value', record_value), ('type', record_type), ('ttl', record_ttl)):
+        if not value is None:
+            new_record[key] = value
+    # Special handling for mx record
+    if new_record.get("type") == "MX":
+        new_record["mxLevel"] = new_record["value"].split(" ")[0]
+        new_record["value"] = new_record["value"].split(" ")[1]
+
+    # Special handling for SRV records
+    if new_record.get("type") == "SRV":
+        new_record["priority"] = new_record["value"].split(" ")[0]
+        new_record["weight"] = new_record["value"].split(" ")[1]
+        new_record["port"] = new_record["value"].split(" ")[2]
+        new_record["value"] = new_record["value"].split(" ")[3]
+
+    return new_record
+
+
+def record_changed(current_record, new_record):
+    for i in new_record:
+        if str(current_record[i]) != str(new_record[i]):
+            return True
+    return False
+
+
+# Diff the desired records against the zone and apply all changes with
+# one createMulti, one updateMulti and one multi-id DELETE.
+def apply_records(DME, module):
+    to_create = []
+    to_update = []
+    to_delete = []
+    results = []
+
+    for entry in module.params['records']:
+        if not isinstance(entry, dict) or entry.get('name') is None or not entry.get('type') or entry.get('value') is None:
+            module.fail_json(msg="Each entry in records needs a name, type and value: %s" % entry)
+        if entry['type'] not in RECORD_TYPES:
+            module.fail_json(msg="Unsupported record type '%s' in records" % entry['type'])
+        state = entry.get('state', module.params['state'])
+        if state not in ('present', 'absent'):
+            module.fail_json(msg="'%s' is an unknown value for the state of a record" % state)
+
+        current_record = DME.getMatchingRecord(entry['name'], entry['type'], str(entry['value']))
+        new_record = build_record(entry['name'], entry['type'], str(entry['value']),
+                                  int(entry.get('ttl', module.params['record_ttl'])))
+        result = dict(name=entry['name'], type=entry['type'], value=entry['value'], state=state, changed=False)
+        results.append(result)
+
+        if state == 'absent':
+            if current_record and current_record['id'] not in to_delete:
+                to_delete.append(current_record['id'])
+                result['changed'] = True
+        elif not current_record:
+            to_create.append(new_record)
+            result['changed'] = True
+        elif record_changed(current_record, new_record):
+            new_record['id'] = current_record['id']
+            to_update.append(new_record)
+            result['changed'] = True
+
+    changed = bool(to_create or to_update or to_delete)
+    if changed:
+        if to_delete:
+            DME.deleteRecords(to_delete)
+        if to_update:
+            DME.updateRecords(to_update)
+        if to_create:
+            DME.createRecords(to_create)
+
+    module.exit_json(changed=changed, records=results,
+                     created=len(to_create), updated=len(to_update), deleted=len(to_delete))
+
 
 # ===========================================
 # Module execution.
@@ -270,27 +466,34 @@ def main():
             domain=dict(required=True),
             state=dict(required=True, choices=['present', 'absent']),
             record_name=dict(required=False),
-            record_type=dict(required=False, choices=[
-                             'A', 'AAAA', 'CNAME', 'HTTPRED', 'MX', 'NS', 'PTR', 'SRV', 'TXT']),
+            record_type=dict(required=False, choices=RECORD_TYPES),
             record_value=dict(required=False),
             record_ttl=dict(required=False, default=1800, type='int'),
             validate_certs = dict(default='yes', type='bool'),
+            records=dict(required=False, type='list'),
+            cache_dir=dict(required=False),
+            cache_ttl=dict(required=False, default=300, type='int'),
         ),
         required_together=(
             ['record_value', 'record_ttl', 'record_type']
-        )
+        ),
+        mutually_exclusive=[['record_name', 'records']]
     )
 
     if IMPORT_ERROR:
         module.fail_json(msg="Import Error: " + IMPORT_ERROR)
 
     DME = DME2(module.params["account_key"], module.params[
-               "account_secret"], module.params["domain"], module)
+               "account_secret"], module.params["domain"], module,
+               module.params["cache_dir"], module.params["cache_ttl"])
     state = module.params["state"]
     record_name = module.params["record_name"]
     record_type = module.params["record_type"]
     record_value = module.params["record_value"]
 
+    if module.params["records"] is not None:
+        apply_records(DME, module)
+
     # Follow Keyword Controlled Behavior
     if record_name is None:
         domain_records = DME.getRecords()
@@ -301,28 +504,12 @@ def main():
 
     # Fetch existing record + Build new one
     current_record = DME.getMatchingRecord(record_name, record_type, record_value)
-    new_record = {'name': record_name}
-    for i in ["record_value", "record_type", "record_ttl"]:
-        if not module.params[i] is None:
-            new_record[i[len("record_"):]] = module.params[i]
-    # Special handling for mx record
-    if new_record["type"] == "MX":
-        new_record["mxLevel"] = new_record["value"].split(" ")[0]
-        new_record["value"] = new_record["value"].split(" ")[1]
-
-    # Special handling for SRV records
-    if new_record["type"] == "SRV":
-        new_record["priority"] = new_record["value"].split(" ")[0]
-        new_record["weight"] = new_record["value"].split(" ")[1]
-        new_record["port"] = new_record["value"].split(" ")[2]
-        new_record["value"] = new_record["value"].split(" ")[3]
+    new_record = build_record(record_name, record_type, record_value, module.params["record_ttl"])
 
     # Compare new record against existing one
     changed = False
     if current_record:
-        for i in new_record:
-            if str(current_record[i]) != str(new_record[i]):
-                changed = True
+        changed = record_changed(current_record, new_record)
         new_record['id'] = str(current_record['id'])
 
     # Follow Keyword Controlled Behavior
@@ -337,12 +524,14 @@ def main():
         # create record as it does not exist
         if not current_record:
             record = DME.createRecord(DME.prepareRecord(new_record))
+            DME.invalidateRecords()
             module.exit_json(changed=True, result=record)
 
         # update the record
         if changed:
             DME.updateRecord(
                 current_record['id'], DME.prepareRecord(new_record))
+            DME.invalidateRecords()
             module.exit_json(changed=True, result=new_record)
 
         # return the record (no changes)
@@ -352,6 +541,7 @@ def main():
         # delete the record if it exists
         if current_record:
             DME.deleteRecord(current_record['id'])
+            DME.invalidateRecords()
             module.exit_json(changed=True)
 
         # record does not exist, return w/o change.
@@ -91,6 +91,55 @@ options:
         default: null
         choices: []
         aliases: []
+    max_workers:
+        description:
+            - Maximum number of iControl calls issued concurrently over the
+              shared session. Object lists of all included categories are
+              fetched first, then the per-field calls of every category are
+              spread over the workers. Wall clock seconds spent on each
+              category are returned in the C(collection_time) fact.
+            - Each worker uses its own iControl client, bound to the same
+              session when C(session) is enabled.
+        required: false
+        default: 1
+        version_added: "2.2"
+    fields:
+        description:
+            - Dict mapping a fact category to the list of attributes to
+              collect for it, e.g. C({pool: [lb_method, member]}). Only the
+              iControl getters for those attributes are called. Categories
+              not listed collect every attribute. Not applicable for
+              certificate, key and software fact categories.
+        required: false
+        default: null
+        version_added: "2.2"
+    cache_dir:
+        description:
+            - Directory on the control machine used to cache collected facts.
+              Each category is cached per server, user, active folder, filter
+              and field selection; a repeat run within C(cache_ttl) seconds
+              returns the cached categories without querying the device for
+              them. Caching is disabled when not set.
+            - Client SSL profile facts are not cached when their passphrase
+              fields are collected.
+        required: false
+        default: null
+        version_added: "2.2"
+    cache_ttl:
+        description:
+            - Number of seconds a cached fact category remains valid.
+        required: false
+        default: 300
+        version_added: "2.2"
+    chunk_size:
+        description:
+            - Maximum number of objects passed to a single iControl call when
+              collecting per-object attributes. Large object lists are split
+              into batches of this size, keeping each SOAP response small.
+              C(0) sends the whole list in one call.
+        required: false
+        default: 0
+        version_added: "2.2"
 '''
 
 EXAMPLES = '''
@@ -110,6 +159,36 @@ EXAMPLES = '''
       password=mysecret
       include=interface,vlan
 
+  - name: Collect BIG-IP pool and virtual server facts concurrently
+    local_action: >
+      bigip_facts
+      server=lb.mydomain.com
+      user=admin
+      password=mysecret
+      session=true
+      max_workers=8
+      include=pool,virtual_server
+
+  - name: Collect only pool load balancing methods and members
+    local_action:
+      module: bigip_facts
+      server: lb.mydomain.com
+      user: admin
+      password: mysecret
+      include: pool
+      fields:
+        pool: [lb_method, member]
+
+  - name: Collect virtual server facts, reusing results for ten minutes
+    local_action: >
+      bigip_facts
+      server=lb.mydomain.com
+      user=admin
+      password=mysecret
+      include=virtual_server
+      cache_dir=~/.ansible/bigip_facts
+      cache_ttl=600
+
 '''
 
 try:
@@ -120,7 +199,28 @@ except ImportError:
 else:
     bigsuds_found = True
 
+try:
+    import json
+except ImportError:
+    try:
+        import simplejson as json
+    except ImportError:
+        # Let snippet from module_utils/basic.py return a proper error in this case
+        pass
+
+try:
+    from hashlib import sha1
+except ImportError:
+    from sha import sha as sha1
+
+import copy
 import fnmatch
+import os
+import Queue
+import sys
+import tempfile
+import threading
+import time
 import traceback
 import re
 
@@ -134,19 +234,49 @@ class F5(object):
     F5 BIG-IP iControl API class.
 
     Attributes:
-        api: iControl API instance.
+        api: iControl API instance of the main thread.
+        host: BIG-IP host the API is bound to.
+        user: User name the API authenticates as.
+        active_folder: Last known active folder of the session.
+        session_id: iControl session identifier, or None when no session
+            was started.
+        cache_dir: Directory holding cached fact categories, or None to
+            disable caching.
+        cache_ttl: Seconds a cached fact category stays valid.
     """
 
-    def __init__(self, host, user, password, session=False, validate_certs=True):
+    def __init__(self, host, user, password, session=False, validate_certs=True,
+                 cache_dir=None, cache_ttl=300):
         self.api = bigip_api(host, user, password, validate_certs)
+        self.host = host
+        self.user = user
+        self.password = password
+        self.validate_certs = validate_certs
+        self.session_id = None
+        self.active_folder = None
+        self._local = threading.local()
+        self._local.api = self.api
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
         if session:
             self.start_session()
 
     def start_session(self):
-        self.api = self.api.with_session_id()
+        self.session_id = self.api.System.Session.get_session_identifier()
+        self.api = self.api.with_session_id(self.session_id)
+        self._local.api = self.api
 
     def get_api(self):
-        return self.api
+        # suds clients are not thread safe, so every thread talks to the
+        # device through its own client bound to the same session
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = bigip_api(self.host, self.user, self.password,
+                            self.validate_certs)
+            if self.session_id is not None:
+                api = api.with_session_id(self.session_id)
+            self._local.api = api
+        return api
 
     def set_recursive_query_state(self, state):
         self.api.System.Session.set_recursive_query_state(state)
@@ -162,9 +292,44 @@ class F5(object):
 
     def set_active_folder(self, folder):
         self.api.System.Session.set_active_folder(folder=folder)
+        self.active_folder = folder
 
     def get_active_folder(self):
-        return self.api.System.Session.get_active_folder()
+        self.active_folder = self.api.System.Session.get_active_folder()
+        return self.active_folder
+
+    def _cache_path(self, category, variant):
+        key = json.dumps([self.host, self.user, self.active_folder, category,
+                          variant], sort_keys=True)
+        return os.path.join(self.cache_dir, sha1(key).hexdigest() + '.json')
+
+    def get_cached_facts(self, category, variant=None):
+        if not self.cache_dir:
+            return None
+        try:
+            f = open(self._cache_path(category, variant))
+            try:
+                entry = json.load(f)
+            finally:
+                f.close()
+        except (IOError, ValueError):
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.cache_ttl:
+            return None
+        return entry.get('facts')
+
+    def set_cached_facts(self, category, facts, variant=None):
+        if not self.cache_dir:
+            return
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir, 0700)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        f = os.fdopen(fd, 'w')
+        try:
+            json.dump({'timestamp': time.time(), 'facts': facts}, f)
+        finally:
+            f.close()
+        os.rename(tmp_path, self._cache_path(category, variant))
 
 
 class Interfaces(object):
@@ -187,6 +352,9 @@ class Interfaces(object):
     def get_list(self):
         return self.interfaces
 
+    def set_list(self, names):
+        self.interfaces = names
+
     def get_active_media(self):
         return self.api.Networking.Interfaces.get_active_media(self.interfaces)
 
@@ -292,6 +460,9 @@ class SelfIPs(object):
     def get_list(self):
         return self.self_ips
 
+    def set_list(self, names):
+        self.self_ips = names
+
     def get_address(self):
         return self.api.Networking.SelfIPV2.get_address(self.self_ips)
 
@@ -346,6 +517,9 @@ class Trunks(object):
     def get_list(self):
         return self.trunks
 
+    def set_list(self, names):
+        self.trunks = names
+
     def get_active_lacp_state(self):
         return self.api.Networking.Trunk.get_active_lacp_state(self.trunks)
 
@@ -406,6 +580,9 @@ class Vlans(object):
     def get_list(self):
         return self.vlans
 
+    def set_list(self, names):
+        self.vlans = names
+
     def get_auto_lasthop(self):
         return self.api.Networking.VLAN.get_auto_lasthop(self.vlans)
 
@@ -500,6 +677,9 @@ class VirtualServers(object):
     def get_list(self):
         return self.virtual_servers
 
+    def set_list(self, names):
+        self.virtual_servers = names
+
     def get_actual_hardware_acceleration(self):
         return self.api.LocalLB.VirtualServer.get_actual_hardware_acceleration(self.virtual_servers)
 
@@ -650,6 +830,9 @@ class Pools(object):
     def get_list(self):
         return self.pool_names
 
+    def set_list(self, names):
+        self.pool_names = names
+
     def get_action_on_service_down(self):
         return self.api.LocalLB.Pool.get_action_on_service_down(self.pool_names)
 
@@ -755,6 +938,9 @@ class Devices(object):
     def get_list(self):
         return self.devices
 
+    def set_list(self, names):
+        self.devices = names
+
     def get_active_modules(self):
         return self.api.Management.Device.get_active_modules(self.devices)
 
@@ -860,6 +1046,9 @@ class DeviceGroups(object):
     def get_list(self):
         return self.device_groups
 
+    def set_list(self, names):
+        self.device_groups = names
+
     def get_all_preferred_active(self):
         return self.api.Management.DeviceGroup.get_all_preferred_active(self.device_groups)
 
@@ -908,6 +1097,9 @@ class TrafficGroups(object):
     def get_list(self):
         return self.traffic_groups
 
+    def set_list(self, names):
+        self.traffic_groups = names
+
     def get_auto_failback_enabled_state(self):
         return self.api.Management.TrafficGroup.get_auto_failback_enabled_state(self.traffic_groups)
 
@@ -951,11 +1143,14 @@ class Rules(object):
         self.rules = api.LocalLB.Rule.get_list()
         if regex:
             re_filter = re.compile(regex)
-            self.traffic_groups = filter(re_filter.search, self.rules)
+            self.rules = filter(re_filter.search, self.rules)
 
     def get_list(self):
         return self.rules
 
+    def set_list(self, names):
+        self.rules = names
+
     def get_description(self):
         return self.api.LocalLB.Rule.get_description(rule_names=self.rules)
 
@@ -988,6 +1183,9 @@ class Nodes(object):
     def get_list(self):
         return self.nodes
 
+    def set_list(self, names):
+        self.nodes = names
+
     def get_address(self):
         return self.api.LocalLB.NodeAddressV2.get_address(nodes=self.nodes)
 
@@ -1042,6 +1240,9 @@ class VirtualAddresses(object):
     def get_list(self):
         return self.virtual_addresses
 
+    def set_list(self, names):
+        self.virtual_addresses = names
+
     def get_address(self):
         return self.api.LocalLB.VirtualAddressV2.get_address(self.virtual_addresses)
 
@@ -1099,6 +1300,9 @@ class AddressClasses(object):
     def get_list(self):
         return self.address_classes
 
+    def set_list(self, names):
+        self.address_classes = names
+
     def get_address_class(self):
         key = self.api.LocalLB.Class.get_address_class(self.address_classes)
         value = self.api.LocalLB.Class.get_address_class_member_data_value(key)
@@ -1183,6 +1387,9 @@ class ProfileClientSSL(object):
     def get_list(self):
         return self.profiles
 
+    def set_list(self, names):
+        self.profiles = names
+
     def get_alert_timeout(self):
         return self.api.LocalLB.ProfileClientSSL.get_alert_timeout(self.profiles)
 
@@ -1365,101 +1572,151 @@ class SystemInfo(object):
         return self.api.System.SystemInfo.get_uptime()
 
 
-def generate_dict(api_obj, fields):
+def fetch_field(api_obj, field):
+    try:
+        api_response = getattr(api_obj, "get_" + field)()
+    except (MethodNotFound, WebFault):
+        return False, None
+    return True, api_response
+
+def run_concurrently(tasks, max_workers=1):
+    """Run callables on a bounded pool of worker threads.
+
+    Results are returned in task order. The first exception raised by a
+    task is re-raised in the calling thread once all workers are done.
+    """
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [task() for task in tasks]
+    results = [None] * len(tasks)
+    errors = []
+    pending = Queue.Queue()
+    for item in enumerate(tasks):
+        pending.put(item)
+
+    def worker():
+        while not errors:
+            try:
+                index, task = pending.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results[index] = task()
+            except Exception:
+                errors.append(sys.exc_info())
+
+    threads = [threading.Thread(target=worker)
+               for i in range(min(max_workers, len(tasks)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        exc_type, exc_value, exc_tb = errors[0]
+        raise exc_type, exc_value, exc_tb
+    return results
+
+def split_list(api_obj, chunk_size):
+    """Split a list category into copies covering at most chunk_size names."""
+    names = api_obj.get_list()
+    if not chunk_size or len(names) <= chunk_size:
+        return [api_obj]
+    chunks = []
+    for i in range(0, len(names), chunk_size):
+        chunk = copy.copy(api_obj)
+        chunk.set_list(names[i:i + chunk_size])
+        chunks.append(chunk)
+    return chunks
+
+def merge_responses(responses):
+    if len(responses) == 1:
+        return responses[0]
+    merged = []
+    for supported, api_response in responses:
+        if not supported:
+            return False, None
+        merged.extend(api_response)
+    return True, merged
+
+def assemble_dict(names, fields, responses):
     result_dict = {}
     lists = []
     supported_fields = []
-    if api_obj.get_list():
-        for field in fields:
-            try:
-                api_response = getattr(api_obj, "get_" + field)()
-            except (MethodNotFound, WebFault):
-                pass
-            else:
-                lists.append(api_response)
-                supported_fields.append(field)
-        for i, j in enumerate(api_obj.get_list()):
-            temp = {}
-            temp.update([(item[0], item[1][i]) for item in zip(supported_fields, lists)])
-            result_dict[j] = temp
+    for field, (supported, api_response) in zip(fields, responses):
+        if supported:
+            lists.append(api_response)
+            supported_fields.append(field)
+    for i, j in enumerate(names):
+        temp = {}
+        temp.update([(item[0], item[1][i]) for item in zip(supported_fields, lists)])
+        result_dict[j] = temp
     return result_dict
 
-def generate_simple_dict(api_obj, fields):
+def assemble_simple_dict(fields, responses):
     result_dict = {}
-    for field in fields:
-        try:
-            api_response = getattr(api_obj, "get_" + field)()
-        except (MethodNotFound, WebFault):
-            pass
-        else:
+    for field, (supported, api_response) in zip(fields, responses):
+        if supported:
             result_dict[field] = api_response
     return result_dict
 
-def generate_interface_dict(f5, regex):
-    interfaces = Interfaces(f5.get_api(), regex)
-    fields = ['active_media', 'actual_flow_control', 'bundle_state',
-              'description', 'dual_media_state', 'enabled_state', 'if_index',
-              'learning_mode', 'lldp_admin_status', 'lldp_tlvmap',
-              'mac_address', 'media', 'media_option', 'media_option_sfp',
-              'media_sfp', 'media_speed', 'media_status', 'mtu',
-              'phy_master_slave_mode', 'prefer_sfp_state', 'flow_control',
-              'sflow_poll_interval', 'sflow_poll_interval_global',
-              'sfp_media_state', 'stp_active_edge_port_state',
-              'stp_enabled_state', 'stp_link_type',
-              'stp_protocol_detection_reset_state']
-    return generate_dict(interfaces, fields)
-
-def generate_self_ip_dict(f5, regex):
-    self_ips = SelfIPs(f5.get_api(), regex)
-    fields = ['address', 'allow_access_list', 'description',
-              'enforced_firewall_policy', 'floating_state', 'fw_rule',
-              'netmask', 'staged_firewall_policy', 'traffic_group',
-              'vlan', 'is_traffic_group_inherited']
-    return generate_dict(self_ips, fields)
-
-def generate_trunk_dict(f5, regex):
-    trunks = Trunks(f5.get_api(), regex)
-    fields = ['active_lacp_state', 'configured_member_count', 'description',
-              'distribution_hash_option', 'interface', 'lacp_enabled_state',
-              'lacp_timeout_option', 'link_selection_policy', 'media_speed',
-              'media_status', 'operational_member_count', 'stp_enabled_state',
-              'stp_protocol_detection_reset_state']
-    return generate_dict(trunks, fields)
-
-def generate_vlan_dict(f5, regex):
-    vlans = Vlans(f5.get_api(), regex)
-    fields = ['auto_lasthop', 'cmp_hash_algorithm', 'description',
+# Categories whose facts are built with one iControl call per field across
+# the whole (filtered) object list, keyed by object name.
+LIST_CATEGORIES = {
+    'interface': (Interfaces,
+                  ['active_media', 'actual_flow_control', 'bundle_state',
+                   'description', 'dual_media_state', 'enabled_state',
+                   'if_index', 'learning_mode', 'lldp_admin_status',
+                   'lldp_tlvmap', 'mac_address', 'media', 'media_option',
+                   'media_option_sfp', 'media_sfp', 'media_speed',
+                   'media_status', 'mtu', 'phy_master_slave_mode',
+                   'prefer_sfp_state', 'flow_control',
+                   'sflow_poll_interval', 'sflow_poll_interval_global',
+                   'sfp_media_state', 'stp_active_edge_port_state',
+                   'stp_enabled_state', 'stp_link_type',
+                   'stp_protocol_detection_reset_state']),
+    'self_ip': (SelfIPs,
+                ['address', 'allow_access_list', 'description',
+                 'enforced_firewall_policy', 'floating_state', 'fw_rule',
+                 'netmask', 'staged_firewall_policy', 'traffic_group',
+                 'vlan', 'is_traffic_group_inherited']),
+    'trunk': (Trunks,
+              ['active_lacp_state', 'configured_member_count', 'description',
+               'distribution_hash_option', 'interface', 'lacp_enabled_state',
+               'lacp_timeout_option', 'link_selection_policy', 'media_speed',
+               'media_status', 'operational_member_count',
+               'stp_enabled_state', 'stp_protocol_detection_reset_state']),
+    'vlan': (Vlans,
+             ['auto_lasthop', 'cmp_hash_algorithm', 'description',
               'dynamic_forwarding', 'failsafe_action', 'failsafe_state',
               'failsafe_timeout', 'if_index', 'learning_mode',
               'mac_masquerade_address', 'member', 'mtu',
               'sflow_poll_interval', 'sflow_poll_interval_global',
               'sflow_sampling_rate', 'sflow_sampling_rate_global',
-              'source_check_state', 'true_mac_address', 'vlan_id']
-    return generate_dict(vlans, fields)
-
-def generate_vs_dict(f5, regex):
-    virtual_servers = VirtualServers(f5.get_api(), regex)
-    fields = ['actual_hardware_acceleration', 'authentication_profile',
-              'auto_lasthop', 'bw_controller_policy', 'clone_pool',
-              'cmp_enable_mode', 'connection_limit', 'connection_mirror_state',
-              'default_pool_name', 'description', 'destination',
-              'enabled_state', 'enforced_firewall_policy',
-              'fallback_persistence_profile', 'fw_rule', 'gtm_score',
-              'last_hop_pool', 'nat64_state', 'object_status',
-              'persistence_profile', 'profile', 'protocol',
-              'rate_class', 'rate_limit', 'rate_limit_destination_mask',
-              'rate_limit_mode', 'rate_limit_source_mask', 'related_rule',
-              'rule', 'security_log_profile', 'snat_pool', 'snat_type',
-              'source_address', 'source_address_translation_lsn_pool',
-              'source_address_translation_snat_pool',
-              'source_address_translation_type', 'source_port_behavior',
-              'staged_firewall_policy', 'translate_address_state',
-              'translate_port_state', 'type', 'vlan', 'wildmask']
-    return generate_dict(virtual_servers, fields)
-
-def generate_pool_dict(f5, regex):
-    pools = Pools(f5.get_api(), regex)
-    fields = ['action_on_service_down', 'active_member_count',
+              'source_check_state', 'true_mac_address', 'vlan_id']),
+    'virtual_server': (VirtualServers,
+                       ['actual_hardware_acceleration',
+                        'authentication_profile', 'auto_lasthop',
+                        'bw_controller_policy', 'clone_pool',
+                        'cmp_enable_mode', 'connection_limit',
+                        'connection_mirror_state', 'default_pool_name',
+                        'description', 'destination', 'enabled_state',
+                        'enforced_firewall_policy',
+                        'fallback_persistence_profile', 'fw_rule',
+                        'gtm_score', 'last_hop_pool', 'nat64_state',
+                        'object_status', 'persistence_profile', 'profile',
+                        'protocol', 'rate_class', 'rate_limit',
+                        'rate_limit_destination_mask', 'rate_limit_mode',
+                        'rate_limit_source_mask', 'related_rule', 'rule',
+                        'security_log_profile', 'snat_pool', 'snat_type',
+                        'source_address',
+                        'source_address_translation_lsn_pool',
+                        'source_address_translation_snat_pool',
+                        'source_address_translation_type',
+                        'source_port_behavior', 'staged_firewall_policy',
+                        'translate_address_state', 'translate_port_state',
+                        'type', 'vlan', 'wildmask']),
+    'pool': (Pools,
+             ['action_on_service_down', 'active_member_count',
               'aggregate_dynamic_ratio', 'allow_nat_state',
               'allow_snat_state', 'client_ip_tos', 'client_link_qos',
               'description', 'gateway_failsafe_device',
@@ -1470,62 +1727,87 @@ def generate_pool_dict(f5, regex):
               'profile', 'queue_depth_limit',
               'queue_on_connection_limit_state', 'queue_time_limit',
               'reselect_tries', 'server_ip_tos', 'server_link_qos',
-              'simple_timeout', 'slow_ramp_time']
-    return generate_dict(pools, fields)
-
-def generate_device_dict(f5, regex):
-    devices = Devices(f5.get_api(), regex)
-    fields = ['active_modules', 'base_mac_address', 'blade_addresses',
-              'build', 'chassis_id', 'chassis_type', 'comment',
-              'configsync_address', 'contact', 'description', 'edition',
-              'failover_state', 'hostname', 'inactive_modules', 'location',
-              'management_address', 'marketing_name', 'multicast_address',
-              'optional_modules', 'platform_id', 'primary_mirror_address',
-              'product', 'secondary_mirror_address', 'software_version',
-              'timelimited_modules', 'timezone', 'unicast_addresses']
-    return generate_dict(devices, fields)
-
-def generate_device_group_dict(f5, regex):
-    device_groups = DeviceGroups(f5.get_api(), regex)
-    fields = ['all_preferred_active', 'autosync_enabled_state','description',
-              'device', 'full_load_on_sync_state',
-              'incremental_config_sync_size_maximum',
-              'network_failover_enabled_state', 'sync_status', 'type']
-    return generate_dict(device_groups, fields)
-
-def generate_traffic_group_dict(f5, regex):
-    traffic_groups = TrafficGroups(f5.get_api(), regex)
-    fields = ['auto_failback_enabled_state', 'auto_failback_time',
-              'default_device', 'description', 'ha_load_factor',
-              'ha_order', 'is_floating', 'mac_masquerade_address',
-              'unit_id']
-    return generate_dict(traffic_groups, fields)
-
-def generate_rule_dict(f5, regex):
-    rules = Rules(f5.get_api(), regex)
-    fields = ['definition', 'description', 'ignore_vertification',
-              'verification_status']
-    return generate_dict(rules, fields)
-
-def generate_node_dict(f5, regex):
-    nodes = Nodes(f5.get_api(), regex)
-    fields = ['address', 'connection_limit', 'description', 'dynamic_ratio',
+              'simple_timeout', 'slow_ramp_time']),
+    'device': (Devices,
+               ['active_modules', 'base_mac_address', 'blade_addresses',
+                'build', 'chassis_id', 'chassis_type', 'comment',
+                'configsync_address', 'contact', 'description', 'edition',
+                'failover_state', 'hostname', 'inactive_modules',
+                'location', 'management_address', 'marketing_name',
+                'multicast_address', 'optional_modules', 'platform_id',
+                'primary_mirror_address', 'product',
+                'secondary_mirror_address', 'software_version',
+                'timelimited_modules', 'timezone', 'unicast_addresses']),
+    'device_group': (DeviceGroups,
+                     ['all_preferred_active', 'autosync_enabled_state',
+                      'description', 'device', 'full_load_on_sync_state',
+                      'incremental_config_sync_size_maximum',
+                      'network_failover_enabled_state', 'sync_status',
+                      'type']),
+    'traffic_group': (TrafficGroups,
+                      ['auto_failback_enabled_state', 'auto_failback_time',
+                       'default_device', 'description', 'ha_load_factor',
+                       'ha_order', 'is_floating', 'mac_masquerade_address',
+                       'unit_id']),
+    'rule': (Rules,
+             ['definition', 'description', 'ignore_vertification',
+              'verification_status']),
+    'node': (Nodes,
+             ['address', 'connection_limit', 'description', 'dynamic_ratio',
               'monitor_instance', 'monitor_rule', 'monitor_status',
-              'object_status', 'rate_limit', 'ratio', 'session_status']
-    return generate_dict(nodes, fields)
-
-def generate_virtual_address_dict(f5, regex):
-    virtual_addresses = VirtualAddresses(f5.get_api(), regex)
-    fields = ['address', 'arp_state', 'auto_delete_state', 'connection_limit',
-              'description', 'enabled_state', 'icmp_echo_state',
-              'is_floating_state', 'netmask', 'object_status',
-              'route_advertisement_state', 'traffic_group']
-    return generate_dict(virtual_addresses, fields)
-
-def generate_address_class_dict(f5, regex):
-    address_classes = AddressClasses(f5.get_api(), regex)
-    fields = ['address_class', 'description']
-    return generate_dict(address_classes, fields)
+              'object_status', 'rate_limit', 'ratio', 'session_status']),
+    'virtual_address': (VirtualAddresses,
+                        ['address', 'arp_state', 'auto_delete_state',
+                         'connection_limit', 'description', 'enabled_state',
+                         'icmp_echo_state', 'is_floating_state', 'netmask',
+                         'object_status', 'route_advertisement_state',
+                         'traffic_group']),
+    'address_class': (AddressClasses,
+                      ['address_class', 'description']),
+    'client_ssl_profile': (ProfileClientSSL,
+                           ['alert_timeout', 'allow_nonssl_state',
+                            'authenticate_depth', 'authenticate_once_state',
+                            'ca_file', 'cache_size', 'cache_timeout',
+                            'certificate_file', 'chain_file', 'cipher_list',
+                            'client_certificate_ca_file', 'crl_file',
+                            'default_profile', 'description',
+                            'forward_proxy_ca_certificate_file',
+                            'forward_proxy_ca_key_file',
+                            'forward_proxy_ca_passphrase',
+                            'forward_proxy_certificate_extension_include',
+                            'forward_proxy_certificate_lifespan',
+                            'forward_proxy_enabled_state',
+                            'forward_proxy_lookup_by_ipaddr_port_state',
+                            'handshake_timeout', 'key_file',
+                            'modssl_emulation_state', 'passphrase',
+                            'peer_certification_mode', 'profile_mode',
+                            'renegotiation_maximum_record_delay',
+                            'renegotiation_period', 'renegotiation_state',
+                            'renegotiation_throughput',
+                            'retain_certificate_state',
+                            'secure_renegotiation_mode', 'server_name',
+                            'session_ticket_state', 'sni_default_state',
+                            'sni_require_state', 'ssl_option',
+                            'strict_resume_state', 'unclean_shutdown_state',
+                            'is_base_profile', 'is_system_profile']),
+}
+
+# Fields holding secrets; categories collecting any of them are never
+# written to the fact cache.
+SECRET_FIELDS = {
+    'client_ssl_profile': ['forward_proxy_ca_passphrase', 'passphrase'],
+}
+
+# Categories whose facts are a flat dict of device-wide values.
+SIMPLE_CATEGORIES = {
+    'system_info': (SystemInfo,
+                    ['base_mac_address', 'blade_temperature',
+                     'chassis_slot_information',
+                     'globally_unique_identifier', 'group_id',
+                     'hardware_information', 'marketing_name',
+                     'product_information', 'pva_version', 'system_id',
+                     'system_information', 'time', 'time_zone', 'uptime']),
+}
 
 def generate_certificate_dict(f5, regex):
     certificates = Certificates(f5.get_api(), regex)
@@ -1535,46 +1817,174 @@ def generate_key_dict(f5, regex):
     keys = Keys(f5.get_api(), regex)
     return dict(zip(keys.get_list(), keys.get_key_list()))
 
-def generate_client_ssl_profile_dict(f5, regex):
-    profiles = ProfileClientSSL(f5.get_api(), regex)
-    fields = ['alert_timeout', 'allow_nonssl_state', 'authenticate_depth',
-              'authenticate_once_state', 'ca_file', 'cache_size',
-              'cache_timeout', 'certificate_file', 'chain_file',
-              'cipher_list', 'client_certificate_ca_file', 'crl_file',
-              'default_profile', 'description',
-              'forward_proxy_ca_certificate_file', 'forward_proxy_ca_key_file',
-              'forward_proxy_ca_passphrase',
-              'forward_proxy_certificate_extension_include',
-              'forward_proxy_certificate_lifespan',
-              'forward_proxy_enabled_state',
-              'forward_proxy_lookup_by_ipaddr_port_state', 'handshake_timeout',
-              'key_file', 'modssl_emulation_state', 'passphrase',
-              'peer_certification_mode', 'profile_mode',
-              'renegotiation_maximum_record_delay', 'renegotiation_period',
-              'renegotiation_state', 'renegotiation_throughput',
-              'retain_certificate_state', 'secure_renegotiation_mode',
-              'server_name', 'session_ticket_state', 'sni_default_state',
-              'sni_require_state', 'ssl_option', 'strict_resume_state',
-              'unclean_shutdown_state', 'is_base_profile', 'is_system_profile']
-    return generate_dict(profiles, fields)
-
-def generate_system_info_dict(f5):
-    system_info = SystemInfo(f5.get_api())
-    fields = ['base_mac_address',
-              'blade_temperature', 'chassis_slot_information',
-              'globally_unique_identifier', 'group_id',
-              'hardware_information',
-              'marketing_name',
-              'product_information', 'pva_version', 'system_id',
-              'system_information', 'time',
-              'time_zone', 'uptime']
-    return generate_simple_dict(system_info, fields)
-
-def generate_software_list(f5):
+def generate_software_list(f5, regex=None):
     software = Software(f5.get_api())
     software_list = software.get_all_software_status()
     return software_list
 
+# Categories collected with a single call and no per-field fan out.
+SINGLE_CALL_CATEGORIES = {
+    'certificate': generate_certificate_dict,
+    'key': generate_key_dict,
+    'software': generate_software_list,
+}
+
+
+class FactCollector(object):
+    """Fact collection engine.
+
+    Collects several fact categories over a single F5 session. Work is
+    done in two stages: first every category's object list is fetched,
+    then every (category, field) getter is issued. Each stage is spread
+    over a bounded pool of worker threads so categories and fields are
+    fetched concurrently.
+
+    Attributes:
+        f5: F5 instance shared by all workers; each worker thread talks
+            to the device through its own client from f5.get_api().
+        max_workers: Maximum number of concurrent iControl calls.
+        fields: Optional dict mapping a category to the subset of its
+            fields to fetch; categories not listed fetch every field.
+        chunk_size: Maximum number of object names passed to a single
+            per-field call, or 0 to pass the whole list at once.
+        timing: Wall clock seconds spent collecting each category.
+    """
+
+    def __init__(self, f5, max_workers=1, fields=None, chunk_size=0):
+        self.f5 = f5
+        self.max_workers = max_workers
+        self.fields = fields or {}
+        self.chunk_size = chunk_size
+        self.timing = {}
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def _start(self, category):
+        self._lock.acquire()
+        try:
+            if category not in self._started:
+                self._started[category] = time.time()
+        finally:
+            self._lock.release()
+
+    def _finish(self, category):
+        self._lock.acquire()
+        try:
+            elapsed = time.time() - self._started[category]
+            self.timing[category] = max(self.timing.get(category, 0), elapsed)
+        finally:
+            self._lock.release()
+
+    def get_fields(self, category, available):
+        selected = self.fields.get(category)
+        if not selected:
+            return available
+        return [field for field in available if field in selected]
+
+    def _staged(self, category, func, *args):
+        def task():
+            self._start(category)
+            result = func(*args)
+            self._finish(category)
+            return result
+        return task
+
+    def _timed(self, category, func, *args):
+        def task():
+            result = func(*args)
+            self._finish(category)
+            return result
+        return task
+
+    def _build(self, cls, *args):
+        return cls(self.f5.get_api(), *args)
+
+    def _fetch(self, api_obj, field):
+        # rebind the object to the client of the calling worker thread
+        api_obj = copy.copy(api_obj)
+        api_obj.api = self.f5.get_api()
+        return fetch_field(api_obj, field)
+
+    def _variant(self, category, regex):
+        return [regex, self.fields.get(category)]
+
+    def _cacheable(self, category):
+        secrets = SECRET_FIELDS.get(category, [])
+        fields = self.get_fields(category, secrets)
+        return not fields
+
+    def collect(self, include, regex=None):
+        facts = {}
+        for category in include:
+            if not self._cacheable(category):
+                continue
+            cached = self.f5.get_cached_facts(category, self._variant(category, regex))
+            if cached is not None:
+                facts[category] = cached
+        include = [c for c in include if c not in facts]
+        list_categories = [c for c in include if c in LIST_CATEGORIES]
+        simple_categories = [c for c in include if c in SIMPLE_CATEGORIES]
+        single_categories = [c for c in include if c in SINGLE_CALL_CATEGORIES]
+
+        # stage one: object lists and single call categories
+        tasks = []
+        for category in list_categories:
+            tasks.append(self._staged(category, self._build,
+                                      LIST_CATEGORIES[category][0], regex))
+        for category in simple_categories:
+            tasks.append(self._staged(category, self._build,
+                                      SIMPLE_CATEGORIES[category][0]))
+        for category in single_categories:
+            tasks.append(self._staged(category, SINGLE_CALL_CATEGORIES[category], self.f5, regex))
+        results = run_concurrently(tasks, self.max_workers)
+
+        objects = dict(zip(list_categories + simple_categories,
+                           results[:len(list_categories) + len(simple_categories)]))
+        for category, result in zip(single_categories,
+                                    results[len(list_categories) + len(simple_categories):]):
+            facts[category] = result
+
+        # stage two: per-field getters of every category, pipelined; large
+        # object lists are split so no single response grows unbounded
+        wanted = []
+        for category in list_categories + simple_categories:
+            if category in LIST_CATEGORIES:
+                fields = self.get_fields(category, LIST_CATEGORIES[category][1])
+                if not objects[category].get_list():
+                    facts[category] = {}
+                    continue
+                chunks = split_list(objects[category], self.chunk_size)
+            else:
+                fields = self.get_fields(category, SIMPLE_CATEGORIES[category][1])
+                chunks = [objects[category]]
+            wanted.append((category, fields, chunks))
+
+        tasks = []
+        for category, fields, chunks in wanted:
+            for field in fields:
+                for chunk in chunks:
+                    tasks.append(self._timed(category, self._fetch, chunk, field))
+        results = run_concurrently(tasks, self.max_workers)
+
+        offset = 0
+        for category, fields, chunks in wanted:
+            responses = []
+            for field in fields:
+                responses.append(merge_responses(results[offset:offset + len(chunks)]))
+                offset += len(chunks)
+            if category in LIST_CATEGORIES:
+                facts[category] = assemble_dict(objects[category].get_list(),
+                                                fields, responses)
+            else:
+                facts[category] = assemble_simple_dict(fields, responses)
+
+        for category in include:
+            if not self._cacheable(category):
+                continue
+            self.f5.set_cached_facts(category, facts[category],
+                                     self._variant(category, regex))
+        return facts
+
 
 def main():
     module = AnsibleModule(
@@ -1586,6 +1996,11 @@ def main():
             session = dict(type='bool', default=False),
             include = dict(type='list', required=True),
             filter = dict(type='str', required=False),
+            max_workers = dict(type='int', default=1),
+            fields = dict(type='dict', required=False),
+            cache_dir = dict(type='str', required=False),
+            cache_ttl = dict(type='int', default=300),
+            chunk_size = dict(type='int', default=0),
         )
     )
 
@@ -1598,12 +2013,25 @@ def main():
     validate_certs = module.params['validate_certs']
     session = module.params['session']
     fact_filter = module.params['filter']
+    max_workers = module.params['max_workers']
+    field_selection = module.params['fields'] or {}
+    cache_dir = module.params['cache_dir']
+    cache_ttl = module.params['cache_ttl']
+    chunk_size = module.params['chunk_size']
+    if cache_dir:
+        cache_dir = os.path.expanduser(cache_dir)
 
     if validate_certs:
         import ssl
         if not hasattr(ssl, 'SSLContext'):
             module.fail_json(msg='bigsuds does not support verifying certificates with python < 2.7.9.  Either update python or set validate_certs=False on the task')
 
+    if max_workers < 1:
+        module.fail_json(msg="max_workers must be at least 1, got: %s" % max_workers)
+
+    if chunk_size < 0:
+        module.fail_json(msg="chunk_size must not be negative, got: %s" % chunk_size)
+
     if fact_filter:
         regex = fnmatch.translate(fact_filter)
     else:
@@ -1618,11 +2046,29 @@ def main():
     if not all(include_test):
         module.fail_json(msg="value of include must be one or more of: %s, got: %s" % (",".join(valid_includes), ",".join(include)))
 
+    fields = {}
+    for category, selected in field_selection.items():
+        category = category.lower()
+        if category in LIST_CATEGORIES:
+            available = LIST_CATEGORIES[category][1]
+        elif category in SIMPLE_CATEGORIES:
+            available = SIMPLE_CATEGORIES[category][1]
+        else:
+            module.fail_json(msg="fields may only be selected for: %s, got: %s" % (",".join(sorted(LIST_CATEGORIES.keys() + SIMPLE_CATEGORIES.keys())), category))
+        if isinstance(selected, basestring):
+            selected = selected.split(',')
+        selected = [x.strip().lower() for x in selected]
+        unknown = [x for x in selected if x not in available]
+        if unknown:
+            module.fail_json(msg="unknown %s fields: %s; valid fields are: %s" % (category, ",".join(unknown), ",".join(available)))
+        fields[category] = selected
+
     try:
         facts = {}
 
         if len(include) > 0:
-            f5 = F5(server, user, password, session, validate_certs)
+            f5 = F5(server, user, password, session, validate_certs,
+                    cache_dir, cache_ttl)
             saved_active_folder = f5.get_active_folder()
             saved_recursive_query_state = f5.get_recursive_query_state()
             if saved_active_folder != "/":
@@ -1630,42 +2076,9 @@ def main():
             if saved_recursive_query_state != "STATE_ENABLED":
                 f5.enable_recursive_query_state()
 
-            if 'interface' in include:
-                facts['interface'] = generate_interface_dict(f5, regex)
-            if 'self_ip' in include:
-                facts['self_ip'] = generate_self_ip_dict(f5, regex)
-            if 'trunk' in include:
-                facts['trunk'] = generate_trunk_dict(f5, regex)
-            if 'vlan' in include:
-                facts['vlan'] = generate_vlan_dict(f5, regex)
-            if 'virtual_server' in include:
-                facts['virtual_server'] = generate_vs_dict(f5, regex)
-            if 'pool' in include:
-                facts['pool'] = generate_pool_dict(f5, regex)
-            if 'device' in include:
-                facts['device'] = generate_device_dict(f5, regex)
-            if 'device_group' in include:
-                facts['device_group'] = generate_device_group_dict(f5, regex)
-            if 'traffic_group' in include:
-                facts['traffic_group'] = generate_traffic_group_dict(f5, regex)
-            if 'rule' in include:
-                facts['rule'] = generate_rule_dict(f5, regex)
-            if 'node' in include:
-                facts['node'] = generate_node_dict(f5, regex)
-            if 'virtual_address' in include:
-                facts['virtual_address'] = generate_virtual_address_dict(f5, regex)
-            if 'address_class' in include:
-                facts['address_class'] = generate_address_class_dict(f5, regex)
-            if 'software' in include:
-                facts['software'] = generate_software_list(f5)
-            if 'certificate' in include:
-                facts['certificate'] = generate_certificate_dict(f5, regex)
-            if 'key' in include:
-                facts['key'] = generate_key_dict(f5, regex)
-            if 'client_ssl_profile' in include:
-                facts['client_ssl_profile'] = generate_client_ssl_profile_dict(f5, regex)
-            if 'system_info' in include:
-                facts['system_info'] = generate_system_info_dict(f5)
+            collector = FactCollector(f5, max_workers, fields, chunk_size)
+            facts = collector.collect(include, regex)
+            facts['collection_time'] = dict((k, round(v, 3)) for k, v in collector.timing.items())
 
             # restore saved state
             if saved_active_folder and saved_active_folder != "/":
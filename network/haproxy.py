@@ -39,9 +39,23 @@ options:
     default: auto-detected
   host:
     description:
-      - Name of the backend host to change.
-    required: true
+      - Name of the backend host to change. Either C(host) or C(servers) is
+        required.
+    required: false
     default: null
+  servers:
+    description:
+      - List of backend servers to change in one pass, given as
+        C(backend/host) strings or dicts with keys C(host) and optionally
+        C(backend) and C(weight). Servers without a backend are changed in
+        every backend they are a member of. All commands are sent over a
+        single socket connection in interactive mode, and with C(wait) the
+        status of all servers is checked with one C(show stat) per interval.
+        C(state), C(weight), C(shutdown_sessions) and the C(wait) options
+        apply to every server unless overridden per server.
+    required: false
+    default: null
+    version_added: "2.2"
   shutdown_sessions:
     description:
       - When disabling a server, immediately terminate all the sessions attached
@@ -57,9 +71,14 @@ options:
   state:
     description:
       - Desired state of the provided backend host.
+      - C(stats) changes nothing and returns the parsed C(show stat) table as
+        the C(haproxy_stats) fact, a dict of backends holding a dict of
+        servers per backend, limited to C(backend), C(host) or C(servers) if
+        given. Numeric columns are returned as integers and empty columns as
+        null. C(stats) was added in 2.1.
     required: true
     default: null
-    choices: [ "enabled", "disabled" ]
+    choices: [ "enabled", "disabled", "stats" ]
   wait:
     description:
       - Wait until the server reports a status of 'UP' when `state=enabled`, or
@@ -117,6 +136,20 @@ EXAMPLES = '''
 # enable server in 'www' backend pool with change server(s) weight
 - haproxy: state=enabled host={{ inventory_hostname }} socket=/var/run/haproxy.sock weight=10 backend=www
 
+# read the status of every server in the 'www' backend pool
+- haproxy: state=stats backend=www
+- debug: msg="{{ haproxy_stats.www.web01.status }}"
+
+# disable many servers at once and wait until all of them are in maintenance
+- haproxy:
+    state: disabled
+    wait: yes
+    servers:
+      - www/web01
+      - www/web02
+      - { backend: api, host: app01 }
+      - { host: app02 }
+
 author: "Ravi Bhure (@ravibhure)"
 '''
 
@@ -127,7 +160,10 @@ import time
 
 DEFAULT_SOCKET_LOCATION="/var/run/haproxy.sock"
 RECV_SIZE = 1024
+# Terminates every response once the socket is in interactive mode
+PROMPT = '\n> '
 ACTION_CHOICES = ['enabled', 'disabled']
+STATE_CHOICES = ACTION_CHOICES + ['stats']
 WAIT_RETRIES=25
 WAIT_INTERVAL=5
 
@@ -135,6 +171,40 @@ WAIT_INTERVAL=5
 class TimeoutException(Exception):
   pass
 
+def stat_value(value):
+    if value == '':
+        return None
+    if value.isdigit():
+        return int(value)
+    return value
+
+def split_server(server):
+    """
+    Splits a 'backend/host' string into (backend, host); backend is '' if
+    the string has no backend part.
+    """
+    index = server.rfind('/')
+    return server[:max(index, 0)], server[index + 1:]
+
+def parse_stats(lines):
+    """
+    Builds the 'show stat' table keyed by (pxname, svname) from an iterable
+    of CSV lines. Integer columns are converted and empty columns are None.
+    """
+    stats = {}
+    header = None
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        if header is None:
+            header = [row[0].lstrip('# ')] + row[1:]
+            continue
+        entry = dict((name, stat_value(value)) for name, value in zip(header, row) if name)
+        entry['pxname'] = row[0]
+        entry['svname'] = row[1]
+        stats[(row[0], row[1])] = entry
+    return stats
+
 class HAProxy(object):
     """
     Used for communicating with HAProxy through its local UNIX socket interface.
@@ -166,6 +236,100 @@ class HAProxy(object):
         self.previous_states  = []
         self.current_states   = []
         self.current_weights  = []
+        self.client = None
+
+    def open_session(self):
+        """
+        Opens a connection that stays open for several commands by switching
+        the socket to interactive 'prompt' mode.
+        """
+        self.client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.client.connect(self.socket)
+        self.client.sendall('prompt\n')
+        self.read_responses(1)
+
+    def close_session(self):
+        if self.client:
+            try:
+                self.client.sendall('quit\n')
+            except socket.error:
+                pass
+            self.client.close()
+            self.client = None
+
+    def read_responses(self, count):
+        """
+        Reads responses from an interactive session until 'count' of them,
+        each terminated by the prompt, have been received.
+        """
+        responses = []
+        chunks = []
+        tail = ''
+        while len(responses) < count:
+            buf = self.client.recv(RECV_SIZE)
+            if not buf:
+                break
+            chunks.append(buf)
+            if PROMPT in tail + buf:
+                parts = ''.join(chunks).split(PROMPT)
+                responses.extend(parts[:-1])
+                chunks = [parts[-1]]
+            tail = chunks[-1][-len(PROMPT):]
+        return responses
+
+    def execute_many(self, cmds):
+        """
+        Pipelines several commands over the interactive session and returns
+        their responses in order.
+        """
+        if not cmds:
+            return []
+        self.client.sendall(''.join('%s\n' % cmd for cmd in cmds))
+        return [response.strip() for response in self.read_responses(len(cmds))]
+
+    def read_lines(self, client, interactive=False):
+        """
+        Yields the lines of a response as they are received, up to the end of
+        the connection or, on an interactive session, up to the prompt.
+        """
+        pending = ''
+        while True:
+            buf = client.recv(RECV_SIZE)
+            if not buf:
+                if pending:
+                    yield pending
+                return
+            lines = (pending + buf).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line
+            if interactive and pending == PROMPT.lstrip('\n'):
+                return
+
+    def show_stat(self):
+        """
+        Returns the parsed 'show stat' table keyed by (pxname, svname), read
+        line by line from the socket.
+        """
+        if self.client:
+            self.client.sendall('show stat\n')
+            return parse_stats(self.read_lines(self.client, interactive=True))
+
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(self.socket)
+        try:
+            client.sendall('show stat\n')
+            return parse_stats(self.read_lines(client))
+        finally:
+            client.close()
+
+    def get_backends(self, svname, stats=None):
+        """
+        Returns the names of all backends the server is a member of.
+        """
+        if stats is None:
+            stats = self.show_stat()
+        return sorted([px for (px, sv) in stats if sv == svname])
 
     def execute(self, cmd, timeout=200, capture_output=True):
         """
@@ -173,18 +337,18 @@ class HAProxy(object):
         UNIX socket and waiting up to 'timeout' milliseconds for the response.
         """
 
-        self.client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.client.connect(self.socket)
-        self.client.sendall('%s\n' % cmd)
-        result = ''
-        buf = ''
-        buf = self.client.recv(RECV_SIZE)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(self.socket)
+        client.sendall('%s\n' % cmd)
+        chunks = []
+        buf = client.recv(RECV_SIZE)
         while buf:
-            result += buf
-            buf = self.client.recv(RECV_SIZE)
+            chunks.append(buf)
+            buf = client.recv(RECV_SIZE)
+        result = ''.join(chunks)
         if capture_output:
             self.command_results = result.strip()
-        self.client.close()
+        client.close()
         return result
 
     def wait_until_status(self, pxname, svname, status):
@@ -195,47 +359,29 @@ class HAProxy(object):
         not found, the module will fail.
         """
         for i in range(1, self.wait_retries):
-            data = self.execute('show stat', 200, False).lstrip('# ')
-            r = csv.DictReader(data.splitlines())
-            found = False
-            for row in r:
-                if row['pxname'] == pxname and row['svname'] == svname:
-                    found = True
-                    if row['status'] == status:
-                        return True;
-                    else:
-                        time.sleep(self.wait_interval)
-
-            if not found:
+            row = self.show_stat().get((pxname, svname))
+            if row is None:
                 self.module.fail_json(msg="unable to find server %s/%s" % (pxname, svname))
+            if row['status'] == status:
+                return True
+            time.sleep(self.wait_interval)
 
         self.module.fail_json(msg="server %s/%s not status '%s' after %d retries. Aborting." % (pxname, svname, status, self.wait_retries))
 
     def get_current_state(self, host, backend):
         """
-        Gets the each original state value from show stat. 
-        Runs before and after to determine if values are changed. 
-        This relies on weight always being the next element after 
-        status in "show stat" as well as status states remaining
-        as indicated in status_states and haproxy documentation.
-        """
-   
-        output = self.execute('show stat')
-        output = output.lstrip('# ').strip()
-        output = output.split(',')
-        result = output
-        status_states = [ 'UP','DOWN','DRAIN','NOLB','MAINT' ]
+        Gets the status and weight of the host in the given backend, or in
+        every backend it is a member of, from the parsed "show stat" table.
+        Runs before and after to determine if values are changed.
+        """
+        stats = self.show_stat()
         self.status_server = []
-        status_weight_pos = []
         self.status_weight = []
 
-        for check, status in enumerate(result):
-            if status in status_states:
-                self.status_server.append(status) 
-                status_weight_pos.append(check + 1) 
-
-        for weight in status_weight_pos:
-                self.status_weight.append(result[weight])
+        for (pxname, svname), row in sorted(stats.items()):
+            if svname == host and backend in (None, pxname):
+                self.status_server.append(str(row['status']))
+                self.status_weight.append(str(row['weight']))
 
         return{'self.status_server':self.status_server, 'self.status_weight':self.status_weight}
 
@@ -247,16 +393,7 @@ class HAProxy(object):
         """
         svname = host
         if self.backend is None:
-            output = self.execute('show stat')
-            #sanitize and make a list of lines
-            output = output.lstrip('# ').strip()
-            output = output.split('\n')
-            result = output
-
-            for line in result:
-                if 'BACKEND' in line:
-                    result =  line.split(',')[0]
-                    pxname = result
+            for pxname in self.get_backends(svname):
                     cmd = "get weight %s/%s ; enable server %s/%s" % (pxname, svname, pxname, svname)
                     if weight:
                         cmd += "; set weight %s/%s %s" % (pxname, svname, weight)
@@ -281,16 +418,7 @@ class HAProxy(object):
         """
         svname = host
         if self.backend is None:
-            output = self.execute('show stat')
-            #sanitize and make a list of lines
-            output = output.lstrip('# ').strip()
-            output = output.split('\n')
-            result = output
-
-            for line in result:
-                if 'BACKEND' in line:
-                    result =  line.split(',')[0]
-                    pxname = result
+            for pxname in self.get_backends(svname):
                     cmd = "get weight %s/%s ; disable server %s/%s" % (pxname, svname, pxname, svname)
                     if shutdown_sessions:
                         cmd += "; shutdown sessions server %s/%s" % (pxname, svname)
@@ -307,10 +435,142 @@ class HAProxy(object):
             if self.wait:
                 self.wait_until_status(pxname, svname, 'MAINT')
 
+    def get_server_list(self, stats):
+        """
+        Expands the 'servers' option into (pxname, svname, weight) tuples,
+        resolving servers without a backend against the current stats.
+        """
+        servers = []
+        for server in self.module.params['servers']:
+            if isinstance(server, dict):
+                svname = server.get('host')
+                pxname = server.get('backend')
+                weight = server.get('weight', self.weight)
+            else:
+                pxname, svname = split_server(str(server))
+                weight = self.weight
+            if not svname:
+                self.module.fail_json(msg="host is required for each server, got: %s" % server)
+
+            if pxname:
+                servers.append((pxname, svname, weight))
+            else:
+                backends = self.get_backends(svname, stats)
+                if not backends:
+                    self.module.fail_json(msg="unable to find server %s in any backend" % svname)
+                for px in backends:
+                    servers.append((px, svname, weight))
+        return servers
+
+    def act_many(self):
+        """
+        Changes all servers given in 'servers' over one interactive session.
+        """
+        if self.state not in ACTION_CHOICES:
+            self.module.fail_json(msg="unknown state specified: '%s'" % self.state)
+
+        self.open_session()
+        try:
+            previous = self.show_stat()
+            servers = self.get_server_list(previous)
+
+            cmds = []
+            # one command per line: HAProxy prints a prompt after every
+            # ';'-separated command, which would break the response count
+            for pxname, svname, weight in servers:
+                if self.state == 'enabled':
+                    cmds.append("enable server %s/%s" % (pxname, svname))
+                    if weight:
+                        cmds.append("set weight %s/%s %s" % (pxname, svname, weight))
+                else:
+                    cmds.append("disable server %s/%s" % (pxname, svname))
+                    if self.shutdown_sessions:
+                        cmds.append("shutdown sessions server %s/%s" % (pxname, svname))
+            self.command_results = '\n'.join(self.execute_many(cmds))
+
+            if self.wait:
+                if self.state == 'enabled':
+                    status = 'UP'
+                else:
+                    status = 'MAINT'
+                self.wait_until_status_many([(px, sv) for (px, sv, w) in servers], status)
+
+            current = self.show_stat()
+        finally:
+            self.close_session()
+
+        results = []
+        changed = False
+        for pxname, svname, weight in servers:
+            before = previous.get((pxname, svname), {})
+            after = current.get((pxname, svname), {})
+            server_changed = (before.get('status') != after.get('status')
+                              or before.get('weight') != after.get('weight'))
+            changed = changed or server_changed
+            results.append(dict(backend=pxname, host=svname,
+                                previous_status=before.get('status'), status=after.get('status'),
+                                previous_weight=before.get('weight'), weight=after.get('weight'),
+                                changed=server_changed))
+
+        self.module.exit_json(stdout=self.command_results, changed=changed, servers=results)
+
+    def wait_until_status_many(self, servers, status):
+        """
+        Waits for all (pxname, svname) servers to reach the specified status,
+        polling 'show stat' once per interval for all of them.
+        """
+        pending = set(servers)
+        for i in range(1, self.wait_retries):
+            stats = self.show_stat()
+            for server in list(pending):
+                if server not in stats:
+                    self.module.fail_json(msg="unable to find server %s/%s" % server)
+                if stats[server]['status'] == status:
+                    pending.discard(server)
+            if not pending:
+                return True
+            time.sleep(self.wait_interval)
+
+        self.module.fail_json(msg="servers %s not status '%s' after %d retries. Aborting."
+                              % (', '.join('%s/%s' % s for s in sorted(pending)), status, self.wait_retries))
+
+    def stats_facts(self):
+        """
+        Returns the "show stat" table as haproxy_stats facts, nested by
+        backend and server name and limited to the requested servers.
+        """
+        stats = self.show_stat()
+        wanted = None
+        if self.module.params['servers']:
+            wanted = set()
+            for server in self.module.params['servers']:
+                if isinstance(server, dict):
+                    wanted.add((server.get('backend'), server.get('host')))
+                else:
+                    pxname, svname = split_server(str(server))
+                    wanted.add((pxname or None, svname))
+
+        facts = {}
+        for (pxname, svname), row in stats.items():
+            if self.backend is not None and pxname != self.backend:
+                continue
+            if self.host is not None and svname != self.host:
+                continue
+            if wanted is not None and (pxname, svname) not in wanted and (None, svname) not in wanted:
+                continue
+            facts.setdefault(pxname, {})[svname] = row
+
+        self.module.exit_json(changed=False, ansible_facts=dict(haproxy_stats=facts))
+
     def act(self):
         """
         Figure out what you want to do from ansible, and then do it.
         """
+        if self.state == 'stats':
+            self.stats_facts()
+
+        if self.module.params['servers']:
+            self.act_many()
 
         self.get_current_state(self.host, self.backend)
         self.previous_states = ','.join(self.status_server)
@@ -343,8 +603,9 @@ def main():
     # load ansible module object
     module = AnsibleModule(
         argument_spec = dict(
-            state = dict(required=True, default=None, choices=ACTION_CHOICES),
-            host=dict(required=True, default=None),
+            state = dict(required=True, default=None, choices=STATE_CHOICES),
+            host=dict(required=False, default=None),
+            servers=dict(required=False, default=None, type='list'),
             backend=dict(required=False, default=None),
             weight=dict(required=False, default=None),
             socket = dict(required=False, default=DEFAULT_SOCKET_LOCATION),
@@ -353,9 +614,12 @@ def main():
             wait_retries=dict(required=False, default=WAIT_RETRIES, type='int'),
             wait_interval=dict(required=False, default=WAIT_INTERVAL, type='int'),
         ),
-
+        mutually_exclusive=[['host', 'servers']],
     )
 
+    if module.params['state'] != 'stats' and not (module.params['host'] or module.params['servers']):
+        module.fail_json(msg="one of the following is required: host,servers")
+
     if not socket:
         module.fail_json(msg="unable to locate haproxy socket")
 
@@ -89,6 +89,8 @@ EXAMPLES = '''
 import os
 import re
 
+APK_DB = '/lib/apk/db/installed'
+
 def update_package_db(module):
     cmd = "%s update" % (APK_PATH)
     rc, stdout, stderr = module.run_command(cmd, check_rc=False)
@@ -97,22 +99,53 @@ def update_package_db(module):
     else:
         module.fail_json(msg="could not update package db")
 
-def query_package(module, name):
-    cmd = "%s -v info --installed %s" % (APK_PATH, name)
+def read_installed(module):
+    """Index the installed packages as name -> version, straight from the apk database.
+    Falls back to a single 'apk info -v' listing if the database cannot be read."""
+    installed = {}
+    if os.path.exists(APK_DB):
+        name = version = None
+        for line in open(APK_DB):
+            line = line.strip()
+            if not line:
+                if name:
+                    installed[name] = version
+                name = version = None
+            elif line.startswith('P:'):
+                name = line[2:]
+            elif line.startswith('V:'):
+                version = line[2:]
+        if name:
+            installed[name] = version
+        return installed
+
+    cmd = "%s -v info" % (APK_PATH)
     rc, stdout, stderr = module.run_command(cmd, check_rc=False)
-    if rc == 0:
-        return True
-    else:
-        return False
-
-def query_latest(module, name):
-    cmd = "%s version %s" % (APK_PATH, name)
+    if rc != 0:
+        module.fail_json(msg="could not list installed packages", stderr=stderr)
+    for line in stdout.split('\n'):
+        # name-version-rN
+        fields = line.strip().rsplit('-', 2)
+        if len(fields) == 3:
+            installed[fields[0]] = '%s-%s' % (fields[1], fields[2])
+    return installed
+
+def query_latest(module, installed, names):
+    """Return the installed packages among names for which a newer version is available,
+    using a single 'apk version' call"""
+    names = [name for name in names if name in installed]
+    if not names:
+        return []
+    # apk version lists the installed package as name-version
+    packages = dict(('%s-%s' % (name, installed[name]), name) for name in names)
+    cmd = "%s version %s" % (APK_PATH, " ".join(names))
     rc, stdout, stderr = module.run_command(cmd, check_rc=False)
-    search_pattern = "(%s)-[\d\.\w]+-[\d\w]+\s+(.)\s+[\d\.\w]+-[\d\w]+\s+" % (name)
-    match = re.search(search_pattern, stdout)
-    if match and match.group(2) == "<":
-        return False
-    return True
+    outdated = []
+    for line in stdout.split('\n'):
+        fields = line.split()
+        if len(fields) >= 2 and fields[0] in packages and fields[1] == "<":
+            outdated.append(packages[fields[0]])
+    return outdated
 
 def upgrade_packages(module):
     if module.check_mode:
@@ -127,17 +160,15 @@ def upgrade_packages(module):
     module.exit_json(changed=True, msg="upgraded packages")
 
 def install_packages(module, names, state):
-    upgrade = False
-    uninstalled = []
-    for name in names:
-        if not query_package(module, name):
-            uninstalled.append(name)
-        elif state == 'latest' and not query_latest(module, name):
-            upgrade = True
-    if not uninstalled and not upgrade:
+    installed = read_installed(module)
+    uninstalled = [name for name in names if name not in installed]
+    outdated = []
+    if state == 'latest':
+        outdated = query_latest(module, installed, names)
+    if not uninstalled and not outdated:
         module.exit_json(changed=False, msg="package(s) already installed")
-    names = " ".join(uninstalled)
-    if upgrade:
+    names = " ".join(uninstalled + outdated)
+    if outdated:
         if module.check_mode:
             cmd = "%s add --upgrade --simulate %s" % (APK_PATH, names)
         else:
@@ -153,10 +184,8 @@ def install_packages(module, names, state):
     module.exit_json(changed=True, msg="installed %s package(s)" % (names))
 
 def remove_packages(module, names):
-    installed = []
-    for name in names:
-        if query_package(module, name):
-            installed.append(name)
+    packages = read_installed(module)
+    installed = [name for name in names if name in packages]
     if not installed:
         module.exit_json(changed=False, msg="package(s) already removed")
     names = " ".join(installed)
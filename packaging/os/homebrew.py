@@ -95,6 +95,15 @@ EXAMPLES = '''
 import os.path
 import re
 
+try:
+    import json
+except ImportError:
+    try:
+        import simplejson as json
+    except ImportError:
+        # Let snippet from module_utils/basic.py return a proper error in this case
+        pass
+
 
 # exceptions -------------------------------------------------------------- {{{
 class HomebrewException(Exception):
@@ -330,6 +339,7 @@ class Homebrew(object):
                                   state=state, update_homebrew=update_homebrew,
                                   upgrade_all=upgrade_all,
                                   install_options=install_options, )
+        self._index = None
 
         self._prep()
 
@@ -388,38 +398,100 @@ class Homebrew(object):
         return (failed, changed, message)
 
     # checks ------------------------------------------------------- {{{
+    def _package_index(self):
+        '''Installed packages by name, full name and alias.
+
+        Built from one `brew info --json=v1 --installed` and one
+        `brew outdated --json=v1` call. Single package commands update
+        it in place; `brew update` and `brew upgrade` discard it.
+        '''
+        if self._index is not None:
+            return self._index
+
+        rc, out, err = self.module.run_command([
+            self.brew_path,
+            'info',
+            '--json=v1',
+            '--installed',
+        ])
+        try:
+            formulae = json.loads(out)
+        except ValueError:
+            self.failed = True
+            self.message = err.strip() or 'Unable to list installed packages.'
+            raise HomebrewException(self.message)
+
+        # `brew outdated` exits non-zero when something is outdated, so only
+        # its output is looked at; older brews without --json fall back to
+        # the outdated flag of `brew info`
+        rc, out, err = self.module.run_command([
+            self.brew_path,
+            'outdated',
+            '--json=v1',
+        ])
+        try:
+            outdated = set(formula['name'] for formula in json.loads(out))
+        except (ValueError, KeyError, TypeError):
+            outdated = None
+
+        index = dict()
+        for formula in formulae:
+            if not formula.get('installed'):
+                continue
+
+            if outdated is None:
+                is_outdated = bool(formula.get('outdated'))
+            else:
+                is_outdated = (
+                    formula['name'] in outdated
+                    or formula.get('full_name') in outdated
+                )
+            info = {
+                'outdated': is_outdated,
+                'head': any(
+                    keg.get('version', '').startswith('HEAD')
+                    for keg in formula['installed']
+                ),
+            }
+            names = [formula['name'], formula.get('full_name')]
+            names.extend(formula.get('aliases') or [])
+            for name in names:
+                if name:
+                    index[name] = info
+
+        self._index = index
+        return self._index
+
+    def _index_current_package(self, head=False):
+        '''Record the current package as installed and up to date.'''
+        index = self._package_index()
+        info = index.get(self.current_package)
+        if info is None:
+            index[self.current_package] = {'outdated': False, 'head': head}
+        else:
+            info['outdated'] = False
+
+    def _unindex_current_package(self):
+        '''Drop the current package under all its names.'''
+        index = self._package_index()
+        info = index.get(self.current_package)
+        for name in [name for name in index if index[name] is info]:
+            del index[name]
+
     def _current_package_is_installed(self):
         if not self.valid_package(self.current_package):
             self.failed = True
             self.message = 'Invalid package: {0}.'.format(self.current_package)
             raise HomebrewException(self.message)
 
-        cmd = [
-            "{brew_path}".format(brew_path=self.brew_path),
-            "info",
-            self.current_package,
-        ]
-        rc, out, err = self.module.run_command(cmd)
-        for line in out.split('\n'):
-            if (
-                re.search(r'Built from source', line)
-                or re.search(r'Poured from bottle', line)
-            ):
-                return True
-
-        return False
+        return self.current_package in self._package_index()
 
     def _current_package_is_outdated(self):
         if not self.valid_package(self.current_package):
             return False
 
-        rc, out, err = self.module.run_command([
-            self.brew_path,
-            'outdated',
-            self.current_package,
-        ])
-
-        return rc != 0
+        info = self._package_index().get(self.current_package)
+        return info is not None and info['outdated']
 
     def _current_package_is_installed_from_head(self):
         if not Homebrew.valid_package(self.current_package):
@@ -427,18 +499,7 @@ class Homebrew(object):
         elif not self._current_package_is_installed():
             return False
 
-        rc, out, err = self.module.run_command([
-            self.brew_path,
-            'info',
-            self.current_package,
-        ])
-
-        try:
-            version_info = [line for line in out.split('\n') if line][0]
-        except IndexError:
-            return False
-
-        return version_info.split(' ')[-1] == 'HEAD'
+        return self._package_index()[self.current_package]['head']
     # /checks ------------------------------------------------------ }}}
 
     # commands ----------------------------------------------------- {{{
@@ -469,6 +530,7 @@ class Homebrew(object):
             self.brew_path,
             'update',
         ])
+        self._index = None
         if rc == 0:
             if out and isinstance(out, basestring):
                 already_updated = any(
@@ -495,6 +557,7 @@ class Homebrew(object):
             self.brew_path,
             'upgrade',
         ])
+        self._index = None
         if rc == 0:
             if not out:
                 self.message = 'Homebrew packages already upgraded.'
@@ -544,7 +607,8 @@ class Homebrew(object):
         cmd = [opt for opt in opts if opt]
         rc, out, err = self.module.run_command(cmd)
 
-        if self._current_package_is_installed():
+        if rc == 0:
+            self._index_current_package(head=self.state == 'head')
             self.changed_count += 1
             self.changed = True
             self.message = 'Package installed: {0}'.format(self.current_package)
@@ -596,7 +660,8 @@ class Homebrew(object):
         cmd = [opt for opt in opts if opt]
         rc, out, err = self.module.run_command(cmd)
 
-        if self._current_package_is_installed() and not self._current_package_is_outdated():
+        if rc == 0:
+            self._index_current_package()
             self.changed_count += 1
             self.changed = True
             self.message = 'Package upgraded: {0}'.format(self.current_package)
@@ -613,6 +678,7 @@ class Homebrew(object):
         )
         cmd = [opt for opt in opts if opt]
         rc, out, err = self.module.run_command(cmd)
+        self._index = None
 
         if rc == 0:
             self.changed = True
@@ -662,7 +728,8 @@ class Homebrew(object):
         cmd = [opt for opt in opts if opt]
         rc, out, err = self.module.run_command(cmd)
 
-        if not self._current_package_is_installed():
+        if rc == 0:
+            self._unindex_current_package()
             self.changed_count += 1
             self.changed = True
             self.message = 'Package uninstalled: {0}'.format(self.current_package)
@@ -32,7 +32,10 @@ author:
     - "Indrajit Raychaudhuri (@indrajitr)"
     - "'Aaron Bull Schaefer (@elasticdog)' <aaron@elasticdog.com>"
     - "Afterburn"
-notes: []
+notes:
+    - Package states are read directly from the local and sync databases
+      (the C(DBPath) and repositories of C(/etc/pacman.conf)); all
+      requested packages are installed or removed in a single transaction.
 requirements: []
 options:
     name:
@@ -115,39 +118,215 @@ import shlex
 import os
 import re
 import sys
-
-def get_version(pacman_output):
-    """Take pacman -Qi or pacman -Si output and get the Version"""
-    lines = pacman_output.split('\n')
-    for line in lines:
-        if 'Version' in line:
-            return line.split(':')[1].strip()
-    return None
-
-def query_package(module, pacman_path, name, state="present"):
-    """Query the package status in both the local system and the repository. Returns a boolean to indicate if the package is installed, a second boolean to indicate if the package is up-to-date and a third boolean to indicate whether online information were available"""
-    if state == "present":
-        lcmd = "%s -Qi %s" % (pacman_path, name)
-        lrc, lstdout, lstderr = module.run_command(lcmd, check_rc=False)
-        if lrc != 0:
-            # package is not installed locally
-            return False, False, False
-
-        # get the version installed locally (if any)
-        lversion = get_version(lstdout)
-
-        rcmd = "%s -Si %s" % (pacman_path, name)
-        rrc, rstdout, rstderr = module.run_command(rcmd, check_rc=False)
-        # get the version in the repository
-        rversion = get_version(rstdout)
-
-        if rrc == 0:
-            # Return True to indicate that the package is installed locally, and the result of the version number comparison
-            # to determine if the package is up-to-date.
-            return True, (lversion == rversion), False
+import tarfile
+
+PACMAN_CONF = '/etc/pacman.conf'
+PACMAN_DB_PATH = '/var/lib/pacman/'
+
+def read_pacman_conf(path=PACMAN_CONF):
+    """Return the database path and the sync repositories in the order pacman searches them"""
+    db_path = PACMAN_DB_PATH
+    repos = []
+    if not os.path.exists(path):
+        return db_path, repos
+
+    section = None
+    for line in open(path):
+        line = line.split('#', 1)[0].strip()
+        if line.startswith('[') and line.endswith(']'):
+            section = line[1:-1].strip()
+            if section != 'options':
+                repos.append(section)
+        elif section == 'options' and '=' in line:
+            key, value = [x.strip() for x in line.split('=', 1)]
+            if key == 'DBPath':
+                db_path = value
+    return db_path, repos
+
+def parse_desc(text):
+    """Parse a pacman database desc file into a dict of %FIELD% -> list of values"""
+    fields = {}
+    field = None
+    for line in text.split('\n'):
+        line = line.strip()
+        if line.startswith('%') and line.endswith('%'):
+            field = line[1:-1]
+            fields[field] = []
+        elif line and field:
+            fields[field].append(line)
+        else:
+            field = None
+    return fields
+
+def read_local_db(db_path):
+    """Index the packages installed on the system as name -> version"""
+    local = {}
+    local_path = os.path.join(db_path, 'local')
+    for entry in os.listdir(local_path):
+        desc_path = os.path.join(local_path, entry, 'desc')
+        if not os.path.isfile(desc_path):
+            continue
+        desc = parse_desc(open(desc_path).read())
+        if desc.get('NAME') and desc.get('VERSION'):
+            local[desc['NAME'][0]] = desc['VERSION'][0]
+    return local
+
+def read_sync_db(path):
+    """Return the name -> version and group -> names indexes of one sync database tarball"""
+    packages = {}
+    groups = {}
+    db = tarfile.open(path)
+    try:
+        for member in db:
+            if not member.isfile() or not member.name.endswith('/desc'):
+                continue
+            desc = parse_desc(db.extractfile(member).read())
+            if not desc.get('NAME') or not desc.get('VERSION'):
+                continue
+            name = desc['NAME'][0]
+            packages[name] = desc['VERSION'][0]
+            for group in desc.get('GROUPS', []):
+                groups.setdefault(group, []).append(name)
+    finally:
+        db.close()
+    return packages, groups
+
+def read_sync_dbs(module, pacman_path, db_path, repos):
+    """Index the packages available in the repositories as name -> version and group -> names.
+    Repositories listed first win, as they do for pacman. If a database cannot be read
+    (e.g. an unsupported compression) the package index is built from pacman -Sl instead
+    and the group index is None."""
+    sync_path = os.path.join(db_path, 'sync')
+    if not repos:
+        repos = sorted(f[:-3] for f in os.listdir(sync_path) if f.endswith('.db'))
+
+    sync = {}
+    groups = {}
+    try:
+        for repo in reversed(repos):
+            path = os.path.join(sync_path, repo + '.db')
+            if not os.path.exists(path):
+                continue
+            packages, repo_groups = read_sync_db(path)
+            sync.update(packages)
+            for group, names in repo_groups.items():
+                groups.setdefault(group, [])
+                groups[group].extend(n for n in names if n not in groups[group])
+        return sync, groups
+    except (tarfile.TarError, IOError, OSError):
+        pass
+
+    rc, stdout, stderr = module.run_command("%s -Sl" % pacman_path, check_rc=False)
+    if rc != 0:
+        module.fail_json(msg="could not list repository packages", stderr=stderr)
+    sync = {}
+    for line in stdout.split('\n'):
+        fields = line.split()
+        if len(fields) >= 3 and fields[1] not in sync:
+            sync[fields[1]] = fields[2]
+    return sync, None
+
+def rpmvercmp(a, b):
+    """Compare two version strings the way libalpm's rpmvercmp does"""
+    if a == b:
+        return 0
+
+    one = two = 0
+    ptr1 = ptr2 = 0
+    while one < len(a) and two < len(b):
+        while one < len(a) and not a[one].isalnum():
+            one += 1
+        while two < len(b) and not b[two].isalnum():
+            two += 1
+        if one == len(a) or two == len(b):
+            break
+
+        # a different number of separators decides on its own
+        if one - ptr1 != two - ptr2:
+            if one - ptr1 < two - ptr2:
+                return -1
+            return 1
+
+        ptr1, ptr2 = one, two
+        if a[ptr1].isdigit():
+            isnum = True
+            while one < len(a) and a[one].isdigit():
+                one += 1
+            while two < len(b) and b[two].isdigit():
+                two += 1
+        else:
+            isnum = False
+            while one < len(a) and a[one].isalpha():
+                one += 1
+            while two < len(b) and b[two].isalpha():
+                two += 1
+
+        # numeric segments are always newer than alpha segments
+        if two == ptr2:
+            if isnum:
+                return 1
+            return -1
+
+        seg1, seg2 = a[ptr1:one], b[ptr2:two]
+        if isnum:
+            seg1, seg2 = seg1.lstrip('0'), seg2.lstrip('0')
+            if len(seg1) != len(seg2):
+                if len(seg1) > len(seg2):
+                    return 1
+                return -1
+        if seg1 != seg2:
+            if seg1 > seg2:
+                return 1
+            return -1
+        ptr1, ptr2 = one, two
+
+    if one == len(a) and two == len(b):
+        return 0
+
+    # a remaining alpha string never beats an empty one
+    if (one == len(a) and not b[two].isalpha()) or (one < len(a) and a[one].isalpha()):
+        return -1
+    return 1
+
+def split_evr(version):
+    """Split a pacman version into epoch, version and release"""
+    epoch = '0'
+    if ':' in version:
+        epoch, version = version.split(':', 1)
+        epoch = epoch or '0'
+    release = None
+    if '-' in version:
+        version, release = version.rsplit('-', 1)
+    return epoch, version, release
+
+def vercmp(a, b):
+    """Compare two full pacman versions ([epoch:]version[-release]), like vercmp(8)"""
+    if a == b:
+        return 0
+    epoch1, version1, release1 = split_evr(a)
+    epoch2, version2, release2 = split_evr(b)
+    ret = rpmvercmp(epoch1, epoch2)
+    if ret == 0:
+        ret = rpmvercmp(version1, version2)
+        if ret == 0 and release1 and release2:
+            ret = rpmvercmp(release1, release2)
+    return ret
+
+def query_package(local, sync, name):
+    """Query the package status in both the local and the sync database indexes. Returns a boolean to indicate if the package is installed, a second boolean to indicate if the package is up-to-date and a third boolean to indicate whether online information were available"""
+    lversion = local.get(name)
+    if lversion is None:
+        # package is not installed locally
+        return False, False, False
+
+    rversion = sync.get(name)
+    if rversion is not None:
+        # Return True to indicate that the package is installed locally, and the result of the version number comparison
+        # to determine if the package is up-to-date.
+        return True, vercmp(lversion, rversion) >= 0, False
 
     # package is installed but cannot fetch remote Version. Last True stands for the error
-        return True, True, True
+    return True, True, True
 
 
 def update_package_db(module, pacman_path):
@@ -181,7 +360,7 @@ def upgrade(module, pacman_path):
     else:
         module.exit_json(changed=False, msg='Nothing to upgrade')
 
-def remove_packages(module, pacman_path, packages):
+def remove_packages(module, pacman_path, local, packages):
     if module.params["recurse"] or module.params["force"]:
         if module.params["recurse"]:
             args = "Rs"
@@ -192,37 +371,29 @@ def remove_packages(module, pacman_path, packages):
     else:
         args = "R"
 
-    remove_c = 0
-    # Using a for loop incase of error, we can report the package that failed
-    for package in packages:
-        # Query the package first, to see if we even need to remove
-        installed, updated, unknown = query_package(module, pacman_path, package)
-        if not installed:
-            continue
-
-        cmd = "%s -%s %s --noconfirm" % (pacman_path, args, package)
-        rc, stdout, stderr = module.run_command(cmd, check_rc=False)
+    # Query the packages first, to see if we even need to remove
+    to_remove = [package for package in packages if package in local]
+    if not to_remove:
+        module.exit_json(changed=False, msg="package(s) already absent")
 
-        if rc != 0:
-            module.fail_json(msg="failed to remove %s" % (package))
-
-        remove_c += 1
-
-    if remove_c > 0:
+    cmd = "%s -%s %s --noconfirm" % (pacman_path, args, " ".join(to_remove))
+    rc, stdout, stderr = module.run_command(cmd, check_rc=False)
 
-        module.exit_json(changed=True, msg="removed %s package(s)" % remove_c)
+    if rc != 0:
+        module.fail_json(msg="failed to remove %s" % (" ".join(to_remove)), stdout=stdout, stderr=stderr)
 
-    module.exit_json(changed=False, msg="package(s) already absent")
+    module.exit_json(changed=True, msg="removed %s package(s)" % len(to_remove))
 
 
-def install_packages(module, pacman_path, state, packages, package_files):
-    install_c = 0
+def install_packages(module, pacman_path, local, sync, state, packages, package_files):
     package_err = []
     message = ""
+    to_install = []
+    to_install_files = []
 
     for i, package in enumerate(packages):
         # if the package is installed and state == present or state == latest and is up-to-date then skip
-        installed, updated, latestError = query_package(module, pacman_path, package)
+        installed, updated, latestError = query_package(local, sync, package)
         if latestError and state == 'latest':
             package_err.append(package)
 
@@ -230,17 +401,21 @@ def install_packages(module, pacman_path, state, packages, package_files):
             continue
 
         if package_files[i]:
-            params = '-U %s' % package_files[i]
+            to_install_files.append(package_files[i])
         else:
-            params = '-S %s' % package
+            to_install.append(package)
 
-        cmd = "%s %s --noconfirm --needed" % (pacman_path, params)
+    # Install everything in (at most) one transaction per source
+    for params, names in (('-U', to_install_files), ('-S', to_install)):
+        if not names:
+            continue
+        cmd = "%s %s %s --noconfirm --needed" % (pacman_path, params, " ".join(names))
         rc, stdout, stderr = module.run_command(cmd, check_rc=False)
 
         if rc != 0:
-            module.fail_json(msg="failed to install %s" % (package))
+            module.fail_json(msg="failed to install %s" % (" ".join(names)), stdout=stdout, stderr=stderr)
 
-        install_c += 1
+    install_c = len(to_install) + len(to_install_files)
 
     if state == 'latest' and len(package_err) > 0:
         message = "But could not ensure 'latest' state for %s package(s) as remote version could not be fetched." % (package_err)
@@ -250,10 +425,10 @@ def install_packages(module, pacman_path, state, packages, package_files):
 
     module.exit_json(changed=False, msg="package(s) already installed. %s" % (message))
 
-def check_packages(module, pacman_path, packages, state):
+def check_packages(module, local, sync, packages, state):
     would_be_changed = []
     for package in packages:
-        installed, updated, unknown = query_package(module, pacman_path, package)
+        installed, updated, unknown = query_package(local, sync, package)
         if ((state in ["present", "latest"] and not installed) or
                 (state == "absent" and installed) or
                 (state == "latest" and not updated)):
@@ -267,10 +442,15 @@ def check_packages(module, pacman_path, packages, state):
         module.exit_json(changed=False, msg="package(s) already %s" % state)
 
 
-def expand_package_groups(module, pacman_path, pkgs):
+def expand_package_groups(module, pacman_path, groups, pkgs):
     expanded = []
 
     for pkg in pkgs:
+        if groups is not None:
+            # A group was found matching the name, so expand it
+            expanded.extend(groups.get(pkg, [pkg]))
+            continue
+
         cmd = "%s -Sgq %s" % (pacman_path, pkg)
         rc, stdout, stderr = module.run_command(cmd, check_rc=False)
 
@@ -321,7 +501,11 @@ def main():
         upgrade(module, pacman_path)
 
     if p['name']:
-        pkgs = expand_package_groups(module, pacman_path, p['name'])
+        db_path, repos = read_pacman_conf()
+        local = read_local_db(db_path)
+        sync, groups = read_sync_dbs(module, pacman_path, db_path, repos)
+
+        pkgs = expand_package_groups(module, pacman_path, groups, p['name'])
 
         pkg_files = []
         for i, pkg in enumerate(pkgs):
@@ -334,12 +518,12 @@ def main():
                 pkg_files.append(None)
 
         if module.check_mode:
-            check_packages(module, pacman_path, pkgs, p['state'])
+            check_packages(module, local, sync, pkgs, p['state'])
 
         if p['state'] in ['present', 'latest']:
-            install_packages(module, pacman_path, p['state'], pkgs, pkg_files)
+            install_packages(module, pacman_path, local, sync, p['state'], pkgs, pkg_files)
         elif p['state'] == 'absent':
-            remove_packages(module, pacman_path, pkgs)
+            remove_packages(module, pacman_path, local, pkgs)
 
 # import module snippets
 from ansible.module_utils.basic import *
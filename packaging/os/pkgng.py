@@ -96,20 +96,51 @@ import shlex
 import os
 import re
 import sys
+import fnmatch
 
-def query_package(module, pkgng_path, name, dir_arg):
+def query_installed(module, pkgng_path, dir_arg):
+    """Snapshot the installed packages with a single pkg query, as name -> origin and version"""
 
-    rc, out, err = module.run_command("%s %s info -g -e %s" % (pkgng_path, dir_arg, name))
+    rc, out, err = module.run_command("%s %s query '%%n %%o %%v'" % (pkgng_path, dir_arg))
+    if rc != 0 and err:
+        module.fail_json(msg="could not query installed packages: %s" % out, stderr=err)
 
-    if rc == 0:
-        return True
+    installed = {}
+    for line in out.splitlines():
+        fields = line.split()
+        if len(fields) == 3:
+            installed[fields[0]] = {'origin': fields[1], 'version': fields[2]}
+    return installed
 
-    return False
+def query_annotations(module, pkgng_path, dir_arg):
+    """Snapshot the annotations of all installed packages with a single pkg query, as name -> tag -> value"""
+
+    rc, out, err = module.run_command("%s %s query '%%n %%At %%Av'" % (pkgng_path, dir_arg))
+    if rc != 0 and err:
+        module.fail_json(msg="could not query annotations: %s" % out, stderr=err)
+
+    annotations = {}
+    for line in out.splitlines():
+        fields = line.split(None, 2)
+        if len(fields) == 3:
+            annotations.setdefault(fields[0], {})[fields[1]] = fields[2]
+    return annotations
+
+def query_package(installed, name):
+    """Return the installed packages matching name the way 'pkg info -g -e' does,
+    as a glob on the package name, origin or name-version"""
 
-def pkgng_older_than(module, pkgng_path, compare_version):
+    return [_name for _name, info in installed.items()
+            if fnmatch.fnmatchcase(_name, name)
+            or fnmatch.fnmatchcase(info['origin'], name)
+            or fnmatch.fnmatchcase('%s-%s' % (_name, info['version']), name)]
+
+def pkgng_version(module, pkgng_path):
 
     rc, out, err = module.run_command("%s -v" % pkgng_path)
-    version = map(lambda x: int(x), re.split(r'[\._]', out))
+    return map(lambda x: int(x), re.split(r'[\._]', out))
+
+def pkgng_older_than(version, compare_version):
 
     i = 0
     new_pkgng = True
@@ -124,36 +155,30 @@ def pkgng_older_than(module, pkgng_path, compare_version):
 
 
 def remove_packages(module, pkgng_path, packages, dir_arg):
-    
-    remove_c = 0
-    # Using a for loop incase of error, we can report the package that failed
-    for package in packages:
-        # Query the package first, to see if we even need to remove
-        if not query_package(module, pkgng_path, package, dir_arg):
-            continue
 
-        if not module.check_mode:
-            rc, out, err = module.run_command("%s %s delete -y %s" % (pkgng_path, dir_arg, package))
+    # Query the packages first, to see if we even need to remove
+    installed = query_installed(module, pkgng_path, dir_arg)
+    to_remove = [package for package in packages if query_package(installed, package)]
 
-        if not module.check_mode and query_package(module, pkgng_path, package, dir_arg):
-            module.fail_json(msg="failed to remove %s: %s" % (package, out))
-    
-        remove_c += 1
+    if not to_remove:
+        return (False, "package(s) already absent")
 
-    if remove_c > 0:
+    if not module.check_mode:
+        rc, out, err = module.run_command("%s %s delete -y %s" % (pkgng_path, dir_arg, " ".join(to_remove)))
 
-        return (True, "removed %s package(s)" % remove_c)
+        installed = query_installed(module, pkgng_path, dir_arg)
+        failed = [package for package in to_remove if query_package(installed, package)]
+        if failed:
+            module.fail_json(msg="failed to remove %s: %s" % (" ".join(failed), out), stderr=err)
 
-    return (False, "package(s) already absent")
+    return (True, "removed %s package(s)" % len(to_remove))
 
 
-def install_packages(module, pkgng_path, packages, cached, pkgsite, dir_arg):
-
-    install_c = 0
+def install_packages(module, pkgng_path, version, packages, cached, pkgsite, dir_arg):
 
     # as of pkg-1.1.4, PACKAGESITE is deprecated in favor of repository definitions
     # in /usr/local/etc/pkg/repos
-    old_pkgng = pkgng_older_than(module, pkgng_path, [1, 1, 4])
+    old_pkgng = pkgng_older_than(version, [1, 1, 4])
     if pkgsite != "":
         if old_pkgng:
             pkgsite = "PACKAGESITE=%s" % (pkgsite)
@@ -171,70 +196,66 @@ def install_packages(module, pkgng_path, packages, cached, pkgsite, dir_arg):
         if rc != 0:
             module.fail_json(msg="Could not update catalogue")
 
-    for package in packages:
-        if query_package(module, pkgng_path, package, dir_arg):
-            continue
+    installed = query_installed(module, pkgng_path, dir_arg)
+    to_install = [package for package in packages if not query_package(installed, package)]
 
-        if not module.check_mode:
-            if old_pkgng:
-                rc, out, err = module.run_command("%s %s %s install -g -U -y %s" % (batch_var, pkgsite, pkgng_path, package))
-            else:
-                rc, out, err = module.run_command("%s %s %s install %s -g -U -y %s" % (batch_var, pkgng_path, dir_arg, pkgsite, package))
+    if not to_install:
+        return (False, "package(s) already present")
 
-        if not module.check_mode and not query_package(module, pkgng_path, package, dir_arg):
-            module.fail_json(msg="failed to install %s: %s" % (package, out), stderr=err)
+    if not module.check_mode:
+        if old_pkgng:
+            rc, out, err = module.run_command("%s %s %s install -g -U -y %s" % (batch_var, pkgsite, pkgng_path, " ".join(to_install)))
+        else:
+            rc, out, err = module.run_command("%s %s %s install %s -g -U -y %s" % (batch_var, pkgng_path, dir_arg, pkgsite, " ".join(to_install)))
 
-        install_c += 1
-    
-    if install_c > 0:
-        return (True, "added %s package(s)" % (install_c))
+        installed = query_installed(module, pkgng_path, dir_arg)
+        failed = [package for package in to_install if not query_package(installed, package)]
+        if failed:
+            module.fail_json(msg="failed to install %s: %s" % (" ".join(failed), out), stderr=err)
 
-    return (False, "package(s) already present")
+    return (True, "added %s package(s)" % (len(to_install)))
 
-def annotation_query(module, pkgng_path, package, tag, dir_arg):
-    rc, out, err = module.run_command("%s %s info -g -A %s" % (pkgng_path, dir_arg, package))
-    match = re.search(r'^\s*(?P<tag>%s)\s*:\s*(?P<value>\w+)' % tag, out, flags=re.MULTILINE)
-    if match:
-        return match.group('value')
-    return False
+def annotation_query(annotations, installed, package, tag):
+    names = query_package(installed, package) or [package]
+    return annotations.get(names[0], {}).get(tag, False)
 
 
-def annotation_add(module, pkgng_path, package, tag, value, dir_arg):
-    _value = annotation_query(module, pkgng_path, package, tag, dir_arg)
+def annotation_add(module, pkgng_path, annotations, installed, package, tag, value, dir_arg):
+    _value = annotation_query(annotations, installed, package, tag)
     if not _value:
         # Annotation does not exist, add it.
         rc, out, err = module.run_command('%s %s annotate -y -A %s %s "%s"'
             % (pkgng_path, dir_arg, package, tag, value))
         if rc != 0:
-            module.fail_json("could not annotate %s: %s"
+            module.fail_json(msg="could not annotate %s: %s"
                 % (package, out), stderr=err)
         return True
     elif _value != value:
         # Annotation exists, but value differs
         module.fail_json(
-            mgs="failed to annotate %s, because %s is already set to %s, but should be set to %s"
+            msg="failed to annotate %s, because %s is already set to %s, but should be set to %s"
             % (package, tag, _value, value))
         return False
     else:
         # Annotation exists, nothing to do
         return False
 
-def annotation_delete(module, pkgng_path, package, tag, value, dir_arg):
-    _value = annotation_query(module, pkgng_path, package, tag, dir_arg)
+def annotation_delete(module, pkgng_path, annotations, installed, package, tag, value, dir_arg):
+    _value = annotation_query(annotations, installed, package, tag)
     if _value:
         rc, out, err = module.run_command('%s %s annotate -y -D %s %s'
             % (pkgng_path, dir_arg, package, tag))
         if rc != 0:
-            module.fail_json("could not delete annotation to %s: %s"
+            module.fail_json(msg="could not delete annotation to %s: %s"
                 % (package, out), stderr=err)
         return True
     return False
 
-def annotation_modify(module, pkgng_path, package, tag, value, dir_arg):
-    _value = annotation_query(module, pkgng_path, package, tag, dir_arg)
-    if not value:
+def annotation_modify(module, pkgng_path, annotations, installed, package, tag, value, dir_arg):
+    _value = annotation_query(annotations, installed, package, tag)
+    if not _value:
         # No such tag
-        module.fail_json("could not change annotation to %s: tag %s does not exist"
+        module.fail_json(msg="could not change annotation to %s: tag %s does not exist"
             % (package, tag))
     elif _value == value:
         # No change in value
@@ -243,7 +264,7 @@ def annotation_modify(module, pkgng_path, package, tag, value, dir_arg):
         rc,out,err = module.run_command('%s %s annotate -y -M %s %s "%s"'
             % (pkgng_path, dir_arg, package, tag, value))
         if rc != 0:
-            module.fail_json("could not change annotation annotation to %s: %s"
+            module.fail_json(msg="could not change annotation annotation to %s: %s"
                 % (package, out), stderr=err)
         return True
 
@@ -261,9 +282,13 @@ def annotate_packages(module, pkgng_path, packages, annotation, dir_arg):
         ':': annotation_modify
     }
 
+    # Look up the current annotations of all packages once
+    installed = query_installed(module, pkgng_path, dir_arg)
+    current = query_annotations(module, pkgng_path, dir_arg)
+
     for package in packages:
         for _annotation in annotations:
-            if operation[_annotation['operation']](module, pkgng_path, package, _annotation['tag'], _annotation['value']):
+            if operation[_annotation['operation']](module, pkgng_path, current, installed, package, _annotation['tag'], _annotation['value'], dir_arg):
                 annotate_c += 1
 
     if annotate_c > 0:
@@ -293,8 +318,10 @@ def main():
     msgs = []
     dir_arg = ""
 
+    version = pkgng_version(module, pkgng_path)
+
     if p["rootdir"] != "":
-        old_pkgng = pkgng_older_than(module, pkgng_path, [1, 5, 0])
+        old_pkgng = pkgng_older_than(version, [1, 5, 0])
         if old_pkgng:
             module.fail_json(msg="To use option 'rootdir' pkg version must be 1.5 or greater")
         else:
@@ -304,7 +331,7 @@ def main():
       dir_arg = '--chroot %s' % (p["chroot"])
 
     if p["state"] == "present":
-        _changed, _msg = install_packages(module, pkgng_path, pkgs, p["cached"], p["pkgsite"], dir_arg)
+        _changed, _msg = install_packages(module, pkgng_path, version, pkgs, p["cached"], p["pkgsite"], dir_arg)
         changed = changed or _changed
         msgs.append(_msg)
 
@@ -26,7 +26,12 @@
 # You should have received a copy of the GNU General Public License
 # along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
 
-from xml.dom.minidom import parseString as parseXML
+from io import BytesIO
+
+try:
+    from xml.etree.cElementTree import iterparse
+except ImportError:
+    from xml.etree.ElementTree import iterparse
 
 DOCUMENTATION = '''
 ---
@@ -145,15 +150,48 @@ def get_installed_state(m, packages):
     return parse_zypper_xml(m, cmd, fail_not_found=False)[0]
 
 
+def parse_solvables(xml, packages):
+    """Stream zypper's --xmlout output and add every solvable to packages as name ->
+    version, oldversion, installed and group (the enclosing element, e.g. to-install).
+    Elements are discarded as soon as they are read, so no document tree is kept.
+    Returns the text of the last message element."""
+    if not isinstance(xml, bytes):
+        xml = xml.encode('utf-8')
+    message = None
+    parents = []
+    for event, elem in iterparse(BytesIO(xml), events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem.tag)
+            continue
+        parents.pop()
+        if elem.tag == 'solvable':
+            if parents:
+                group = parents[-1]
+            else:
+                group = ''
+            packages[elem.get('name')] = {
+                'version': elem.get('edition', ''),
+                'oldversion': elem.get('edition-old', ''),
+                'installed': elem.get('status') == 'installed',
+                'group': group,
+            }
+        elif elem.tag == 'message':
+            message = elem.text
+        elem.clear()
+    return message
+
+
 def parse_zypper_xml(m, cmd, fail_not_found=True, packages=None):
     rc, stdout, stderr = m.run_command(cmd, check_rc=False)
 
-    dom = parseXML(stdout)
+    firstrun = packages is None
+    if firstrun:
+        packages = {}
+    errmsg = parse_solvables(stdout, packages)
     if rc == 104:
         # exit code 104 is ZYPPER_EXIT_INF_CAP_NOT_FOUND (no packages found)
         if fail_not_found:
-            errmsg = dom.getElementsByTagName('message')[-1].childNodes[0].data
-            m.fail_json(msg=errmsg, rc=rc, stdout=stdout, stderr=stderr, cmd=cmd)
+            m.fail_json(msg=errmsg or stderr, rc=rc, stdout=stdout, stderr=stderr, cmd=cmd)
         else:
             return {}, rc, stdout, stderr
     elif rc in [0, 106, 103]:
@@ -161,18 +199,6 @@ def parse_zypper_xml(m, cmd, fail_not_found=True, packages=None):
         # 0: success
         # 106: signature verification failed
         # 103: zypper was upgraded, run same command again 
-        if packages is None:
-            firstrun = True
-            packages = {}
-        solvable_list = dom.getElementsByTagName('solvable')
-        for solvable in solvable_list:
-            name = solvable.getAttribute('name')
-            packages[name] = {}
-            packages[name]['version'] = solvable.getAttribute('edition')
-            packages[name]['oldversion'] = solvable.getAttribute('edition-old')
-            status = solvable.getAttribute('status')
-            packages[name]['installed'] = status == "installed"
-            packages[name]['group'] = solvable.parentNode.nodeName
         if rc == 103 and firstrun:
             # if this was the first run and it failed with 103
             # run zypper again with the same command to complete update
@@ -32,7 +32,8 @@ options:
     aliases: [ 'host' ]
     description:
       - The host to add or remove (must match a host specified in key)
-    required: true
+      - Required unless C(hosts) is given.
+    required: false
     default: null
   key:
     description:
@@ -50,6 +51,17 @@ options:
     choices: [ "present", "absent" ]
     required: no
     default: present
+  hosts:
+    description:
+      - A list of hosts to add or remove in one pass, each a dict with a
+        C(name), an optional C(key) and an optional C(state) which defaults
+        to the module's I(state).
+      - The file is parsed once without calling ssh-keygen, hashed host
+        names included, and written at most once.
+      - Mutually exclusive with C(name).
+    required: false
+    default: null
+    version_added: "2.2"
 requirements: [ ]
 author: "Matthew Vernon (@mcv21)"
 '''
@@ -60,6 +72,17 @@ EXAMPLES = '''
   known_hosts: path='/etc/ssh/ssh_known_hosts'
                name='foo.com.invalid'
                key="{{ lookup('file', 'pubkeys/foo.com.invalid') }}"
+
+# Maintain the keys of many hosts at once
+- known_hosts:
+    path: /etc/ssh/ssh_known_hosts
+    hosts:
+      - name: foo.com.invalid
+        key: "{{ lookup('file', 'pubkeys/foo.com.invalid') }}"
+      - name: bar.com.invalid
+        key: "{{ lookup('file', 'pubkeys/bar.com.invalid') }}"
+      - name: old.com.invalid
+        state: absent
 '''
 
 # Makes sure public host keys are present or absent in the given known_hosts
@@ -76,6 +99,14 @@ import os
 import os.path
 import tempfile
 import errno
+import base64
+import binascii
+import fnmatch
+import hmac
+try:
+    from hashlib import sha1
+except ImportError:
+    import sha as sha1
 
 def enforce_state(module, params):
     """
@@ -234,19 +265,210 @@ def search_for_host_key(module,host,key,path,sshkeygen):
     #No match found, return current and replace
     return True, True
 
+class KnownHosts(object):
+    '''In-memory known_hosts file, indexed by host name.
+
+    Plain host names are indexed directly. Hashed entries (|1|salt|hash)
+    are grouped by salt, so looking up a host costs one HMAC-SHA1 per
+    distinct salt, and wildcard patterns are checked with fnmatch.
+    '''
+
+    def __init__(self, module, path):
+        self.module = module
+        self.path = path
+        self.lines = []
+        self.names = {}
+        self.salts = {}
+        self.patterns = []
+        self.changed = False
+        try:
+            inf = open(path, "r")
+        except IOError, e:
+            if e.errno != errno.ENOENT:
+                module.fail_json(msg="Failed to read %s: %s" % (path, str(e)))
+        else:
+            for line in inf:
+                self.append(line)
+            inf.close()
+
+    def append(self, line):
+        if line and line[-1] != '\n':
+            line += '\n'
+        idx = len(self.lines)
+        self.lines.append(line)
+        hostfield = host_field(line)
+        if hostfield is None:
+            return
+        if hostfield.startswith('|'):
+            hashed = parse_hashed(hostfield)
+            if hashed is not None:
+                salt, digest = hashed
+                self.salts.setdefault(salt, {}).setdefault(digest, set()).add(idx)
+            return
+        for name in hostfield.split(','):
+            if name[:1] == '!' or '*' in name or '?' in name:
+                self.patterns.append((hostfield, idx))
+                return
+        for name in hostfield.split(','):
+            self.names.setdefault(name, set()).add(idx)
+
+    def find(self, host):
+        '''Returns the indexes of all live lines matching host, in file order.'''
+        found = set(self.names.get(host, ()))
+        for salt, digests in self.salts.items():
+            found.update(digests.get(hash_host(salt, host), ()))
+        for hostfield, idx in self.patterns:
+            if match_patterns(hostfield, host):
+                found.add(idx)
+        return sorted([idx for idx in found if self.lines[idx] is not None])
+
+    def enforce(self, host, key, state):
+        '''Applies one host's state in memory; returns whether it changed.'''
+        if key and key[-1] != '\n':
+            key += '\n'
+        if key is None and state != "absent":
+            self.module.fail_json(msg="No key specified when adding a host: %s" % host)
+        if key is not None and not key_matches_host(key, host):
+            self.module.fail_json(msg="Host parameter does not match hashed host field in supplied key: %s" % host)
+
+        found = self.find(host)
+        current = bool(found)
+        replace = False
+        if current and key is not None:
+            k = normalize_entry(key, host)
+            replace = not [idx for idx in found if normalize_entry(self.lines[idx], host) == k]
+
+        changed = False
+        if replace or (current and state == "absent"):
+            for idx in found:
+                self.lines[idx] = None
+            changed = True
+        if replace or (not current and state == "present"):
+            for line in key.splitlines(True):
+                self.append(line)
+            changed = True
+        self.changed = self.changed or changed
+        return changed
+
+    def write(self):
+        try:
+            outf = tempfile.NamedTemporaryFile(dir=os.path.dirname(self.path))
+            outf.write(''.join([line for line in self.lines if line is not None]))
+            outf.flush()
+            self.module.atomic_move(outf.name, self.path)
+        except (IOError, OSError), e:
+            self.module.fail_json(msg="Failed to write to file %s: %s" % \
+                                      (self.path, str(e)))
+        try:
+            outf.close()
+        except:
+            pass
+
+def host_field(line):
+    '''Returns the host field of a known_hosts line, or None for comments.'''
+    fields = line.split()
+    if not fields or fields[0][0] == '#':
+        return None
+    if fields[0][0] == '@':
+        if len(fields) < 2:
+            return None
+        return fields[1]
+    return fields[0]
+
+def parse_hashed(hostfield):
+    '''Splits a |1|salt|hash host field into its decoded salt and hash.'''
+    parts = hostfield.split('|')
+    if len(parts) != 4 or parts[1] != '1':
+        return None
+    try:
+        return base64.b64decode(parts[2]), base64.b64decode(parts[3])
+    except (TypeError, binascii.Error):
+        return None
+
+def hash_host(salt, host):
+    return hmac.new(salt, host, sha1).digest()
+
+def match_patterns(hostfield, host):
+    matched = False
+    for pattern in hostfield.split(','):
+        if pattern[:1] == '!':
+            if fnmatch.fnmatch(host, pattern[1:]):
+                return False
+        elif fnmatch.fnmatch(host, pattern):
+            matched = True
+    return matched
+
+def key_matches_host(key, host):
+    '''In-process equivalent of sanity_check for the lines of key.'''
+    for line in key.split('\n'):
+        hostfield = host_field(line)
+        if hostfield is None:
+            continue
+        if hostfield.startswith('|'):
+            hashed = parse_hashed(hostfield)
+            if hashed is not None and hash_host(hashed[0], host) == hashed[1]:
+                return True
+        elif match_patterns(hostfield, host):
+            return True
+    return False
+
+def normalize_entry(line, host):
+    '''Mirrors ssh-keygen -F output: a plain host field is replaced by host.'''
+    k = line.strip()
+    if k[:1] == '|' or not k:
+        return k
+    k = k.split()
+    if k[0][0] == '@':
+        if len(k) > 1 and k[1][:1] != '|':
+            k[1] = host
+    else:
+        k[0] = host
+    return ' '.join(k)
+
+def enforce_states(module, params):
+    '''
+    Add or remove the keys of all hosts in params['hosts'], reading and
+    writing the known_hosts file once.
+    '''
+    path = os.path.expanduser(params.get("path"))
+    known_hosts = KnownHosts(module, path)
+    results = []
+    for entry in params["hosts"]:
+        if not isinstance(entry, dict):
+            module.fail_json(msg="Each entry in hosts must be a dict, got: %s" % entry)
+        host = entry.get("name", entry.get("host"))
+        if not host:
+            module.fail_json(msg="No name specified for entry in hosts: %s" % entry)
+        state = entry.get("state", params.get("state"))
+        if state not in ("present", "absent"):
+            module.fail_json(msg="Invalid state '%s' for host %s" % (state, host))
+        changed = known_hosts.enforce(host, entry.get("key"), state)
+        results.append(dict(name=host, state=state, changed=changed))
+
+    if known_hosts.changed and not module.check_mode:
+        known_hosts.write()
+
+    return dict(changed=known_hosts.changed, path=path, results=results)
+
 def main():
 
     module = AnsibleModule(
         argument_spec = dict(
-            name      = dict(required=True,  type='str', aliases=['host']),
+            name      = dict(required=False, type='str', aliases=['host']),
             key       = dict(required=False,  type='str'),
             path      = dict(default="~/.ssh/known_hosts", type='str'),
             state     = dict(default='present', choices=['absent','present']),
+            hosts     = dict(required=False, type='list'),
             ),
+        required_one_of = [['name', 'hosts']],
+        mutually_exclusive = [['name', 'hosts']],
         supports_check_mode = True
         )
 
-    results = enforce_state(module,module.params)
+    if module.params['hosts'] is not None:
+        results = enforce_states(module,module.params)
+    else:
+        results = enforce_state(module,module.params)
     module.exit_json(**results)
 
 # import module snippets